@@ -1,4 +1,211 @@
-from .table import *
-from .fields import *
+import importlib
+import threading
+
 from .exceptions import *
-from .data_source import *
\ No newline at end of file
+
+lazy_modules = {
+    "table": [
+        "Table",
+        "check_top_n_by_raise_exception_otherwise",
+        "AggregatedTable"
+    ],
+    "fields": [
+        "python_types_by_data_type_kind",
+        "object_data_types",
+        "Field",
+        "IntField",
+        "StringField",
+        "FloatField",
+        "BoolField",
+        "DateField",
+        "join_types",
+        "check_join_type_raise_exception_otherwise",
+        "ForeignKey",
+        "PullByForeignKey",
+        "CalculatedField",
+        "get_iso_week",
+        "date_part_getters",
+        "DatePartField",
+        "check_window_function_and_frame_raise_exception_otherwise",
+        "WindowField",
+        "AutoIncrementPrimaryKeyField",
+        "GroupField",
+        "AggregatedField",
+        "is_stored_field"
+    ],
+    "data_source": [
+        "DataSource"
+    ],
+    "grouping": [
+        "date_bucket_frequencies",
+        "window_functions",
+        "running_window_functions",
+        "window_frames",
+        "truncate_dates",
+        "get_bucketed_data_frame",
+        "GroupIndex",
+        "get_running_window_values",
+        "get_rolling_window_values",
+        "get_window_values",
+        "reduce_segments_in_python",
+        "compile_segment_reducer"
+    ],
+    "spilling": [
+        "default_spill_chunk_rows",
+        "is_parquet_available",
+        "get_hash_partition_numbers",
+        "write_partition",
+        "read_partition",
+        "spill_hash_partitions",
+        "read_partition_chunks",
+        "aggregate_spilled_partitions"
+    ],
+    "partitioned_data_source": [
+        "shard_evaluation_data_source",
+        "evaluate_shard_in_worker",
+        "PartitionedDataSource"
+    ],
+    "shared_tables": [
+        "SharedColumn",
+        "SharedTable",
+        "SharedMemoryBlocks",
+        "get_dictionary_encoded_values",
+        "export_column",
+        "attach_column",
+        "SharedTablesExport",
+        "SharedTables",
+        "export_data_source_to_shared_memory",
+        "attach_shared_data_frame",
+        "attach_shared_tables"
+    ],
+    "query": [
+        "predicate_operators",
+        "Predicate",
+        "filter_data_frame",
+        "Query"
+    ],
+    "indexes": [
+        "UniqueHashIndex",
+        "HashIndex",
+        "SortedIndex"
+    ],
+    "hot_swap": [
+        "HotSwapDataSource"
+    ],
+    "validation_report": [
+        "default_sample_rows_count",
+        "ValidationIssue",
+        "ValidationReport"
+    ],
+    "validation": [
+        "default_validation_sample_size",
+        "ValidationPolicy",
+        "FullValidation",
+        "DtypeOnlyValidation",
+        "SampleValidation",
+        "validation_policies",
+        "get_validation_policy",
+        "TableValidator",
+        "get_table_validator",
+        "validate_tables"
+    ],
+    "hash_join": [
+        "max_packed_key_cardinality",
+        "factorize_key_columns",
+        "compress_packed_keys",
+        "pack_key_columns",
+        "get_referenced_positions",
+        "take_referenced_values"
+    ],
+    "backends": [
+        "is_polars_available",
+        "PandasBackend",
+        "PolarsBackend",
+        "backend_types",
+        "get_backend"
+    ],
+    "sql_data_source": [
+        "row_number_field_name",
+        "sql_aggregate_functions",
+        "quote_name",
+        "get_join_condition",
+        "SqlDataSource"
+    ],
+    "schema_plan": [
+        "not_hashed_field_attributes",
+        "FieldPlan",
+        "SchemaPlan",
+        "get_table_type_name",
+        "describe_value",
+        "describe_table_type",
+        "get_schema_hash",
+        "get_field_dependencies",
+        "get_evaluation_order",
+        "compile_schema_plan",
+        "get_schema_plan_path",
+        "load_schema_plan"
+    ],
+    "incremental": [
+        "set_rows",
+        "get_positions_by_keys",
+        "remove_rows",
+        "append_rows",
+        "sort_rows",
+        "are_rows_equal",
+        "get_rows_signature"
+    ],
+    "column_statistics": [
+        "ColumnStatistics",
+        "get_min_and_max_values",
+        "is_monotonic_increasing",
+        "get_column_statistics",
+        "get_statistics_path",
+        "save_statistics",
+        "load_statistics"
+    ],
+    "export": [
+        "export_file_extensions",
+        "default_chunk_rows",
+        "escaped_path_characters",
+        "default_partition_name",
+        "check_export_format_raise_exception_otherwise",
+        "get_declared_data_type",
+        "get_declared_data_types",
+        "get_chunk_offsets",
+        "get_chunks",
+        "map_in_batches",
+        "render_csv_chunk",
+        "write_csv",
+        "convert_chunk_to_arrow",
+        "write_parquet",
+        "write_arrow",
+        "export_writers",
+        "export_data_frame",
+        "escape_path_name",
+        "format_partition_value",
+        "get_partition_directory_name",
+        "get_table_file_name",
+        "export_partitions",
+        "export_table"
+    ]
+}
+
+lazy_names = {name: module_name for module_name, names in lazy_modules.items() for name in names}
+
+lazy_import_lock = threading.RLock()
+
+def import_lazy_module(module_name):
+    with lazy_import_lock:
+        module = importlib.import_module("." + module_name, __name__)
+        globals().update({name: getattr(module, name) for name in lazy_modules[module_name]})
+
+def __getattr__(name):
+    if name not in lazy_names:
+        raise AttributeError("module {} has no attribute {}".format(__name__, name))
+
+    import_lazy_module(module_name=lazy_names[name])
+
+    return globals()[name]
+
+def __dir__():
+    return sorted(set(globals().keys()) | set(lazy_names.keys()))
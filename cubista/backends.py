@@ -0,0 +1,216 @@
+import numpy as np
+
+import cubista
+
+def is_polars_available():
+    try:
+        import polars
+    except ImportError:
+        return False
+
+    return True
+
+class PandasBackend:
+    name = "pandas"
+
+    def build_group_index(self, data_frame, sort_by_field_names, group_by_field_names, buckets=None):
+        return cubista.GroupIndex.build(
+            data_frame=data_frame,
+            sort_by_field_names=sort_by_field_names,
+            group_by_field_names=group_by_field_names,
+            buckets=buckets
+        )
+
+    def aggregate_segments(self, data_frame, segment_codes, aggregate_functions):
+        aggregated_data_frame = data_frame.groupby(segment_codes, sort=False)
+        aggregated_data_frame = aggregated_data_frame.agg(aggregate_functions)
+
+        return aggregated_data_frame.reset_index(drop=True)
+
+    def get_referenced_positions(self, data_frame, field_names, referenced_data_frame, referenced_field_names):
+        return cubista.get_referenced_positions(
+            data_frame=data_frame,
+            field_names=field_names,
+            referenced_data_frame=referenced_data_frame,
+            referenced_field_names=referenced_field_names
+        )
+
+class PolarsBackend(PandasBackend):
+    name = "polars"
+
+    polars_aggregate_functions = {
+        "sum": lambda column: column.sum(),
+        "min": lambda column: column.min(),
+        "max": lambda column: column.max(),
+        "mean": lambda column: column.mean(),
+        "median": lambda column: column.median(),
+        "std": lambda column: column.std(),
+        "var": lambda column: column.var(),
+        "count": lambda column: column.count(),
+        "size": lambda column: column.len(),
+        "nunique": lambda column: column.drop_nulls().n_unique(),
+        "first": lambda column: column.drop_nulls().first(),
+        "last": lambda column: column.drop_nulls().last(),
+        "any": lambda column: column.any(),
+        "all": lambda column: column.all()
+    }
+
+    pandas_aggregate_data_types = {
+        "count": np.int64,
+        "size": np.int64,
+        "nunique": np.int64,
+        "mean": np.float64,
+        "median": np.float64,
+        "std": np.float64,
+        "var": np.float64
+    }
+
+    def __init__(self):
+        if not is_polars_available():
+            raise cubista.BackendIsNotAvailable("Backend polars requires package polars to be installed.")
+
+        import polars
+
+        self.polars = polars
+
+    def to_polars(self, data_frame):
+        polars = self.polars
+        polars_data_frame = polars.from_pandas(data_frame.reset_index(drop=True))
+
+        return polars_data_frame.with_columns(polars.col(polars.Categorical).cast(polars.Utf8))
+
+    def get_sort_permutation(self, data_frame, sort_by_field_names):
+        if not sort_by_field_names:
+            return np.arange(len(data_frame))
+
+        sort_by_data_frame = self.to_polars(data_frame=data_frame[sort_by_field_names])
+        sort_by_data_frame = sort_by_data_frame.with_row_index("position")
+        sort_by_data_frame = sort_by_data_frame.sort(sort_by_field_names, nulls_last=True, maintain_order=True)
+
+        return sort_by_data_frame["position"].to_numpy().astype(np.int64)
+
+    def get_group_codes(self, data_frame, group_by_field_names, buckets=None):
+        polars = self.polars
+
+        if not group_by_field_names:
+            return cubista.GroupIndex.get_group_codes(data_frame=data_frame, group_by_field_names=group_by_field_names)
+
+        group_by_data_frame = data_frame[group_by_field_names].reset_index(drop=True)
+        group_by_data_frame = cubista.get_bucketed_data_frame(data_frame=group_by_data_frame, buckets=buckets or {})
+        group_by_data_frame = self.to_polars(data_frame=group_by_data_frame)
+
+        group_keys = group_by_data_frame.unique().drop_nulls().sort(group_by_field_names)
+        group_keys = group_keys.with_row_index("code")
+        codes = group_by_data_frame.join(group_keys, on=group_by_field_names, how="left", maintain_order="left")["code"]
+        codes = codes.fill_null(-1).to_numpy().astype(np.int64)
+
+        return codes, len(group_keys)
+
+    def build_group_index(self, data_frame, sort_by_field_names, group_by_field_names, buckets=None):
+        permutation = self.get_sort_permutation(data_frame=data_frame, sort_by_field_names=sort_by_field_names)
+        codes, group_count = self.get_group_codes(
+            data_frame=data_frame,
+            group_by_field_names=group_by_field_names,
+            buckets=buckets
+        )
+
+        return cubista.GroupIndex(permutation=permutation, codes=codes[permutation], group_count=group_count)
+
+    def can_aggregate(self, aggregate_functions):
+        polars_aggregate_functions = self.polars_aggregate_functions
+
+        return all([
+            isinstance(aggregate_function, str) and aggregate_function in polars_aggregate_functions
+            for aggregate_function in aggregate_functions.values()
+        ])
+
+    def aggregate_segments(self, data_frame, segment_codes, aggregate_functions):
+        if not self.can_aggregate(aggregate_functions=aggregate_functions):
+            return super(PolarsBackend, self).aggregate_segments(
+                data_frame=data_frame,
+                segment_codes=segment_codes,
+                aggregate_functions=aggregate_functions
+            )
+
+        polars = self.polars
+        polars_aggregate_functions = self.polars_aggregate_functions
+
+        polars_data_frame = self.to_polars(data_frame=data_frame)
+        polars_data_frame = polars_data_frame.with_columns(polars.Series("segment_code", segment_codes))
+        aggregated_data_frame = polars_data_frame.group_by("segment_code").agg([
+            polars_aggregate_functions[aggregate_function](polars.col(field_name))
+            for field_name, aggregate_function in aggregate_functions.items()
+        ])
+        aggregated_data_frame = aggregated_data_frame.sort("segment_code").drop("segment_code")
+
+        return aggregated_data_frame.to_pandas().astype(self.get_pandas_aggregate_data_types(aggregate_functions=aggregate_functions))
+
+    def get_pandas_aggregate_data_types(self, aggregate_functions):
+        pandas_aggregate_data_types = self.pandas_aggregate_data_types
+
+        return {
+            field_name: pandas_aggregate_data_types[aggregate_function]
+            for field_name, aggregate_function in aggregate_functions.items() if aggregate_function in pandas_aggregate_data_types
+        }
+
+    def get_common_data_type(self, data_type, referenced_data_type):
+        polars = self.polars
+
+        if data_type == referenced_data_type:
+            return data_type
+
+        if data_type.is_numeric() and referenced_data_type.is_numeric():
+            if data_type.is_float() or referenced_data_type.is_float():
+                return polars.Float64
+
+            return polars.Int64
+
+        return polars.Utf8
+
+    def cast_keys_to_common_data_types(self, keys, referenced_keys, key_field_names):
+        polars = self.polars
+        common_data_types = {
+            key_field_name: self.get_common_data_type(data_type=keys.schema[key_field_name], referenced_data_type=referenced_keys.schema[key_field_name])
+            for key_field_name in key_field_names
+        }
+        casts = [polars.col(key_field_name).cast(data_type) for key_field_name, data_type in common_data_types.items()]
+
+        return keys.with_columns(casts), referenced_keys.with_columns(casts)
+
+    def get_referenced_positions(self, data_frame, field_names, referenced_data_frame, referenced_field_names):
+        polars = self.polars
+
+        if len(field_names) != len(referenced_field_names):
+            raise cubista.KeyFieldsMismatch("Key fields {} do not match referenced key fields {}.".format(field_names, referenced_field_names))
+
+        referenced_keys = self.to_polars(data_frame=referenced_data_frame[referenced_field_names]).with_row_index("position")
+        referenced_keys = referenced_keys.drop_nulls()
+
+        if referenced_keys.select(referenced_field_names).is_duplicated().any():
+            raise cubista.ReferencedKeyIsNotUnique("Referenced key fields {} are not unique.".format(referenced_field_names))
+
+        keys = self.to_polars(data_frame=data_frame[field_names])
+        keys = keys.rename({field_name: "key_{}".format(number) for number, field_name in enumerate(field_names)})
+        referenced_keys = referenced_keys.rename({
+            field_name: "key_{}".format(number) for number, field_name in enumerate(referenced_field_names)
+        })
+        key_field_names = ["key_{}".format(number) for number in range(len(field_names))]
+        keys, referenced_keys = self.cast_keys_to_common_data_types(keys=keys, referenced_keys=referenced_keys, key_field_names=key_field_names)
+
+        positions = keys.join(referenced_keys, on=key_field_names, how="left", maintain_order="left")["position"]
+
+        return positions.fill_null(-1).cast(polars.Int64).to_numpy()
+
+backend_types = {
+    "pandas": PandasBackend,
+    "polars": PolarsBackend
+}
+
+def get_backend(backend):
+    if isinstance(backend, PandasBackend):
+        return backend
+
+    if backend not in backend_types:
+        raise cubista.UnknownBackend("Backend must be one of {}, but {} found.".format(list(backend_types.keys()), backend))
+
+    return backend_types[backend]()
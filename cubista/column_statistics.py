@@ -0,0 +1,78 @@
+import os
+import pickle
+from typing import Any, NamedTuple
+
+import cubista
+
+class ColumnStatistics(NamedTuple):
+    rows_count: int
+    null_count: int
+    distinct_count: int
+    min_value: Any
+    max_value: Any
+    is_monotonic_increasing: bool
+
+    def get_null_fraction(self):
+        if not self.rows_count:
+            return 0.0
+
+        return self.null_count / self.rows_count
+
+    def is_unique(self):
+        return self.null_count == 0 and self.distinct_count == self.rows_count
+
+def get_min_and_max_values(not_null_data):
+    if not len(not_null_data):
+        return None, None
+
+    try:
+        return not_null_data.min(), not_null_data.max()
+    except TypeError:
+        return None, None
+
+def is_monotonic_increasing(data):
+    try:
+        return bool(data.is_monotonic_increasing)
+    except TypeError:
+        return False
+
+def get_column_statistics(data):
+    not_null_data = data.dropna()
+    null_count = len(data) - len(not_null_data)
+    min_value, max_value = get_min_and_max_values(not_null_data=not_null_data)
+
+    return ColumnStatistics(
+        rows_count=len(data),
+        null_count=null_count,
+        distinct_count=int(not_null_data.nunique()),
+        min_value=min_value,
+        max_value=max_value,
+        is_monotonic_increasing=null_count == 0 and is_monotonic_increasing(data=data)
+    )
+
+def get_statistics_path(directory, schema_hash):
+    return os.path.join(directory, "statistics-{}.pickle".format(schema_hash))
+
+def save_statistics(data_source, directory):
+    tables = data_source.tables
+    schema_hash = cubista.get_schema_hash(table_types=list(tables.keys()))
+    path = get_statistics_path(directory=directory, schema_hash=schema_hash)
+    statistics = {cubista.get_table_type_name(table_type): table.get_statistics() for table_type, table in tables.items()}
+
+    os.makedirs(directory, exist_ok=True)
+    temporary_path = "{}.{}".format(path, os.getpid())
+
+    with open(temporary_path, "wb") as file:
+        pickle.dump(statistics, file)
+
+    os.replace(temporary_path, path)
+
+def load_statistics(data_source, directory):
+    schema_hash = cubista.get_schema_hash(table_types=list(data_source.tables.keys()))
+    path = get_statistics_path(directory=directory, schema_hash=schema_hash)
+
+    if not os.path.exists(path):
+        return {}
+
+    with open(path, "rb") as file:
+        return pickle.load(file)
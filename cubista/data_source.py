@@ -1,43 +1,679 @@
+import asyncio
+import functools
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
 import cubista
 
 class DataSource:
-    def __init__(self, tables):
+    def __init__(self, tables, lazy=False, validation=None, validation_workers=1, collect_all_errors=False, backend="pandas",
+                 plan=None, plan_directory=None, memory_limit=None, spill_directory=None, prune_dimensions=False):
         self.tables = {type(table): table for table in tables}
+        self.group_indexes = {}
+        self.required_fields = None
+        self.lazy = lazy
+        self.backend = cubista.get_backend(backend=backend)
+        self.memory_limit = memory_limit
+        self.spill_directory = spill_directory
+        self.freed_fields = set()
+        self.spilled_columns = {}
+        self.spill_temporary_directory = None
+        self.field_consumers = None
+        self.prune_dimensions = prune_dimensions
+        self.replaced = False
 
         self.set_data_source_for_tables()
-        self.check_references_raise_exception_otherwise()
-        self.evaluate_tables()
+        self.set_plan(plan=plan, plan_directory=plan_directory)
+
+        if validation is not None:
+            validation_report = self.validate_tables(validation=validation, workers=validation_workers)
+
+            if collect_all_errors:
+                validation_report.raise_all_errors()
+
+            validation_report.raise_first_error()
+
+        if not lazy:
+            self.check_references_raise_exception_otherwise()
+
+            if prune_dimensions:
+                self.prune_dimension_tables()
+
+            self.evaluate_tables()
 
     def set_data_source_for_tables(self):
         tables = self.tables
         for _, table in tables.items():
             table.data_source = self
 
+    def set_plan(self, plan, plan_directory):
+        tables = self.tables
+
+        if plan is None and plan_directory is not None:
+            plan = cubista.load_schema_plan(data_source=self, directory=plan_directory)
+
+        if plan is not None:
+            table_names = tuple([cubista.get_table_type_name(table_type) for table_type in tables.keys()])
+            schema_hash = cubista.get_schema_hash(table_types=list(tables.keys()))
+
+            if plan.table_names != table_names:
+                raise cubista.SchemaPlanDoesNotMatch("Plan is compiled for {}, but {} found.".format(plan.table_names, table_names))
+
+            if plan.schema_hash != schema_hash:
+                raise cubista.SchemaPlanDoesNotMatch("Plan is compiled for schema {}, but schema {} found.".format(plan.schema_hash, schema_hash))
+
+        self.plan = plan
+
+    def save_statistics(self, directory):
+        cubista.save_statistics(data_source=self, directory=directory)
+
+    def get_not_validated_tables(self):
+        tables = self.tables
+
+        return [table for _, table in tables.items() if table.validation_report is None]
+
+    def validate_tables(self, validation=True, workers=1):
+        return cubista.validate_tables(tables=self.get_not_validated_tables(), validate=validation, workers=workers)
+
     def check_references_raise_exception_otherwise(self):
         tables = self.tables
         for _, table in tables.items():
             table.check_references_raise_exception_otherwise()
 
-    def get_fields_to_evaluate(self):
-        tables = self.tables
+    def get_group_index(self, table, sort_by_field_names, group_by_field_names, buckets=None):
+        group_indexes = self.group_indexes
+        data_frame = table.data_frame
+        buckets = buckets or {}
+        key = (type(table), tuple(sort_by_field_names), tuple(group_by_field_names), tuple(sorted(buckets.items())))
+
+        cached_data_frame, group_index = group_indexes.get(key, (None, None))
+
+        if cached_data_frame is not data_frame or len(group_index.codes) != len(data_frame):
+            if table.is_sorted_by(field_names=sort_by_field_names):
+                sort_by_field_names = []
+
+            group_index = self.backend.build_group_index(
+                data_frame=data_frame,
+                sort_by_field_names=sort_by_field_names,
+                group_by_field_names=group_by_field_names,
+                buckets=buckets
+            )
+            group_indexes[key] = (data_frame, group_index)
+
+        return group_index
+
+    def invalidate_group_indexes(self, table_type=None):
+        group_indexes = self.group_indexes
+
+        for key in list(group_indexes.keys()):
+            if table_type is None or key[0] == table_type:
+                del group_indexes[key]
+
+    def get_fields_to_evaluate(self, table_objects=None):
+        if table_objects is None:
+            table_objects = self.tables.values()
+
         result = []
 
-        for _, table in tables.items():
+        for table in table_objects:
             result = result + table.get_fields_to_evaluate()
 
         return result
 
+    def iterate_evaluation_passes(self, table_objects):
+        fields_to_evaluate = self.get_fields_to_evaluate(table_objects=table_objects)
+
+        try:
+            while len(fields_to_evaluate) > 0:
+                for table_object in table_objects:
+                    table_object.evaluate()
+
+                not_evaluated_fields = self.get_fields_to_evaluate(table_objects=table_objects)
+
+                if len(fields_to_evaluate) == len(not_evaluated_fields):
+                    raise cubista.CannotEvaluateFields("{}".format(", ".join([str(field) for field in not_evaluated_fields])))
+
+                fields_to_evaluate = not_evaluated_fields
+                self.release_memory()
+
+                yield len(fields_to_evaluate)
+        finally:
+            self.restore_spilled_columns()
+
+    def evaluate_table_objects(self, table_objects):
+        for _ in self.iterate_evaluation_passes(table_objects=table_objects):
+            pass
+
+    def get_field_consumers(self):
+        tables = self.tables
+
+        if self.field_consumers is None:
+            field_consumers = {}
+
+            for table_type, table in tables.items():
+                for field_name, field_object in table.get_fields().items():
+                    for dependency in cubista.get_field_dependencies(table=table, field_object=field_object):
+                        field_consumers.setdefault(dependency, []).append((table_type, field_name))
+
+            self.field_consumers = field_consumers
+
+        return self.field_consumers
+
+    def has_pending_consumers(self, table_type, field_name):
+        tables = self.tables
+
+        for consumer_table_type, consumer_field_name in self.get_field_consumers().get((table_type, field_name), []):
+            consumer_table = tables[consumer_table_type]
+            consumer_field_object = consumer_table.get_fields()[consumer_field_name]
+
+            if consumer_table.is_field_required(field_object=consumer_field_object) and not consumer_field_object.is_evaluated():
+                return True
+
+        return False
+
+    def free_transient_fields(self):
+        tables = self.tables
+        freed_fields = self.freed_fields
+
+        if self.required_fields is not None:
+            return
+
+        for table_type, table in tables.items():
+            data_frame = table.data_frame
+
+            for field_name, field_object in table.get_fields().items():
+                if not field_object.transient or field_name not in data_frame.columns:
+                    continue
+
+                if not self.has_pending_consumers(table_type=table_type, field_name=field_name):
+                    del data_frame[field_name]
+                    freed_fields.add((table_type, field_name))
+
+    def get_memory_usage(self):
+        tables = self.tables
+
+        return sum([int(table.data_frame.memory_usage(index=True, deep=True).sum()) for _, table in tables.items()])
+
+    def get_cold_columns(self):
+        tables = self.tables
+        spilled_columns = self.spilled_columns
+        result = []
+
+        for table_type, table in tables.items():
+            data_frame = table.data_frame
+
+            if table.get_fields_to_evaluate():
+                continue
+
+            for field_name, field_object in table.get_fields().items():
+                if field_object.primary_key or field_name not in data_frame.columns or (table_type, field_name) in spilled_columns:
+                    continue
+
+                if not self.has_pending_consumers(table_type=table_type, field_name=field_name):
+                    column_memory_usage = int(data_frame[field_name].memory_usage(index=False, deep=True))
+                    result.append((column_memory_usage, table_type, field_name))
+
+        return sorted(result, key=lambda cold_column: cold_column[0], reverse=True)
+
+    def spill_column(self, table_type, field_name):
+        table = self.tables[table_type]
+        spilled_columns = self.spilled_columns
+
+        if self.spill_temporary_directory is None:
+            self.spill_temporary_directory = tempfile.TemporaryDirectory(dir=self.spill_directory)
+
+        path = os.path.join(self.spill_temporary_directory.name, "column-{:05d}".format(len(spilled_columns)))
+        cubista.write_partition(data_frame=table.data_frame[[field_name]].reset_index(drop=True), path=path)
+        del table.data_frame[field_name]
+        spilled_columns[(table_type, field_name)] = path
+
+    def spill_cold_columns(self):
+        memory_limit = self.memory_limit
+        memory_usage = self.get_memory_usage()
+
+        for column_memory_usage, table_type, field_name in self.get_cold_columns():
+            if memory_usage <= memory_limit:
+                break
+
+            self.spill_column(table_type=table_type, field_name=field_name)
+            memory_usage = memory_usage - column_memory_usage
+
+    def release_memory(self):
+        self.free_transient_fields()
+
+        if self.memory_limit is not None:
+            self.spill_cold_columns()
+
+    def restore_spilled_columns(self):
+        tables = self.tables
+        spilled_columns = self.spilled_columns
+
+        try:
+            for (table_type, field_name), path in spilled_columns.items():
+                data_frame = tables[table_type].data_frame
+                spilled_column = cubista.read_partition(path=path)[field_name]
+                spilled_column.index = data_frame.index
+                data_frame[field_name] = spilled_column
+        finally:
+            self.spilled_columns = {}
+
+            if self.spill_temporary_directory is not None:
+                self.spill_temporary_directory.cleanup()
+                self.spill_temporary_directory = None
+
+    def evaluate_tables_by_plan(self):
+        tables = self.tables
+        table_types_by_name = {cubista.get_table_type_name(table_type): table_type for table_type in tables.keys()}
+
+        for table_name, field_name in self.plan.evaluation_order:
+            table = tables[table_types_by_name[table_name]]
+            field_object = table.get_fields()[field_name]
+
+            if field_object.is_evaluated() or not table.is_field_required(field_object=field_object):
+                continue
+
+            if isinstance(table, cubista.AggregatedTable) and (field_object.is_required_for_aggregation() or field_object.primary_key):
+                if table.is_required_to_be_aggregated() and table.is_ready_to_be_aggregated():
+                    table.aggregate()
+            elif field_object.is_ready_to_be_evaluated():
+                field_object.evaluate()
+
     def evaluate_tables(self):
-        fields_to_evaluate = self.get_fields_to_evaluate()
         tables = self.tables
 
-        while len(fields_to_evaluate) > 0:
-            for _, table_object in tables.items():
-                table_object.evaluate()
+        if self.plan is not None:
+            self.evaluate_tables_by_plan()
+
+        self.evaluate_table_objects(table_objects=list(tables.values()))
+
+    @staticmethod
+    async def run_in_executor(executor, function, *args):
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(executor, function, *args)
+
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait([future])
+            raise
+
+    @classmethod
+    async def build_async(cls, tables, executor=None, progress=None, **kwargs):
+        plan = kwargs.pop("plan", None)
+        plan_directory = kwargs.pop("plan_directory", None)
+        data_source = cls(tables=tables, lazy=True, **kwargs)
+        table_objects = list(data_source.tables.values())
+        fields_count = len(data_source.get_fields_to_evaluate(table_objects=table_objects))
+
+        await cls.run_in_executor(executor, functools.partial(data_source.set_plan, plan=plan, plan_directory=plan_directory))
+        await cls.run_in_executor(executor, data_source.check_references_raise_exception_otherwise)
+
+        if progress is not None:
+            progress("check references", 0, fields_count)
+
+        if data_source.prune_dimensions:
+            await cls.run_in_executor(executor, data_source.prune_dimension_tables)
+
+        if data_source.plan is not None:
+            await cls.run_in_executor(executor, data_source.evaluate_tables_by_plan)
+
+        evaluation_passes = data_source.iterate_evaluation_passes(table_objects=table_objects)
+        evaluation_pass = 0
+
+        try:
+            while True:
+                await asyncio.sleep(0)
+                not_evaluated_fields_count = await cls.run_in_executor(executor, next, evaluation_passes, None)
+
+                if not_evaluated_fields_count is None:
+                    break
+
+                evaluation_pass = evaluation_pass + 1
+
+                if progress is not None:
+                    progress("evaluate pass {}".format(evaluation_pass), fields_count - not_evaluated_fields_count, fields_count)
+        finally:
+            evaluation_passes.close()
+
+        data_source.lazy = False
+
+        return data_source
+
+    @classmethod
+    async def build_in_executor_async(cls, tables, executor=None, progress=None, **kwargs):
+        data_source = await cls.run_in_executor(executor, functools.partial(cls, tables=tables, **kwargs))
+
+        if progress is not None:
+            progress("evaluate", 1, 1)
+
+        return data_source
+
+    def check_data_source_is_not_replaced_raise_exception_otherwise(self):
+        if self.replaced:
+            raise cubista.DataSourceIsReplaced(
+                "Data source is replaced by a refresh and its fields are bound to the new tables, so it can only serve evaluated data frames."
+            )
+
+    def invalidate_caches(self, table_type):
+        tables = self.tables
+
+        tables[table_type].invalidate_indexes()
+        self.invalidate_group_indexes(table_type=table_type)
+
+        for _, table in tables.items():
+            for _, field_object in table.get_fields().items():
+                if isinstance(field_object, cubista.ForeignKey):
+                    field_object.referenced_positions_cache = None
+
+    def check_table_is_changeable_raise_exception_otherwise(self, table_type):
+        table = self.tables[table_type]
+
+        self.check_data_source_is_not_replaced_raise_exception_otherwise()
+
+        if self.prune_dimensions:
+            raise cubista.PrunedDataSourceIsNotChangeable(
+                "Data source is built with pruned dimension tables, so {} cannot be changed. Build it without prune_dimensions to change rows.".format(table_type)
+            )
+
+        if isinstance(table, cubista.AggregatedTable):
+            raise cubista.TableIsNotChangeable("Rows of {} are aggregated and cannot be changed directly.".format(table_type))
+
+    def get_referencing_fields(self, table_type):
+        tables = self.tables
+
+        return [
+            (table, field_object)
+            for referencing_table_type, table in tables.items() if referencing_table_type != table_type
+            for _, field_object in table.get_fields().items()
+            if isinstance(field_object, (cubista.ForeignKey, cubista.PullByForeignKey)) and field_object.to() == table_type
+        ]
+
+    def get_prunable_table_types(self):
+        tables = self.tables
+        prune_dimensions = self.prune_dimensions
+        aggregated_source_table_types = [
+            table.Aggregation.source() for _, table in tables.items() if isinstance(table, cubista.AggregatedTable)
+        ]
+        result = []
+
+        for table_type, table in tables.items():
+            if prune_dimensions is not True and table_type not in prune_dimensions:
+                continue
+
+            if isinstance(table, cubista.AggregatedTable) or table_type in aggregated_source_table_types:
+                continue
+
+            if table.has_window_fields():
+                continue
+
+            if self.get_referencing_fields(table_type=table_type):
+                result.append(table_type)
+
+        return result
+
+    def get_referenced_row_positions(self, table_type):
+        referenced_row_positions = []
+
+        for table, field_object in self.get_referencing_fields(table_type=table_type):
+            data_frame = table.data_frame
+
+            if not all([field_name in data_frame.columns for field_name in field_object.get_key_field_names()]):
+                return None
+
+            referenced_positions = field_object.get_referenced_positions()
+            referenced_row_positions.append(referenced_positions[referenced_positions >= 0])
+
+        return np.unique(np.concatenate(referenced_row_positions))
+
+    def prune_dimension_tables(self):
+        tables = self.tables
+        not_pruned_table_types = self.get_prunable_table_types()
+
+        while not_pruned_table_types:
+            ready_table_types = [
+                table_type for table_type in not_pruned_table_types
+                if not any([type(table) in not_pruned_table_types for table, _ in self.get_referencing_fields(table_type=table_type)])
+            ]
+
+            if not ready_table_types:
+                break
+
+            for table_type in ready_table_types:
+                table = tables[table_type]
+                positions = self.get_referenced_row_positions(table_type=table_type)
+
+                if positions is not None and len(positions) < len(table.data_frame):
+                    table.data_frame = table.data_frame.take(positions).reset_index(drop=True)
+                    self.invalidate_caches(table_type=table_type)
+
+            not_pruned_table_types = [table_type for table_type in not_pruned_table_types if table_type not in ready_table_types]
+
+    def get_dependent_changes(self, table_type, old_rows, new_rows):
+        tables = self.tables
+        changed_rows = pd.concat([old_rows, new_rows], ignore_index=True)
+        affected_positions = {}
+        result = []
+
+        for table, field_object in self.get_referencing_fields(table_type=table_type):
+            positions = cubista.get_positions_by_keys(
+                data_frame=table.data_frame,
+                field_names=field_object.get_key_field_names(),
+                keys_data_frame=changed_rows,
+                key_field_names=field_object.get_referenced_key_field_names()
+            )
+            affected_positions[type(table)] = np.union1d(affected_positions.get(type(table), positions), positions)
+
+        for affected_table_type, positions in affected_positions.items():
+            table = tables[affected_table_type]
+            primary_key_field_name = table.get_primary_key_field_name()
+            affected_old_rows = table.data_frame.take(positions).copy()
+
+            table.evaluate_rows(positions=positions)
+            self.invalidate_caches(table_type=affected_table_type)
+
+            affected_new_rows = table.get_rows_by_primary_keys(values=affected_old_rows[primary_key_field_name])
+            result.append((affected_table_type, affected_old_rows, affected_new_rows))
+
+        for aggregated_table_type, table in tables.items():
+            if isinstance(table, cubista.AggregatedTable) and table.Aggregation.source() == table_type:
+                aggregated_old_rows, aggregated_new_rows = table.reaggregate_groups(old_source_rows=old_rows, new_source_rows=new_rows)
+                result.append((aggregated_table_type, aggregated_old_rows, aggregated_new_rows))
+
+        return result
+
+    def propagate_changes(self, table_type, old_rows, new_rows):
+        tables = self.tables
+        changes = [(table_type, old_rows, new_rows)]
+        propagated_changes = set()
+
+        while changes:
+            table_type, old_rows, new_rows = changes.pop(0)
+            primary_key_field_name = tables[table_type].get_primary_key_field_name()
+
+            if cubista.are_rows_equal(old_rows=old_rows, new_rows=new_rows, primary_key_field_name=primary_key_field_name):
+                continue
+
+            change_key = (
+                table_type,
+                cubista.get_rows_signature(rows=old_rows, primary_key_field_name=primary_key_field_name),
+                cubista.get_rows_signature(rows=new_rows, primary_key_field_name=primary_key_field_name)
+            )
+
+            if change_key in propagated_changes:
+                continue
+
+            propagated_changes.add(change_key)
+            changes.extend(self.get_dependent_changes(table_type=table_type, old_rows=old_rows, new_rows=new_rows))
+
+    def upsert(self, table_type, data_frame):
+        self.check_table_is_changeable_raise_exception_otherwise(table_type=table_type)
+
+        table = self.tables[table_type]
+        fields = table.get_fields()
+        cubista.get_table_validator(table_type=table_type).validate(data_frame=data_frame).raise_first_error()
+
+        primary_key_field_name = table.get_primary_key_field_name()
+        current_data_frame = table.data_frame
+        positions = table.get_row_positions_by_primary_keys(values=data_frame[primary_key_field_name])
+        is_new_row = positions < 0
+        updated_positions = positions[~is_new_row]
+        field_names = [
+            field_name for field_name in data_frame.columns
+            if field_name in fields and not table.is_derived_field(field_object=fields[field_name])
+        ]
+
+        old_rows = current_data_frame.take(updated_positions).copy()
+        updated_rows = data_frame[~is_new_row]
+
+        for field_name in field_names:
+            cubista.set_rows(
+                data_frame=current_data_frame,
+                positions=updated_positions,
+                column_name=field_name,
+                values=updated_rows[field_name]
+            )
+
+        inserted_rows = data_frame[is_new_row][field_names]
+        table.data_frame = cubista.append_rows(data_frame=current_data_frame, rows=inserted_rows)
+        inserted_positions = np.arange(len(current_data_frame), len(current_data_frame) + len(inserted_rows))
+        self.invalidate_caches(table_type=table_type)
+
+        table.evaluate_rows(positions=np.concatenate([updated_positions, inserted_positions]))
+        self.invalidate_caches(table_type=table_type)
+
+        new_rows = table.get_rows_by_primary_keys(values=data_frame[primary_key_field_name])
+        self.propagate_changes(table_type=table_type, old_rows=old_rows, new_rows=new_rows)
+
+    def delete(self, table_type, keys):
+        self.check_table_is_changeable_raise_exception_otherwise(table_type=table_type)
+
+        table = self.tables[table_type]
+        positions = table.get_row_positions_by_primary_keys(values=keys)
+        positions = positions[positions >= 0]
+        has_window_fields = table.has_window_fields()
+
+        if has_window_fields:
+            old_rows = table.data_frame.copy()
+        else:
+            old_rows = table.data_frame.take(positions).copy()
+
+        table.data_frame = cubista.remove_rows(data_frame=table.data_frame, positions=positions)
+        self.invalidate_caches(table_type=table_type)
+        new_rows = old_rows.iloc[:0]
+
+        if has_window_fields:
+            table.evaluate_rows(positions=np.arange(len(table.data_frame)))
+            self.invalidate_caches(table_type=table_type)
+            new_rows = table.data_frame.copy()
+
+        self.propagate_changes(table_type=table_type, old_rows=old_rows, new_rows=new_rows)
+
+    def export_all(self, directory, format="csv", chunk_rows=None, workers=1, partition_by=None):
+        tables = self.tables
+        partition_by = partition_by or {}
+        result = {}
+
+        for table_type, table in tables.items():
+            file_name = cubista.get_table_file_name(table_type)
+
+            if table_type in partition_by:
+                path = os.path.join(directory, file_name)
+            else:
+                path = os.path.join(directory, "{}{}".format(file_name, cubista.export_file_extensions.get(format, "")))
+
+            result[table_type] = table.export(
+                path=path,
+                format=format,
+                chunk_rows=chunk_rows,
+                workers=workers,
+                partition_by=partition_by.get(table_type)
+            )
+
+        return result
+
+    def query(self, table_type):
+        return cubista.Query(data_source=self, table_type=table_type)
+
+    def is_field_required(self, field_object):
+        required_fields = self.required_fields
+        field_key = (type(field_object.table), field_object.name)
+
+        if field_key in self.freed_fields or field_key in self.spilled_columns:
+            return False
+
+        return required_fields is None or field_key in required_fields
+
+    def get_required_fields(self, table_type, field_names):
+        tables = self.tables
+        result = set()
+        not_visited_fields = [(table_type, field_name) for field_name in field_names]
+
+        while not_visited_fields:
+            required_field = not_visited_fields.pop()
+
+            if required_field in result:
+                continue
+
+            result.add(required_field)
+            required_table_type, required_field_name = required_field
+            field_object = tables[required_table_type].get_fields()[required_field_name]
+            not_visited_fields.extend(field_object.get_dependencies())
+
+        return result
+
+    def get_required_aggregated_table_types_by_source(self, required_fields):
+        tables = self.tables
+        result = {}
+
+        for table_type, table in tables.items():
+            if not isinstance(table, cubista.AggregatedTable):
+                continue
+
+            if any([(table_type, field_name) in required_fields for field_name in table.get_fields().keys()]):
+                result.setdefault(table.Aggregation.source(), []).append(table_type)
+
+        return result
+
+    def evaluate_query(self, query):
+        self.check_data_source_is_not_replaced_raise_exception_otherwise()
+
+        tables = self.tables
+        table_type = query.table_type
+        field_names = query.get_field_names()
+        query_required_fields = self.get_required_fields(
+            table_type=table_type,
+            field_names=field_names + [predicate.field_name for predicate in query.predicates]
+        )
+        pushed_down_predicates, remaining_predicates = query.get_pushed_down_predicates(required_fields=query_required_fields)
+        predicate_field_names = [predicate.field_name for predicate in remaining_predicates]
+        data_frames = {type(table): table.data_frame for _, table in tables.items()}
+        freed_fields = self.freed_fields
+
+        try:
+            self.freed_fields = set()
+
+            for _, table in tables.items():
+                table.data_frame = table.get_data_frame_protected_from_evaluation()
+
+            for pushed_down_table_type, predicates in pushed_down_predicates.items():
+                table = tables[pushed_down_table_type]
+                table.data_frame = cubista.filter_data_frame(data_frame=table.data_frame, predicates=predicates)
+
+            self.required_fields = self.get_required_fields(table_type=table_type, field_names=field_names + predicate_field_names)
+            self.check_references_raise_exception_otherwise()
+            self.evaluate_tables()
 
-            not_evaluated_fields = self.get_fields_to_evaluate()
+            data_frame = cubista.filter_data_frame(data_frame=tables[table_type].data_frame, predicates=remaining_predicates)
 
-            if len(fields_to_evaluate) == len(not_evaluated_fields):
-                raise cubista.CannotEvaluateFields("{}".format(", ".join([str(field) for field in not_evaluated_fields])))
+            return data_frame[field_names].copy()
+        finally:
+            for _, table in tables.items():
+                table.data_frame = data_frames[type(table)]
+                table.reset_references()
 
-            fields_to_evaluate = not_evaluated_fields
\ No newline at end of file
+            self.required_fields = None
+            self.freed_fields = freed_fields
+            self.invalidate_group_indexes()
\ No newline at end of file
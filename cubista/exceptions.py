@@ -23,4 +23,75 @@ class PrimaryKeyCannotHaveNulls(Exception):
     pass
 
 class CannotEvaluateFields(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class UnknownAggregateEngine(Exception):
+    pass
+
+class CannotShareColumn(Exception):
+    pass
+
+class UnknownPredicateOperator(Exception):
+    pass
+
+class FieldIsNotIndexed(Exception):
+    pass
+
+class UnknownValidationMode(Exception):
+    pass
+
+class UnknownDatePart(Exception):
+    pass
+
+class UnknownDateBucket(Exception):
+    pass
+
+class UnknownJoinType(Exception):
+    pass
+
+class KeyFieldsMismatch(Exception):
+    pass
+
+class ReferencedKeyIsNotUnique(Exception):
+    pass
+
+class ForeignKeyDoesNotMatch(Exception):
+    pass
+
+class UnknownBackend(Exception):
+    pass
+
+class BackendIsNotAvailable(Exception):
+    pass
+
+class SchemaPlanDoesNotMatch(Exception):
+    pass
+
+class TableIsNotChangeable(Exception):
+    pass
+
+class PrunedDataSourceIsNotChangeable(Exception):
+    pass
+
+class DataSourceIsReplaced(Exception):
+    pass
+
+class UnknownWindowFunction(Exception):
+    pass
+
+class UnknownWindowFrame(Exception):
+    pass
+
+class UnknownExportFormat(Exception):
+    pass
+
+class ExportFormatIsNotAvailable(Exception):
+    pass
+
+class UnknownTopNField(Exception):
+    pass
+
+class ValidationFailed(Exception):
+    def __init__(self, report):
+        super(ValidationFailed, self).__init__(str(report))
+        self.report = report
\ No newline at end of file
@@ -0,0 +1,214 @@
+import datetime
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import cubista
+
+export_file_extensions = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "arrow": ".arrow"
+}
+
+default_chunk_rows = 1000000
+
+escaped_path_characters = set('"#%\'*/:<=>?[\\]^{|}\x7f')
+
+default_partition_name = "__HIVE_DEFAULT_PARTITION__"
+
+def check_export_format_raise_exception_otherwise(format):
+    if format not in export_file_extensions:
+        raise cubista.UnknownExportFormat("Export format must be one of {}, but {} found.".format(list(export_file_extensions.keys()), format))
+
+    if format != "csv" and not cubista.is_parquet_available():
+        raise cubista.ExportFormatIsNotAvailable("Export format {} requires package pyarrow to be installed.".format(format))
+
+def get_declared_data_type(field_object, data):
+    if isinstance(field_object, cubista.IntField) and data.dtype.kind == "f":
+        not_null_values = data.dropna().to_numpy()
+
+        if np.array_equal(not_null_values, np.floor(not_null_values)):
+            return "Int64"
+
+    if isinstance(field_object, cubista.BoolField) and data.dtype.kind == "O":
+        return "boolean"
+
+    return None
+
+def get_declared_data_types(table, data_frame):
+    fields = table.get_fields()
+    result = {}
+
+    for field_name in data_frame.columns:
+        declared_data_type = get_declared_data_type(field_object=fields[field_name], data=data_frame[field_name])
+
+        if declared_data_type is not None:
+            result[field_name] = declared_data_type
+
+    return result
+
+def get_chunk_offsets(rows_count, chunk_rows):
+    return list(range(0, rows_count, chunk_rows)) or [0]
+
+def get_chunks(data_frame, chunk_rows, data_types):
+    for offset in get_chunk_offsets(rows_count=len(data_frame), chunk_rows=chunk_rows):
+        yield data_frame.iloc[offset:offset + chunk_rows].astype(data_types).reset_index(drop=True)
+
+def map_in_batches(function, items, workers):
+    items = iter(items)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            batch = [item for _, item in zip(range(workers), items)]
+
+            if not batch:
+                return
+
+            for result in executor.map(function, batch):
+                yield result
+
+def render_csv_chunk(indexed_chunk):
+    chunk_number, chunk = indexed_chunk
+
+    return chunk.to_csv(index=False, header=chunk_number == 0)
+
+def write_csv(chunks, path, workers):
+    with open(path, "w", newline="") as file:
+        for text in map_in_batches(function=render_csv_chunk, items=enumerate(chunks), workers=workers):
+            file.write(text)
+
+def convert_chunk_to_arrow(chunk):
+    import pyarrow
+
+    return pyarrow.Table.from_pandas(chunk, preserve_index=False)
+
+def write_parquet(chunks, path, workers):
+    import pyarrow.parquet
+
+    writer = None
+
+    try:
+        for arrow_table in map_in_batches(function=convert_chunk_to_arrow, items=chunks, workers=workers):
+            if writer is None:
+                writer = pyarrow.parquet.ParquetWriter(path, arrow_table.schema)
+
+            writer.write_table(arrow_table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def write_arrow(chunks, path, workers):
+    import pyarrow.ipc
+
+    writer = None
+
+    try:
+        for arrow_table in map_in_batches(function=convert_chunk_to_arrow, items=chunks, workers=workers):
+            if writer is None:
+                writer = pyarrow.ipc.new_file(path, arrow_table.schema)
+
+            writer.write_table(arrow_table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+export_writers = {
+    "csv": write_csv,
+    "parquet": write_parquet,
+    "arrow": write_arrow
+}
+
+def export_data_frame(data_frame, path, format, chunk_rows, workers, data_types):
+    chunks = get_chunks(data_frame=data_frame, chunk_rows=chunk_rows, data_types=data_types)
+    export_writers[format](chunks=chunks, path=path, workers=workers)
+
+    return path
+
+def escape_path_name(name):
+    return "".join([
+        "%{:02X}".format(ord(character)) if character in escaped_path_characters or ord(character) < 32 else character
+        for character in name
+    ])
+
+def format_partition_value(value):
+    if pd.isna(value):
+        return default_partition_name
+
+    if isinstance(value, np.datetime64):
+        value = pd.Timestamp(value)
+
+    if isinstance(value, datetime.datetime):
+        if value == datetime.datetime.combine(value.date(), datetime.time(), tzinfo=value.tzinfo):
+            return value.date().isoformat()
+
+        return value.isoformat()
+
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+
+    return str(value)
+
+def get_partition_directory_name(field_name, value):
+    return "{}={}".format(escape_path_name(name=field_name), escape_path_name(name=format_partition_value(value=value)))
+
+def get_table_file_name(table_type):
+    return escape_path_name(name=cubista.get_table_type_name(table_type))
+
+def export_partitions(data_frame, directory, format, chunk_rows, workers, data_types, partition_by):
+    codes, uniques = pd.factorize(data_frame[partition_by], sort=True, use_na_sentinel=False)
+    order = np.argsort(codes, kind="stable")
+    offsets = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    file_name = "part-00000{}".format(export_file_extensions[format])
+    paths = []
+
+    for code, value in enumerate(uniques):
+        partition_directory = os.path.join(directory, get_partition_directory_name(field_name=partition_by, value=value))
+        os.makedirs(partition_directory, exist_ok=True)
+        partition_data_frame = data_frame.take(order[offsets[code]:offsets[code + 1]]).drop(columns=[partition_by])
+
+        paths.append(export_data_frame(
+            data_frame=partition_data_frame,
+            path=os.path.join(partition_directory, file_name),
+            format=format,
+            chunk_rows=chunk_rows,
+            workers=workers,
+            data_types={field_name: data_type for field_name, data_type in data_types.items() if field_name != partition_by}
+        ))
+
+    return paths
+
+def export_table(table, path, format="csv", chunk_rows=default_chunk_rows, workers=1, partition_by=None):
+    check_export_format_raise_exception_otherwise(format=format)
+
+    fields = table.get_fields()
+    data_frame = table.data_frame
+    data_frame = data_frame[[field_name for field_name in fields.keys() if field_name in data_frame.columns]]
+    data_types = get_declared_data_types(table=table, data_frame=data_frame)
+
+    if partition_by is not None:
+        return export_partitions(
+            data_frame=data_frame,
+            directory=path,
+            format=format,
+            chunk_rows=chunk_rows,
+            workers=workers,
+            data_types=data_types,
+            partition_by=partition_by
+        )
+
+    directory = os.path.dirname(path)
+
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    return [export_data_frame(
+        data_frame=data_frame,
+        path=path,
+        format=format,
+        chunk_rows=chunk_rows,
+        workers=workers,
+        data_types=data_types
+    )]
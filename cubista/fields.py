@@ -1,11 +1,159 @@
 import datetime
 from .exceptions import *
+from .grouping import compile_segment_reducer, date_bucket_frequencies, get_window_values, running_window_functions, window_frames, window_functions
+from .validation_report import ValidationIssue, ValidationReport
+import cubista
+import numpy as np
 import pandas as pd
 
+python_types_by_data_type_kind = {
+    "i": int,
+    "u": int,
+    "f": float,
+    "b": bool,
+    "M": datetime.date
+}
+
+object_data_types = (str, bool, datetime.date)
+
 class Field:
     def __init__(self):
         self.name = ''
         self.table = None
+        self.transient = False
+
+    @staticmethod
+    def get_python_type_of_data_type(data_type):
+        if isinstance(data_type, pd.CategoricalDtype):
+            return None
+
+        return python_types_by_data_type_kind.get(data_type.kind)
+
+    @classmethod
+    def get_type_mismatch_positions(cls, data, null_mask, required_types):
+        python_type = cls.get_python_type_of_data_type(data_type=data.dtype)
+        not_null_positions = np.flatnonzero(~null_mask)
+
+        if python_type is not None:
+            if python_type in required_types:
+                return not_null_positions[:0]
+
+            candidate_positions = not_null_positions
+        else:
+            data_types = data.iloc[not_null_positions].astype(object).map(type)
+            candidate_positions = not_null_positions[~data_types.isin(required_types).to_numpy()]
+
+        truthy_values = data.iloc[candidate_positions].astype(object).map(bool).to_numpy(dtype=bool)
+
+        return candidate_positions[truthy_values]
+
+    @staticmethod
+    def get_issues_ordered_by_first_position(issues):
+        return sorted(issues, key=lambda issue: issue.positions[0] if len(issue.positions) else -1)
+
+    def get_data_type_and_nulls_issues(self, data, required_types, nulls):
+        name = self.name
+        null_mask = data.isnull().to_numpy()
+        null_positions = np.flatnonzero(null_mask)
+        type_mismatch_positions = self.get_type_mismatch_positions(data=data, null_mask=null_mask, required_types=required_types)
+
+        issues = []
+
+        if not nulls and len(null_positions):
+            issues.append(ValidationIssue(
+                exception_type=NullsNotAllowed,
+                message="Field {} cannot contain nulls but null found.".format(name),
+                field_name=name,
+                positions=null_positions
+            ))
+
+        if len(type_mismatch_positions):
+            data_type = self.get_python_type_of_data_type(data_type=data.dtype) or type(data.iloc[type_mismatch_positions[0]])
+            issues.append(ValidationIssue(
+                exception_type=FieldTypeMismatch,
+                message="Field {} must have data type {}, but {} found.".format(name, required_types, data_type),
+                field_name=name,
+                positions=type_mismatch_positions
+            ))
+
+        return self.get_issues_ordered_by_first_position(issues=issues)
+
+    def get_column_data_type_issues(self, data, required_types):
+        name = self.name
+        python_type = self.get_python_type_of_data_type(data_type=data.dtype)
+
+        if python_type is not None:
+            is_data_type_correct = python_type in required_types
+        else:
+            is_data_type_correct = any([required_type in object_data_types for required_type in required_types])
+
+        if is_data_type_correct:
+            return []
+
+        return [ValidationIssue(
+            exception_type=FieldTypeMismatch,
+            message="Field {} must have data type {}, but column of data type {} found.".format(name, required_types, data.dtype),
+            field_name=name,
+            count=len(data)
+        )]
+
+    def get_nulls_issues(self, data, nulls):
+        name = self.name
+
+        if nulls:
+            return []
+
+        null_positions = np.flatnonzero(data.isnull().to_numpy())
+
+        if not len(null_positions):
+            return []
+
+        return [ValidationIssue(
+            exception_type=NullsNotAllowed,
+            message="Field {} cannot contain nulls but null found.".format(name),
+            field_name=name,
+            positions=null_positions
+        )]
+
+    @classmethod
+    def is_strictly_increasing(cls, data):
+        python_type = cls.get_python_type_of_data_type(data_type=data.dtype)
+
+        if python_type not in (int, float):
+            return False
+
+        values = data.to_numpy()
+
+        return bool(np.all(values[1:] > values[:-1]))
+
+    def get_uniqueness_issues(self, data, unique):
+        name = self.name
+
+        if not unique or self.is_strictly_increasing(data=data):
+            return []
+
+        repeating_mask = (data.duplicated(keep=False) & data.notnull()).to_numpy()
+        repeating_positions = np.flatnonzero(repeating_mask)
+
+        if not len(repeating_positions):
+            return []
+
+        repeating_values = data.iloc[repeating_positions].unique().tolist()
+
+        return [ValidationIssue(
+            exception_type=NonUniqueValuesFound,
+            message="Field {} must have unique values, but has repeating value(s): {}.".format(name, repeating_values),
+            field_name=name,
+            positions=repeating_positions
+        )]
+
+    def check_field_data_type_and_nulls_in_data_frame_column_raise_exception_otherwise(self, data, required_types, nulls):
+        issues = self.get_data_type_and_nulls_issues(data=data, required_types=required_types, nulls=nulls)
+        ValidationReport(issues=issues).raise_first_error()
+
+    def check_field_uniqueness_in_data_frame_column_raise_exception_otherwise(self, data, unique):
+        issues = self.get_uniqueness_issues(data=data, unique=unique)
+        ValidationReport(issues=issues).raise_first_error()
 
     def check_field_data_type_nulls_and_uniqueness_in_data_frame_column_raise_exception_otherwise(
             self,
@@ -14,20 +162,12 @@ class Field:
             nulls,
             unique
     ):
-        name = self.name
-        for _, value in data.items():
-            if not nulls and pd.isnull(value):
-                raise NullsNotAllowed("Field {} cannot contain nulls but null found.".format(name))
-
-            data_type = type(value)
-            if value and data_type not in required_types:
-                raise FieldTypeMismatch("Field {} must have data type {}, but {} found.".format(name, required_types, data_type))
-
-        if unique:
-            counts = data.value_counts()
-            repeating_values = counts[counts > 1].index.to_list()
-            if repeating_values:
-                raise NonUniqueValuesFound("Field {} must have unique values, but has repeating value(s): {}.".format(name, repeating_values))
+        self.check_field_data_type_and_nulls_in_data_frame_column_raise_exception_otherwise(
+            data=data,
+            required_types=required_types,
+            nulls=nulls
+        )
+        self.check_field_uniqueness_in_data_frame_column_raise_exception_otherwise(data=data, unique=unique)
 
     def __str__(self):
         name = self.name
@@ -35,7 +175,7 @@ class Field:
         return "{}.{}".format(type(table), name)
 
 class IntField(Field):
-    def __init__(self, nulls=False, unique=False, primary_key=False):
+    def __init__(self, nulls=False, unique=False, primary_key=False, index=False):
         super(IntField, self).__init__()
         if primary_key and not unique:
             raise PrimaryKeyMustBeUnique()
@@ -46,13 +186,15 @@ class IntField(Field):
         self.nulls = nulls
         self.unique = unique
         self.primary_key = primary_key
+        self.required_types = [int, float]
+        self.index = index
 
     def check_field_has_correct_data_type_in_data_frame_column_raise_exception_otherwise(self, data):
         nulls = self.nulls
         unique = self.unique
         self.check_field_data_type_nulls_and_uniqueness_in_data_frame_column_raise_exception_otherwise(
             data=data,
-            required_types=[int, float],
+            required_types=self.required_types,
             nulls=nulls,
             unique=unique
         )
@@ -69,6 +211,9 @@ class IntField(Field):
     def is_required_for_aggregation(self):
         return False
 
+    def get_dependencies(self):
+        return []
+
 class StringField(Field):
     def __init__(self, nulls=False, unique=False, primary_key=False):
         super(StringField, self).__init__()
@@ -81,13 +226,14 @@ class StringField(Field):
         self.nulls = nulls
         self.unique = unique
         self.primary_key = primary_key
+        self.required_types = [str]
 
     def check_field_has_correct_data_type_in_data_frame_column_raise_exception_otherwise(self, data):
         nulls = self.nulls
         unique = self.unique
         self.check_field_data_type_nulls_and_uniqueness_in_data_frame_column_raise_exception_otherwise(
             data=data,
-            required_types=[str],
+            required_types=self.required_types,
             nulls=nulls,
             unique=unique
         )
@@ -104,6 +250,9 @@ class StringField(Field):
     def is_required_for_aggregation(self):
         return False
 
+    def get_dependencies(self):
+        return []
+
 class FloatField(Field):
     def __init__(self, nulls=False, unique=False, primary_key=False):
         super(FloatField, self).__init__()
@@ -116,13 +265,14 @@ class FloatField(Field):
         self.nulls = nulls
         self.unique = unique
         self.primary_key = primary_key
+        self.required_types = [float]
 
     def check_field_has_correct_data_type_in_data_frame_column_raise_exception_otherwise(self, data):
         nulls = self.nulls
         unique = self.unique
         self.check_field_data_type_nulls_and_uniqueness_in_data_frame_column_raise_exception_otherwise(
             data=data,
-            required_types=[float],
+            required_types=self.required_types,
             nulls=nulls,
             unique=unique
         )
@@ -139,6 +289,9 @@ class FloatField(Field):
     def is_required_for_aggregation(self):
         return False
 
+    def get_dependencies(self):
+        return []
+
 class BoolField(Field):
     def __init__(self, nulls=False, unique=False, primary_key=False):
         super(BoolField, self).__init__()
@@ -151,13 +304,14 @@ class BoolField(Field):
         self.nulls = nulls
         self.unique = unique
         self.primary_key = primary_key
+        self.required_types = [bool]
 
     def check_field_has_correct_data_type_in_data_frame_column_raise_exception_otherwise(self, data):
         nulls = self.nulls
         unique = self.unique
         self.check_field_data_type_nulls_and_uniqueness_in_data_frame_column_raise_exception_otherwise(
             data=data,
-            required_types=[bool],
+            required_types=self.required_types,
             nulls=nulls,
             unique=unique
         )
@@ -174,8 +328,11 @@ class BoolField(Field):
     def is_required_for_aggregation(self):
         return False
 
+    def get_dependencies(self):
+        return []
+
 class DateField(Field):
-    def __init__(self, nulls=False, unique=False, primary_key=False):
+    def __init__(self, nulls=False, unique=False, primary_key=False, index=False):
         super(DateField, self).__init__()
         if primary_key and not unique:
             raise PrimaryKeyMustBeUnique()
@@ -186,13 +343,15 @@ class DateField(Field):
         self.nulls = nulls
         self.unique = unique
         self.primary_key = primary_key
+        self.required_types = [datetime.date]
+        self.index = index
 
     def check_field_has_correct_data_type_in_data_frame_column_raise_exception_otherwise(self, data):
         nulls = self.nulls
         unique = self.unique
         self.check_field_data_type_nulls_and_uniqueness_in_data_frame_column_raise_exception_otherwise(
             data=data,
-            required_types=[datetime.date],
+            required_types=self.required_types,
             nulls=nulls,
             unique=unique
         )
@@ -209,14 +368,29 @@ class DateField(Field):
     def is_required_for_aggregation(self):
         return False
 
+    def get_dependencies(self):
+        return []
+
+join_types = ["left", "inner"]
+
+def check_join_type_raise_exception_otherwise(how):
+    if how not in join_types:
+        raise UnknownJoinType("Join type must be one of {}, but {} found.".format(join_types, how))
+
 class ForeignKey(Field):
-    def __init__(self, to, default, nulls=False):
+    def __init__(self, to, default=None, nulls=False, on=None, referenced_on=None, how="left"):
         super(ForeignKey, self).__init__()
+        check_join_type_raise_exception_otherwise(how=how)
+
         self.to = to
         self.default = default
         self.nulls = nulls
+        self.on = on
+        self.referenced_on = referenced_on
+        self.how = how
         self.primary_key = False
         self.references_checked = False
+        self.referenced_positions_cache = None
 
     def do_nothing_intentionally(self):
         pass
@@ -224,29 +398,108 @@ class ForeignKey(Field):
     def check_field_has_correct_data_type_in_data_frame_column_raise_exception_otherwise(self, data):
         self.do_nothing_intentionally()
 
-    def check_references_raise_exception_otherwise(self):
+    def get_referenced_table(self):
         table = self.table
+        referenced_table_type = self.to()
+        data_source = table.data_source
 
-        data_frame = table.data_frame
+        return data_source.tables[referenced_table_type]
 
-        field_name = self.name
+    def get_key_field_names(self):
+        if self.on is None:
+            return [self.name]
 
-        to = self.to
+        return self.on
 
-        referenced_table_type = to()
+    def get_referenced_key_field_names(self):
+        if self.referenced_on is not None:
+            return self.referenced_on
 
-        data_source = table.data_source
+        if self.on is None:
+            referenced_table = self.get_referenced_table()
 
-        referenced_table = data_source.tables[referenced_table_type]
+            return [referenced_table.get_primary_key_field_name()]
 
-        referenced_table_primary_key_field_name = referenced_table.get_primary_key_field_name()
+        return self.on
 
-        referenced_values = referenced_table.data_frame[referenced_table_primary_key_field_name].dropna().unique()
+    def find_referenced_positions(self):
+        table = self.table
+        referenced_table = self.get_referenced_table()
+        backend = table.get_backend()
+
+        return backend.get_referenced_positions(
+            data_frame=table.data_frame,
+            field_names=self.get_key_field_names(),
+            referenced_data_frame=referenced_table.data_frame,
+            referenced_field_names=self.get_referenced_key_field_names()
+        )
+
+    def find_default_referenced_position(self):
+        table = self.table
+        referenced_table = self.get_referenced_table()
+        backend = table.get_backend()
+
+        default_referenced_positions = backend.get_referenced_positions(
+            data_frame=pd.DataFrame({self.name: [self.default]}),
+            field_names=[self.name],
+            referenced_data_frame=referenced_table.data_frame,
+            referenced_field_names=self.get_referenced_key_field_names()
+        )
+
+        return default_referenced_positions[0]
+
+    def set_referenced_positions(self, referenced_positions):
+        table = self.table
+        referenced_table = self.get_referenced_table()
+
+        self.referenced_positions_cache = (
+            table.data_frame,
+            referenced_table.data_frame,
+            len(referenced_table.data_frame),
+            referenced_positions
+        )
+
+    def get_referenced_positions(self):
+        table = self.table
+        referenced_table = self.get_referenced_table()
+        referenced_positions_cache = self.referenced_positions_cache
+
+        if referenced_positions_cache is not None:
+            data_frame, referenced_data_frame, referenced_rows_count, referenced_positions = referenced_positions_cache
+
+            if data_frame is table.data_frame and len(referenced_positions) == len(data_frame) \
+                    and referenced_data_frame is referenced_table.data_frame and referenced_rows_count == len(referenced_data_frame):
+                return referenced_positions
+
+        referenced_positions = self.find_referenced_positions()
+        self.set_referenced_positions(referenced_positions=referenced_positions)
+
+        return referenced_positions
+
+    def check_references_raise_exception_otherwise(self):
+        if self.references_checked:
+            return
+
+        table = self.table
+
+        data_frame = table.data_frame
+
+        field_name = self.name
 
-        default_value_for_referencing_nowhere = self.default
+        referenced_positions = self.find_referenced_positions()
 
-        data_frame.loc[~data_frame[field_name].isin(referenced_values), field_name] = default_value_for_referencing_nowhere
+        is_referencing_nowhere = referenced_positions < 0
 
+        if self.how == "inner":
+            table.data_frame = data_frame.take(np.flatnonzero(~is_referencing_nowhere))
+            referenced_positions = referenced_positions[~is_referencing_nowhere]
+        elif self.on is None and is_referencing_nowhere.any():
+            default_value_for_referencing_nowhere = self.default
+
+            data_frame.loc[is_referencing_nowhere, field_name] = default_value_for_referencing_nowhere
+            referenced_positions = np.where(is_referencing_nowhere, self.find_default_referenced_position(), referenced_positions)
+
+        self.set_referenced_positions(referenced_positions=referenced_positions)
         self.references_checked = True
 
     def is_evaluated(self):
@@ -255,11 +508,30 @@ class ForeignKey(Field):
     def is_required_for_aggregation(self):
         return False
 
+    def get_dependencies(self):
+        table_type = type(self.table)
+        referenced_table_type = self.to()
+        local_dependencies = []
+
+        if self.on is not None:
+            local_dependencies = [(table_type, field_name) for field_name in self.on]
+
+        return local_dependencies + [
+            (referenced_table_type, field_name) for field_name in self.get_referenced_key_field_names()
+        ]
+
 class PullByForeignKey(Field):
-    def __init__(self, to, source_field):
+    def __init__(self, to, source_field, via=None, on=None, referenced_on=None, how="left", transient=False):
         super(PullByForeignKey, self).__init__()
+        check_join_type_raise_exception_otherwise(how=how)
+
         self.to = to
         self.source_field = source_field
+        self.via = via
+        self.on = on
+        self.referenced_on = referenced_on
+        self.how = how
+        self.transient = transient
         self.primary_key = False
 
     def do_nothing_intentionally(self):
@@ -284,6 +556,61 @@ class PullByForeignKey(Field):
 
         return referenced_table
 
+    def get_foreign_key(self):
+        table = self.table
+        fields = table.get_fields()
+        via = self.via
+
+        if via not in fields:
+            raise cubista.FieldDoesNotExist("Field {} of {} referenced by {} does not exist.".format(via, type(table), self.name))
+
+        foreign_key = fields[via]
+
+        if not isinstance(foreign_key, ForeignKey) or foreign_key.to() is not self.to():
+            raise cubista.ForeignKeyDoesNotMatch("Field {} of {} is not a foreign key to {}.".format(via, type(table), self.to()))
+
+        return foreign_key
+
+    def get_key_field_names(self):
+        if self.via is not None:
+            return self.get_foreign_key().get_key_field_names()
+
+        if self.on is None:
+            table = self.table
+
+            return [table.get_primary_key_field_name()]
+
+        return self.on
+
+    def get_referenced_key_field_names(self):
+        if self.via is not None:
+            return self.get_foreign_key().get_referenced_key_field_names()
+
+        if self.referenced_on is not None:
+            return self.referenced_on
+
+        if self.on is None:
+            referenced_table = self.get_referenced_table()
+
+            return [referenced_table.get_primary_key_field_name()]
+
+        return self.on
+
+    def get_referenced_positions(self):
+        if self.via is not None:
+            return self.get_foreign_key().get_referenced_positions()
+
+        table = self.table
+        referenced_table = self.get_referenced_table()
+        backend = table.get_backend()
+
+        return backend.get_referenced_positions(
+            data_frame=table.data_frame,
+            field_names=self.get_key_field_names(),
+            referenced_data_frame=referenced_table.data_frame,
+            referenced_field_names=self.get_referenced_key_field_names()
+        )
+
     def is_ready_to_be_evaluated(self):
         referenced_table = self.get_referenced_table()
         referenced_column_name = self.source_field
@@ -297,23 +624,24 @@ class PullByForeignKey(Field):
         field_name = self.name
         table = self.table
         data_frame = table.data_frame
-        primary_key_field_name = table.get_primary_key_field_name()
         referenced_table = self.get_referenced_table()
-        referenced_table_primary_key_field_name = referenced_table.get_primary_key_field_name()
-
-        reduced_reference_data_frame = referenced_table.data_frame[[referenced_table_primary_key_field_name, source_field]]\
-            .set_index(referenced_table_primary_key_field_name)\
-            .rename(columns={ source_field: field_name })
-
-        new_data_frame = data_frame.merge(
-            reduced_reference_data_frame,
-            how="left",
-            left_on=primary_key_field_name,
-            right_index=True,
-            suffixes=(None, "")
+        referenced_data_frame = referenced_table.data_frame
+        referenced_positions = self.get_referenced_positions()
+
+        if self.how == "inner":
+            is_referencing_somewhere = referenced_positions >= 0
+            data_frame = data_frame.take(np.flatnonzero(is_referencing_somewhere))
+            referenced_positions = referenced_positions[is_referencing_somewhere]
+
+        data_frame[field_name] = cubista.take_referenced_values(
+            data=referenced_data_frame[source_field],
+            positions=referenced_positions
         )
 
-        table.data_frame = new_data_frame
+        table.data_frame = data_frame
+
+        if self.via is not None:
+            self.get_foreign_key().set_referenced_positions(referenced_positions=referenced_positions)
 
     def is_evaluated(self):
         field_name = self.name
@@ -324,11 +652,26 @@ class PullByForeignKey(Field):
     def is_required_for_aggregation(self):
         return False
 
+    def get_dependencies(self):
+        table_type = type(self.table)
+        referenced_table_type = self.to()
+
+        local_field_names = self.get_key_field_names()
+
+        if self.via is not None:
+            local_field_names = local_field_names + [self.via]
+
+        return [(table_type, field_name) for field_name in local_field_names] + [
+            (referenced_table_type, field_name) for field_name in self.get_referenced_key_field_names()
+        ] + [(referenced_table_type, self.source_field)]
+
 class CalculatedField(Field):
-    def __init__(self, lambda_expression, source_fields):
+    def __init__(self, lambda_expression, source_fields, sql_expression=None, transient=False):
         super(CalculatedField, self).__init__()
         self.lambda_expression = lambda_expression
         self.source_fields = source_fields
+        self.sql_expression = sql_expression
+        self.transient = transient
         self.primary_key = False
 
     def do_nothing_intentionally(self):
@@ -371,6 +714,166 @@ class CalculatedField(Field):
     def is_required_for_aggregation(self):
         return False
 
+    def get_dependencies(self):
+        table_type = type(self.table)
+        source_fields = self.source_fields
+
+        return [(table_type, source_field) for source_field in source_fields]
+
+def get_iso_week(data):
+    return data.dt.isocalendar().week
+
+date_part_getters = {
+    "year": lambda data: data.dt.year,
+    "quarter": lambda data: data.dt.quarter,
+    "month": lambda data: data.dt.month,
+    "week": get_iso_week,
+    "day": lambda data: data.dt.day,
+    "dayofweek": lambda data: data.dt.dayofweek
+}
+
+class DatePartField(Field):
+    def __init__(self, source, part, transient=False):
+        super(DatePartField, self).__init__()
+        if part not in date_part_getters:
+            raise UnknownDatePart("Date part must be one of {}, but {} found.".format(list(date_part_getters.keys()), part))
+
+        self.source = source
+        self.part = part
+        self.transient = transient
+        self.primary_key = False
+
+    def do_nothing_intentionally(self):
+        pass
+
+    def check_field_has_correct_data_type_in_data_frame_column_raise_exception_otherwise(self, data):
+        self.do_nothing_intentionally()
+
+    def check_references_raise_exception_otherwise(self):
+        self.do_nothing_intentionally()
+
+    def is_ready_to_be_evaluated(self):
+        table = self.table
+        data_frame = table.data_frame
+
+        return self.source in data_frame.columns
+
+    def evaluate(self):
+        table = self.table
+        data_frame = table.data_frame
+        field_name = self.name
+        data = data_frame[self.source]
+
+        if data.dtype.kind != "M":
+            data = pd.to_datetime(data)
+
+        values = date_part_getters[self.part](data)
+
+        if values.isnull().any():
+            data_frame[field_name] = values.astype("float64").to_numpy()
+        else:
+            data_frame[field_name] = values.astype("int64").to_numpy()
+
+    def is_evaluated(self):
+        field_name = self.name
+        table = self.table
+        data_frame = table.data_frame
+        return field_name in data_frame.columns
+
+    def is_required_for_aggregation(self):
+        return False
+
+    def get_dependencies(self):
+        table_type = type(self.table)
+
+        return [(table_type, self.source)]
+
+def check_window_function_and_frame_raise_exception_otherwise(function, frame):
+    if not (frame in window_frames or (isinstance(frame, int) and not isinstance(frame, bool) and frame > 0)):
+        raise UnknownWindowFrame("Window frame must be one of {} or positive rows count, but {} found.".format(window_frames, frame))
+
+    if function not in window_functions:
+        raise UnknownWindowFunction("Window function must be one of {}, but {} found.".format(window_functions, function))
+
+    if frame != "partition" and function not in running_window_functions:
+        raise UnknownWindowFunction("Window function for frame {} must be one of {}, but {} found.".format(frame, running_window_functions, function))
+
+class WindowField(Field):
+    def __init__(self, source, function, partition_by=None, order_by=None, frame=None, transient=False):
+        super(WindowField, self).__init__()
+        partition_by = partition_by or []
+        order_by = order_by or []
+
+        if frame is None:
+            frame = "running" if order_by else "partition"
+
+        check_window_function_and_frame_raise_exception_otherwise(function=function, frame=frame)
+
+        self.source = source
+        self.function = function
+        self.partition_by = partition_by
+        self.order_by = order_by
+        self.frame = frame
+        self.transient = transient
+        self.primary_key = False
+
+    def do_nothing_intentionally(self):
+        pass
+
+    def check_field_has_correct_data_type_in_data_frame_column_raise_exception_otherwise(self, data):
+        self.do_nothing_intentionally()
+
+    def check_references_raise_exception_otherwise(self):
+        self.do_nothing_intentionally()
+
+    def get_source_field_names(self):
+        return [self.source] + self.partition_by + self.order_by
+
+    def is_ready_to_be_evaluated(self):
+        table = self.table
+        data_frame = table.data_frame
+
+        return all([field_name in data_frame.columns for field_name in self.get_source_field_names()])
+
+    def get_group_index(self):
+        table = self.table
+        data_source = table.data_source
+
+        return data_source.get_group_index(
+            table=table,
+            sort_by_field_names=self.order_by,
+            group_by_field_names=self.partition_by
+        )
+
+    def evaluate(self):
+        table = self.table
+        data_frame = table.data_frame
+        field_name = self.name
+
+        group_index = self.get_group_index()
+        segment_positions = group_index.get_segment_positions()
+        segment_codes = group_index.codes[group_index.segment_order]
+        values = data_frame[self.source].take(segment_positions).reset_index(drop=True)
+
+        window_values = get_window_values(values=values, segment_codes=segment_codes, function=self.function, frame=self.frame)
+        window_values = pd.Series(window_values.to_numpy(), index=segment_positions).reindex(np.arange(len(data_frame)))
+
+        data_frame[field_name] = window_values.to_numpy()
+
+    def is_evaluated(self):
+        field_name = self.name
+        table = self.table
+        data_frame = table.data_frame
+        return field_name in data_frame.columns
+
+    def is_required_for_aggregation(self):
+        return False
+
+    def get_dependencies(self):
+        table_type = type(self.table)
+
+        return [(table_type, field_name) for field_name in self.get_source_field_names()]
+
 class AutoIncrementPrimaryKeyField(Field):
     def __init__(self):
         super(AutoIncrementPrimaryKeyField, self).__init__()
@@ -397,11 +900,20 @@ class AutoIncrementPrimaryKeyField(Field):
     def is_required_for_aggregation(self):
         return False
 
+    def get_dependencies(self):
+        table = self.table
+
+        return table.get_aggregation_dependencies()
+
 class GroupField(Field):
-    def __init__(self, source, primary_key=False):
+    def __init__(self, source, primary_key=False, bucket=None):
         super(GroupField, self).__init__()
+        if bucket is not None and bucket not in date_bucket_frequencies:
+            raise UnknownDateBucket("Date bucket must be one of {}, but {} found.".format(list(date_bucket_frequencies.keys()), bucket))
+
         self.source = source
         self.primary_key = primary_key
+        self.bucket = bucket
 
     def do_nothing_intentionally(self):
         pass
@@ -434,13 +946,44 @@ class GroupField(Field):
 
         return source_field_object.is_evaluated()
 
+    def get_dependencies(self):
+        table = self.table
+
+        return table.get_aggregation_dependencies()
+
 class AggregatedField(Field):
-    def __init__(self, source, aggregate_function):
+    engines = ["pandas", "vectorized", "jit"]
+
+    def __init__(self, source, aggregate_function, engine="pandas"):
         super(AggregatedField, self).__init__()
+        if engine not in self.engines:
+            raise UnknownAggregateEngine("Aggregate engine must be one of {}, but {} found.".format(self.engines, engine))
+
         self.source = source
         self.aggregate_function = aggregate_function
+        self.engine = engine
+        self.segment_reducer = None
         self.primary_key = False
 
+    def is_aggregated_by_segments(self):
+        return self.engine != "pandas"
+
+    def get_segment_reducer(self):
+        if self.segment_reducer is None:
+            aggregate_function = self.aggregate_function
+
+            if self.engine == "jit":
+                self.segment_reducer = compile_segment_reducer(aggregate_function)
+            else:
+                self.segment_reducer = aggregate_function
+
+        return self.segment_reducer
+
+    def aggregate_segments(self, values, offsets):
+        segment_reducer = self.get_segment_reducer()
+
+        return segment_reducer(values, offsets)
+
     def do_nothing_intentionally(self):
         pass
 
@@ -470,4 +1013,14 @@ class AggregatedField(Field):
         source_field_name = self.source
         source_field_object = source_table.Fields.__dict__[source_field_name]
 
-        return source_field_object.is_evaluated()
\ No newline at end of file
+        return source_field_object.is_evaluated()
+
+    def get_dependencies(self):
+        table = self.table
+
+        return table.get_aggregation_dependencies()
+
+def is_stored_field(field_object):
+    stored_field_types = (IntField, StringField, FloatField, BoolField, DateField)
+
+    return isinstance(field_object, stored_field_types)
\ No newline at end of file
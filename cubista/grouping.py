@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+date_bucket_frequencies = {
+    "year": "Y",
+    "quarter": "Q",
+    "month": "M",
+    "week": "W-SUN",
+    "day": "D"
+}
+
+window_functions = ["sum", "mean", "min", "max", "count", "first", "last", "row_number"]
+
+running_window_functions = ["sum", "mean", "min", "max", "count", "row_number"]
+
+window_frames = ["partition", "running"]
+
+def truncate_dates(data, bucket):
+    if data.dtype.kind != "M":
+        data = pd.to_datetime(data)
+
+    return data.dt.to_period(date_bucket_frequencies[bucket]).dt.start_time
+
+def get_bucketed_data_frame(data_frame, buckets):
+    for field_name, bucket in buckets.items():
+        data_frame[field_name] = truncate_dates(data_frame[field_name], bucket)
+
+    return data_frame
+
+class GroupIndex:
+    def __init__(self, permutation, codes, group_count):
+        self.permutation = permutation
+        self.codes = codes
+        self.group_count = group_count
+
+        self.set_segment_order_and_offsets()
+
+    @staticmethod
+    def get_sort_permutation(data_frame, sort_by_field_names):
+        if not sort_by_field_names:
+            return np.arange(len(data_frame))
+
+        sort_by_data_frame = data_frame[sort_by_field_names].reset_index(drop=True)
+        sorted_data_frame = sort_by_data_frame.sort_values(by=sort_by_field_names, kind="stable")
+
+        return sorted_data_frame.index.to_numpy()
+
+    @staticmethod
+    def get_group_codes(data_frame, group_by_field_names, buckets=None):
+        if not group_by_field_names:
+            return np.zeros(len(data_frame), dtype=np.int64), int(len(data_frame) > 0)
+
+        group_by_data_frame = data_frame[group_by_field_names].reset_index(drop=True)
+        group_by_data_frame = get_bucketed_data_frame(data_frame=group_by_data_frame, buckets=buckets or {})
+        codes = group_by_data_frame.groupby(group_by_field_names, sort=True).ngroup()
+        codes = codes.fillna(-1).to_numpy().astype(np.int64)
+        group_count = int(codes.max()) + 1 if len(codes) else 0
+
+        return codes, group_count
+
+    @classmethod
+    def build(cls, data_frame, sort_by_field_names, group_by_field_names, buckets=None):
+        permutation = cls.get_sort_permutation(data_frame=data_frame, sort_by_field_names=sort_by_field_names)
+        codes, group_count = cls.get_group_codes(
+            data_frame=data_frame,
+            group_by_field_names=group_by_field_names,
+            buckets=buckets
+        )
+
+        return cls(permutation=permutation, codes=codes[permutation], group_count=group_count)
+
+    def set_segment_order_and_offsets(self):
+        codes = self.codes
+        group_count = self.group_count
+
+        segment_order = np.argsort(codes, kind="stable")
+        grouped_rows_count = int((codes >= 0).sum())
+        segment_order = segment_order[len(segment_order) - grouped_rows_count:]
+
+        counts = np.bincount(codes[codes >= 0], minlength=group_count)
+
+        self.segment_order = segment_order
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    def get_segment_positions(self):
+        return self.permutation[self.segment_order]
+
+    def get_first_positions(self):
+        segment_positions = self.get_segment_positions()
+        offsets = self.offsets
+
+        return segment_positions[offsets[:-1]]
+
+def get_running_window_values(values, segment_codes, function):
+    if function == "row_number":
+        return values.groupby(segment_codes, sort=False).cumcount() + 1
+
+    counts = values.notna().groupby(segment_codes, sort=False).cumsum()
+
+    if function == "count":
+        return counts
+
+    if function == "mean":
+        return values.groupby(segment_codes, sort=False).cumsum() / counts
+
+    return getattr(values.groupby(segment_codes, sort=False), "cum{}".format(function))()
+
+def get_rolling_window_values(values, segment_codes, function, rows_count):
+    if function == "row_number":
+        return get_running_window_values(values=values, segment_codes=segment_codes, function=function)
+
+    rolling = values.groupby(segment_codes, sort=False).rolling(rows_count, min_periods=1)
+
+    return getattr(rolling, function)().reset_index(level=0, drop=True).sort_index()
+
+def get_window_values(values, segment_codes, function, frame):
+    if frame == "running" or function == "row_number":
+        return get_running_window_values(values=values, segment_codes=segment_codes, function=function)
+
+    if frame == "partition":
+        return values.groupby(segment_codes, sort=False).transform(function)
+
+    return get_rolling_window_values(values=values, segment_codes=segment_codes, function=function, rows_count=frame)
+
+def reduce_segments_in_python(aggregate_function, values, offsets):
+    segments_count = len(offsets) - 1
+    result = np.empty(segments_count, dtype=np.float64)
+
+    for segment in range(segments_count):
+        result[segment] = aggregate_function(values[offsets[segment]:offsets[segment + 1]])
+
+    return result
+
+def compile_segment_reducer(aggregate_function):
+    try:
+        import numba
+    except ImportError:
+        return lambda values, offsets: reduce_segments_in_python(aggregate_function, values, offsets)
+
+    kernel = numba.njit(aggregate_function)
+
+    @numba.njit
+    def reduce_segments(values, offsets):
+        segments_count = len(offsets) - 1
+        result = np.empty(segments_count, dtype=np.float64)
+
+        for segment in range(segments_count):
+            result[segment] = kernel(values[offsets[segment]:offsets[segment + 1]])
+
+        return result
+
+    return reduce_segments
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+import cubista
+
+max_packed_key_cardinality = 2 ** 62
+
+def factorize_key_columns(data, referenced_data):
+    codes, uniques = pd.factorize(pd.concat([data, referenced_data], ignore_index=True))
+
+    return codes[:len(data)], codes[len(data):], len(uniques)
+
+def compress_packed_keys(keys, referenced_keys):
+    codes, uniques = pd.factorize(np.concatenate([keys, referenced_keys]))
+
+    return codes[:len(keys)].astype(np.int64), codes[len(keys):].astype(np.int64), len(uniques)
+
+def pack_key_columns(data_frame, field_names, referenced_data_frame, referenced_field_names):
+    keys = np.zeros(len(data_frame), dtype=np.int64)
+    referenced_keys = np.zeros(len(referenced_data_frame), dtype=np.int64)
+    null_mask = np.zeros(len(data_frame), dtype=bool)
+    referenced_null_mask = np.zeros(len(referenced_data_frame), dtype=bool)
+    cardinality = 1
+
+    for field_name, referenced_field_name in zip(field_names, referenced_field_names):
+        codes, referenced_codes, uniques_count = factorize_key_columns(
+            data=data_frame[field_name],
+            referenced_data=referenced_data_frame[referenced_field_name]
+        )
+
+        if cardinality * (uniques_count + 1) > max_packed_key_cardinality:
+            keys, referenced_keys, cardinality = compress_packed_keys(keys=keys, referenced_keys=referenced_keys)
+
+        keys = keys * (uniques_count + 1) + codes + 1
+        referenced_keys = referenced_keys * (uniques_count + 1) + referenced_codes + 1
+        null_mask = null_mask | (codes < 0)
+        referenced_null_mask = referenced_null_mask | (referenced_codes < 0)
+        cardinality = cardinality * (uniques_count + 1)
+
+    keys[null_mask] = -1
+    referenced_keys[referenced_null_mask] = -1
+
+    return keys, referenced_keys
+
+def get_referenced_positions(data_frame, field_names, referenced_data_frame, referenced_field_names):
+    if len(field_names) != len(referenced_field_names):
+        raise cubista.KeyFieldsMismatch("Key fields {} do not match referenced key fields {}.".format(field_names, referenced_field_names))
+
+    keys, referenced_keys = pack_key_columns(
+        data_frame=data_frame,
+        field_names=field_names,
+        referenced_data_frame=referenced_data_frame,
+        referenced_field_names=referenced_field_names
+    )
+    referenced_not_null_positions = np.flatnonzero(referenced_keys >= 0)
+    referenced_index = pd.Index(referenced_keys[referenced_not_null_positions])
+
+    if not referenced_index.is_unique:
+        raise cubista.ReferencedKeyIsNotUnique("Referenced key fields {} are not unique.".format(referenced_field_names))
+
+    if not len(referenced_index):
+        return np.full(len(keys), -1, dtype=np.int64)
+
+    positions = referenced_index.get_indexer(keys)
+    positions[keys < 0] = -1
+
+    return np.where(positions >= 0, referenced_not_null_positions[np.maximum(positions, 0)], -1)
+
+def take_referenced_values(data, positions):
+    if isinstance(data.dtype, pd.api.extensions.ExtensionDtype):
+        values = data.array
+    else:
+        values = data.to_numpy()
+
+    return pd.api.extensions.take(values, positions, allow_fill=True)
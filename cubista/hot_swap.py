@@ -0,0 +1,19 @@
+import asyncio
+
+from .data_source import DataSource
+
+class HotSwapDataSource:
+    def __init__(self, data_source=None, data_source_type=DataSource):
+        self.data_source = data_source
+        self.data_source_type = data_source_type
+        self.refresh_lock = asyncio.Lock()
+
+    async def refresh(self, tables, executor=None, progress=None, **kwargs):
+        async with self.refresh_lock:
+            if self.data_source is not None:
+                self.data_source.replaced = True
+
+            data_source = await self.data_source_type.build_async(tables=tables, executor=executor, progress=progress, **kwargs)
+            self.data_source = data_source
+
+            return data_source
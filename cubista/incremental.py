@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+import cubista
+
+def set_rows(data_frame, positions, column_name, values):
+    values = pd.Series(values)
+
+    if column_name not in data_frame.columns:
+        data_frame[column_name] = pd.Series(np.nan, index=data_frame.index, dtype=object)
+
+    column = data_frame[column_name]
+
+    if isinstance(column.dtype, np.dtype) and isinstance(values.dtype, np.dtype):
+        new_values = column.to_numpy().astype(np.result_type(column.dtype, values.dtype), copy=True)
+        new_values[positions] = values.to_numpy()
+    else:
+        try:
+            new_values = column.copy()
+            new_values.iloc[positions] = values.to_numpy()
+        except (TypeError, ValueError):
+            new_values = column.to_numpy().astype(object, copy=True)
+            new_values[positions] = values.to_numpy()
+
+    data_frame[column_name] = new_values
+
+def get_positions_by_keys(data_frame, field_names, keys_data_frame, key_field_names):
+    keys_data_frame = keys_data_frame[key_field_names].dropna().drop_duplicates()
+
+    if not len(keys_data_frame) or not len(data_frame):
+        return np.array([], dtype=np.int64)
+
+    referenced_positions = cubista.get_referenced_positions(
+        data_frame=data_frame,
+        field_names=field_names,
+        referenced_data_frame=keys_data_frame,
+        referenced_field_names=key_field_names
+    )
+
+    return np.flatnonzero(referenced_positions >= 0)
+
+def remove_rows(data_frame, positions):
+    is_kept = np.ones(len(data_frame), dtype=bool)
+    is_kept[positions] = False
+
+    return data_frame.take(np.flatnonzero(is_kept))
+
+def append_rows(data_frame, rows):
+    return pd.concat([data_frame, rows], ignore_index=isinstance(data_frame.index, pd.RangeIndex))
+
+def sort_rows(rows, primary_key_field_name):
+    rows = rows.sort_values(by=primary_key_field_name, kind="stable").reset_index(drop=True)
+
+    return rows[sorted(rows.columns)]
+
+def are_rows_equal(old_rows, new_rows, primary_key_field_name):
+    if len(old_rows) != len(new_rows) or set(old_rows.columns) != set(new_rows.columns):
+        return False
+
+    old_rows = sort_rows(rows=old_rows, primary_key_field_name=primary_key_field_name)
+    new_rows = sort_rows(rows=new_rows, primary_key_field_name=primary_key_field_name)
+
+    for field_name in old_rows.columns:
+        old_values = old_rows[field_name].astype(object)
+        new_values = new_rows[field_name].astype(object)
+
+        if not ((old_values == new_values) | (old_values.isna() & new_values.isna())).all():
+            return False
+
+    return True
+
+def get_rows_signature(rows, primary_key_field_name):
+    rows = sort_rows(rows=rows, primary_key_field_name=primary_key_field_name)
+
+    return pd.util.hash_pandas_object(rows.astype(str), index=False).to_numpy().tobytes()
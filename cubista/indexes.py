@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+class UniqueHashIndex:
+    def __init__(self, values):
+        self.index = pd.Index(values)
+
+    def get_positions(self, keys):
+        return self.index.get_indexer(keys)
+
+    def get_position(self, key):
+        position = self.get_positions([key])[0]
+
+        if position < 0:
+            return None
+
+        return int(position)
+
+class HashIndex:
+    def __init__(self, values):
+        codes, uniques = pd.factorize(values)
+        self.index = pd.Index(uniques)
+        self.order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        self.offsets = offsets + int((codes < 0).sum())
+
+    def get_positions(self, key):
+        code = self.index.get_indexer([key])[0]
+
+        if code < 0:
+            return np.array([], dtype=np.int64)
+
+        return self.order[self.offsets[code]:self.offsets[code + 1]]
+
+class SortedIndex:
+    def __init__(self, values):
+        series = pd.Series(values).reset_index(drop=True)
+        not_null_series = series.dropna().sort_values(kind="stable")
+        self.order = not_null_series.index.to_numpy()
+        self.sorted_values = not_null_series.to_numpy()
+
+    def get_positions_in_range(self, low=None, high=None, include_high=True):
+        sorted_values = self.sorted_values
+        start = 0 if low is None else np.searchsorted(sorted_values, low, side="left")
+        side = "right" if include_high else "left"
+        end = len(sorted_values) if high is None else np.searchsorted(sorted_values, high, side=side)
+
+        return self.order[start:end]
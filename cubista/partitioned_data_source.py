@@ -0,0 +1,269 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+
+import cubista
+from .data_source import DataSource
+
+shard_evaluation_data_source = None
+
+def evaluate_shard_in_worker(shard_number):
+    return shard_evaluation_data_source.evaluate_shard(shard_number=shard_number)
+
+class PartitionedDataSource(DataSource):
+    def __init__(self, tables, partition_by, workers=None, shards_count=None, backend="pandas"):
+        self.partition_by = partition_by
+        self.workers = workers or os.cpu_count() or 1
+        self.shards_count = shards_count or self.workers
+        self.shard_positions = []
+        self.full_data_frames = {}
+        self.fields_deferred_from_dimensions = set()
+        self.fields_deferred_from_shards = set()
+        self.deferred_fields = set()
+
+        super(PartitionedDataSource, self).__init__(tables=tables, backend=backend)
+
+    @classmethod
+    async def build_async(cls, tables, executor=None, progress=None, **kwargs):
+        return await cls.build_in_executor_async(tables=tables, executor=executor, progress=progress, **kwargs)
+
+    def get_partitioned_tables(self):
+        tables = self.tables
+        partition_by = self.partition_by
+
+        return [table for table_type, table in tables.items() if table_type in partition_by]
+
+    def is_sourced_from_partitioned_table(self, table):
+        if not isinstance(table, cubista.AggregatedTable):
+            return False
+
+        source_table_type = table.Aggregation.source()
+
+        if source_table_type in self.partition_by:
+            return True
+
+        return self.is_sourced_from_partitioned_table(table=self.tables[source_table_type])
+
+    def get_deferred_tables(self):
+        tables = self.tables
+
+        return [table for _, table in tables.items() if self.is_sourced_from_partitioned_table(table=table)]
+
+    def get_dimension_tables(self):
+        tables = self.tables
+        partitioned_tables = self.get_partitioned_tables()
+        deferred_tables = self.get_deferred_tables()
+
+        return [
+            table for _, table in tables.items()
+            if table not in partitioned_tables and table not in deferred_tables
+        ]
+
+    def check_references_raise_exception_otherwise(self):
+        dimension_tables = self.get_dimension_tables()
+        partitioned_tables = self.get_partitioned_tables()
+
+        for table in dimension_tables + partitioned_tables:
+            table.check_references_raise_exception_otherwise()
+
+    def set_shard_positions(self):
+        partitioned_tables = self.get_partitioned_tables()
+        partition_by = self.partition_by
+
+        partition_values = pd.concat(
+            [table.data_frame[partition_by[type(table)]] for table in partitioned_tables],
+            ignore_index=True
+        )
+        codes, uniques = pd.factorize(partition_values, sort=True)
+        shards_count = max(min(self.shards_count, len(uniques)), 1)
+        shard_numbers = np.maximum(codes, 0) * shards_count // max(len(uniques), 1)
+
+        self.shard_positions = [{} for _ in range(shards_count)]
+        offset = 0
+
+        for table in partitioned_tables:
+            table_shard_numbers = shard_numbers[offset:offset + len(table.data_frame)]
+            offset = offset + len(table.data_frame)
+
+            for shard_number in range(shards_count):
+                self.shard_positions[shard_number][type(table)] = np.flatnonzero(table_shard_numbers == shard_number)
+
+    def is_window_field_split_by_shards(self, table, field_object):
+        partition_by = self.partition_by
+
+        if not isinstance(field_object, cubista.WindowField) or type(table) not in partition_by:
+            return False
+
+        return partition_by[type(table)] not in field_object.partition_by
+
+    def is_pull_from_partitioned_table(self, table, field_object):
+        partition_by = self.partition_by
+
+        return type(table) in partition_by and isinstance(field_object, cubista.PullByForeignKey) and field_object.to() in partition_by
+
+    def get_consuming_fields(self, fields):
+        field_consumers = self.get_field_consumers()
+        result = set()
+        not_visited_fields = list(fields)
+
+        while not_visited_fields:
+            deferred_field = not_visited_fields.pop()
+
+            if deferred_field in result:
+                continue
+
+            result.add(deferred_field)
+            not_visited_fields.extend(field_consumers.get(deferred_field, []))
+
+        return result
+
+    def get_fields_deferred_from_dimensions(self):
+        dimension_table_types = [type(table) for table in self.get_dimension_tables()]
+        sharded_fields = [
+            (type(table), field_name)
+            for table in self.get_partitioned_tables() + self.get_deferred_tables()
+            for field_name in table.get_fields().keys()
+        ]
+
+        return set([
+            consuming_field for consuming_field in self.get_consuming_fields(fields=sharded_fields)
+            if consuming_field[0] in dimension_table_types
+        ])
+
+    def get_fields_deferred_from_shards(self):
+        tables = self.tables
+        split_fields = [
+            (table_type, field_name)
+            for table_type, table in tables.items()
+            for field_name, field_object in table.get_fields().items()
+            if self.is_window_field_split_by_shards(table=table, field_object=field_object)
+            or self.is_pull_from_partitioned_table(table=table, field_object=field_object)
+        ]
+
+        return self.get_consuming_fields(fields=split_fields + list(self.fields_deferred_from_dimensions))
+
+    def is_field_required(self, field_object):
+        if (type(field_object.table), field_object.name) in self.deferred_fields:
+            return False
+
+        return super(PartitionedDataSource, self).is_field_required(field_object=field_object)
+
+    def are_groups_disjoint(self, table):
+        partition_field_name = self.partition_by[table.Aggregation.source()]
+
+        return partition_field_name in table.Aggregation.group_by and partition_field_name not in table.get_buckets()
+
+    def is_partial_aggregation_possible(self, table):
+        source_table_type = table.Aggregation.source()
+        partition_by = self.partition_by
+        fields_deferred_from_shards = self.fields_deferred_from_shards
+
+        if source_table_type not in partition_by:
+            return False
+
+        if any([(type(table), field_name) in fields_deferred_from_shards for field_name in table.get_fields().keys()]):
+            return False
+
+        groups_are_disjoint = self.are_groups_disjoint(table=table)
+
+        return table.can_merge_partial_aggregates(groups_are_disjoint=groups_are_disjoint)
+
+    def evaluate_shard(self, shard_number):
+        partitioned_tables = self.get_partitioned_tables()
+        deferred_tables = self.get_deferred_tables()
+        full_data_frames = self.full_data_frames
+        shard_positions = self.shard_positions[shard_number]
+        partitioned_table_types = [type(table) for table in partitioned_tables]
+
+        for table in partitioned_tables:
+            positions = shard_positions[type(table)]
+            table.data_frame = full_data_frames[type(table)].take(positions).reset_index(drop=True)
+            table.mark_references_checked()
+
+        self.freed_fields = set([freed_field for freed_field in self.freed_fields if freed_field[0] not in partitioned_table_types])
+
+        self.evaluate_table_objects(table_objects=partitioned_tables)
+
+        partial_aggregates = {}
+
+        for index, table in enumerate(deferred_tables):
+            if self.is_partial_aggregation_possible(table=table):
+                source_table = table.get_source_table()
+                source_data_frame = table.filter_source_data_frame(source_data_frame=source_table.data_frame)
+                partial_aggregates[index] = table.aggregate_partition(source_data_frame=source_data_frame)
+
+        return [table.data_frame for table in partitioned_tables], partial_aggregates
+
+    def evaluate_shards(self):
+        global shard_evaluation_data_source
+
+        shard_numbers = range(len(self.shard_positions))
+        workers = self.workers
+
+        if workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+            shard_evaluation_data_source = self
+
+            try:
+                with multiprocessing.get_context("fork").Pool(processes=workers) as pool:
+                    return pool.map(evaluate_shard_in_worker, shard_numbers)
+            finally:
+                shard_evaluation_data_source = None
+
+        return [self.evaluate_shard(shard_number=shard_number) for shard_number in shard_numbers]
+
+    def merge_shard_results(self, shard_results):
+        partitioned_tables = self.get_partitioned_tables()
+        deferred_tables = self.get_deferred_tables()
+        full_data_frames = self.full_data_frames
+
+        for index, table in enumerate(partitioned_tables):
+            positions = np.concatenate([
+                shard_positions[type(table)][data_frames[index].index.to_numpy()]
+                for shard_positions, (data_frames, _) in zip(self.shard_positions, shard_results)
+            ])
+            order = np.argsort(positions, kind="stable")
+            data_frame = pd.concat([data_frames[index] for data_frames, _ in shard_results], ignore_index=True)
+            data_frame = data_frame.take(order)
+            data_frame.index = full_data_frames[type(table)].index[positions[order]]
+
+            table.data_frame = data_frame
+            table.mark_references_checked()
+
+            for field_name, field_object in table.get_fields().items():
+                if field_object.transient and field_name not in data_frame.columns:
+                    self.freed_fields.add((type(table), field_name))
+
+        for index, table in enumerate(deferred_tables):
+            if not self.is_partial_aggregation_possible(table=table):
+                continue
+
+            groups_are_disjoint = self.are_groups_disjoint(table=table)
+            partial_data_frames = [partial_aggregates[index] for _, partial_aggregates in shard_results]
+
+            table.merge_partial_aggregates(partial_data_frames=partial_data_frames, groups_are_disjoint=groups_are_disjoint)
+
+    def evaluate_tables(self):
+        tables = self.tables
+        partitioned_tables = self.get_partitioned_tables()
+        dimension_tables = self.get_dimension_tables()
+
+        self.fields_deferred_from_dimensions = self.get_fields_deferred_from_dimensions()
+        self.fields_deferred_from_shards = self.get_fields_deferred_from_shards()
+
+        try:
+            self.deferred_fields = self.fields_deferred_from_dimensions
+            self.evaluate_table_objects(table_objects=dimension_tables)
+
+            self.deferred_fields = self.fields_deferred_from_shards
+            self.full_data_frames = {type(table): table.data_frame for table in partitioned_tables}
+            self.set_shard_positions()
+
+            shard_results = self.evaluate_shards()
+            self.merge_shard_results(shard_results=shard_results)
+        finally:
+            self.deferred_fields = set()
+            self.full_data_frames = {}
+
+        self.evaluate_table_objects(table_objects=list(tables.values()))
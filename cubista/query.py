@@ -0,0 +1,116 @@
+import operator
+
+import cubista
+
+predicate_operators = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda data, value: data.isin(value),
+    "not in": lambda data, value: ~data.isin(value),
+    "between": lambda data, value: data.between(value[0], value[1])
+}
+
+class Predicate:
+    def __init__(self, field_name, operator_name, value):
+        if operator_name not in predicate_operators:
+            raise cubista.UnknownPredicateOperator("Operator must be one of {}, but {} found.".format(list(predicate_operators.keys()), operator_name))
+
+        self.field_name = field_name
+        self.operator_name = operator_name
+        self.value = value
+
+    def get_mask(self, data_frame):
+        predicate_operator = predicate_operators[self.operator_name]
+
+        return predicate_operator(data_frame[self.field_name], self.value)
+
+    def rename(self, field_name):
+        return Predicate(field_name=field_name, operator_name=self.operator_name, value=self.value)
+
+def filter_data_frame(data_frame, predicates):
+    if not predicates:
+        return data_frame
+
+    mask = predicates[0].get_mask(data_frame)
+
+    for predicate in predicates[1:]:
+        mask = mask & predicate.get_mask(data_frame)
+
+    return data_frame[mask.to_numpy()]
+
+class Query:
+    def __init__(self, data_source, table_type):
+        self.data_source = data_source
+        self.table_type = table_type
+        self.predicates = []
+        self.field_names = None
+
+    def where(self, field_name, operator_name, value):
+        self.predicates.append(Predicate(field_name=field_name, operator_name=operator_name, value=value))
+
+        return self
+
+    def select(self, *field_names):
+        self.field_names = list(field_names)
+
+        return self
+
+    def get_field_names(self):
+        if self.field_names is not None:
+            return self.field_names
+
+        table = self.data_source.tables[self.table_type]
+
+        return list(table.get_fields().keys())
+
+    def get_pushed_down_predicates(self, required_fields):
+        data_source = self.data_source
+        table = data_source.tables[self.table_type]
+        fields = table.get_fields()
+        aggregated_table_types_by_source = data_source.get_required_aggregated_table_types_by_source(required_fields=required_fields)
+
+        result = {}
+        remaining_predicates = []
+
+        for predicate in self.predicates:
+            field_object = fields[predicate.field_name]
+
+            if cubista.is_stored_field(field_object) and self.table_type not in aggregated_table_types_by_source \
+                    and not table.has_window_fields():
+                result.setdefault(self.table_type, []).append(predicate)
+            elif isinstance(field_object, cubista.GroupField) and field_object.bucket is None and field_object.source in table.Aggregation.group_by \
+                    and not table.get_top_n():
+                source_table = table.get_source_table()
+                source_field_object = source_table.get_fields()[field_object.source]
+                source_aggregated_table_types = aggregated_table_types_by_source.get(type(source_table), [])
+
+                if cubista.is_stored_field(source_field_object) and not isinstance(source_table, cubista.AggregatedTable) \
+                        and source_aggregated_table_types == [self.table_type] and not source_table.has_window_fields():
+                    result.setdefault(type(source_table), []).append(predicate.rename(field_name=field_object.source))
+                else:
+                    remaining_predicates.append(predicate)
+            else:
+                remaining_predicates.append(predicate)
+
+        return result, remaining_predicates
+
+    def execute(self):
+        data_source = self.data_source
+        field_names = self.get_field_names()
+        predicate_field_names = [predicate.field_name for predicate in self.predicates]
+        freed_field_names = [
+            field_name for field_name in field_names + predicate_field_names
+            if (self.table_type, field_name) in data_source.freed_fields
+        ]
+
+        if data_source.lazy or freed_field_names:
+            return data_source.evaluate_query(query=self)
+
+        table = data_source.tables[self.table_type]
+        data_frame = filter_data_frame(data_frame=table.data_frame, predicates=self.predicates)
+
+        return data_frame[field_names].copy()
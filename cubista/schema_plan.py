@@ -0,0 +1,142 @@
+import hashlib
+import os
+import pickle
+from typing import NamedTuple, Tuple
+
+import cubista
+
+not_hashed_field_attributes = ["name", "table", "references_checked", "referenced_positions_cache", "segment_reducer"]
+
+class FieldPlan(NamedTuple):
+    table_name: str
+    field_name: str
+    kind: str
+    required_types: Tuple[str, ...]
+    dependencies: Tuple[Tuple[str, str], ...]
+
+class SchemaPlan(NamedTuple):
+    schema_hash: str
+    table_names: Tuple[str, ...]
+    fields: Tuple[FieldPlan, ...]
+    evaluation_order: Tuple[Tuple[str, str], ...]
+
+def get_table_type_name(table_type):
+    return "{}.{}".format(table_type.__module__, table_type.__qualname__)
+
+def describe_value(attribute_name, value):
+    if attribute_name in ["to", "source"] and callable(value):
+        return get_table_type_name(value())
+
+    if isinstance(value, type):
+        return get_table_type_name(value)
+
+    if callable(value):
+        return getattr(value, "__qualname__", type(value).__name__)
+
+    return repr(value)
+
+def describe_table_type(table_type):
+    fields = {key: value for key, value in table_type.Fields.__dict__.items() if not key.startswith("__")}
+    result = [get_table_type_name(table_type)]
+
+    aggregation = getattr(table_type, "Aggregation", None)
+
+    if aggregation is not None:
+        result.append(repr(sorted([
+            (attribute_name, describe_value(attribute_name, value))
+            for attribute_name, value in aggregation.__dict__.items() if not attribute_name.startswith("__")
+        ])))
+
+    for field_name, field_object in fields.items():
+        attributes = sorted([
+            (attribute_name, describe_value(attribute_name, value))
+            for attribute_name, value in field_object.__dict__.items() if attribute_name not in not_hashed_field_attributes
+        ])
+        result.append("{}:{}:{}".format(field_name, type(field_object).__name__, repr(attributes)))
+
+    return "\n".join(result)
+
+def get_schema_hash(table_types):
+    schema_description = "\n".join([describe_table_type(table_type=table_type) for table_type in table_types])
+
+    return hashlib.sha256(schema_description.encode("utf-8")).hexdigest()
+
+def get_field_dependencies(table, field_object):
+    if isinstance(table, cubista.AggregatedTable) and (
+            field_object.is_required_for_aggregation() or isinstance(field_object, cubista.AutoIncrementPrimaryKeyField)):
+        return [dependency for dependency in table.get_aggregation_dependencies() if dependency[0] != type(table)]
+
+    return [dependency for dependency in field_object.get_dependencies() if dependency != (type(table), field_object.name)]
+
+def get_evaluation_order(field_plans):
+    not_ordered_field_plans = list(field_plans)
+    ordered_fields = set()
+    result = []
+
+    while not_ordered_field_plans:
+        ready_field_plans = [
+            field_plan for field_plan in not_ordered_field_plans
+            if all([dependency in ordered_fields for dependency in field_plan.dependencies])
+        ]
+
+        if not ready_field_plans:
+            ready_field_plans = not_ordered_field_plans
+
+        for field_plan in ready_field_plans:
+            ordered_fields.add((field_plan.table_name, field_plan.field_name))
+            result.append((field_plan.table_name, field_plan.field_name))
+
+        not_ordered_field_plans = [field_plan for field_plan in not_ordered_field_plans if field_plan not in ready_field_plans]
+
+    return tuple(result)
+
+def compile_schema_plan(data_source):
+    tables = data_source.tables
+    field_plans = []
+
+    for table_type, table in tables.items():
+        table_name = get_table_type_name(table_type)
+
+        for field_name, field_object in table.get_fields().items():
+            required_types = getattr(field_object, "required_types", [])
+            dependencies = get_field_dependencies(table=table, field_object=field_object)
+
+            field_plans.append(FieldPlan(
+                table_name=table_name,
+                field_name=field_name,
+                kind=type(field_object).__name__,
+                required_types=tuple([required_type.__name__ for required_type in required_types]),
+                dependencies=tuple([
+                    (get_table_type_name(dependency_table_type), dependency_field_name)
+                    for dependency_table_type, dependency_field_name in dependencies
+                ])
+            ))
+
+    return SchemaPlan(
+        schema_hash=get_schema_hash(table_types=list(tables.keys())),
+        table_names=tuple([get_table_type_name(table_type) for table_type in tables.keys()]),
+        fields=tuple(field_plans),
+        evaluation_order=get_evaluation_order(field_plans=field_plans)
+    )
+
+def get_schema_plan_path(directory, schema_hash):
+    return os.path.join(directory, "schema-plan-{}.pickle".format(schema_hash))
+
+def load_schema_plan(data_source, directory):
+    schema_hash = get_schema_hash(table_types=list(data_source.tables.keys()))
+    path = get_schema_plan_path(directory=directory, schema_hash=schema_hash)
+
+    if os.path.exists(path):
+        with open(path, "rb") as file:
+            return pickle.load(file)
+
+    schema_plan = cubista.compile_schema_plan(data_source=data_source)
+    os.makedirs(directory, exist_ok=True)
+    temporary_path = "{}.{}".format(path, os.getpid())
+
+    with open(temporary_path, "wb") as file:
+        pickle.dump(schema_plan, file)
+
+    os.replace(temporary_path, path)
+
+    return schema_plan
@@ -0,0 +1,156 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .exceptions import CannotShareColumn
+
+class SharedColumn:
+    def __init__(self, name, shared_memory_name, dtype, length, categories=None):
+        self.name = name
+        self.shared_memory_name = shared_memory_name
+        self.dtype = dtype
+        self.length = length
+        self.categories = categories
+
+    def is_dictionary_encoded(self):
+        return self.categories is not None
+
+class SharedTable:
+    def __init__(self, table_type, columns, index):
+        self.table_type = table_type
+        self.columns = columns
+        self.index = index
+
+class SharedMemoryBlocks:
+    def __init__(self):
+        self.blocks = []
+
+    def create(self, array):
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+        view[:] = array
+        self.blocks.append(block)
+
+        return block.name
+
+    def attach(self, name, dtype, length):
+        try:
+            block = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            block = shared_memory.SharedMemory(name=name)
+
+        self.blocks.append(block)
+        view = np.ndarray((length,), dtype=np.dtype(dtype), buffer=block.buf)
+        view.setflags(write=False)
+
+        return view
+
+    def close(self):
+        for block in self.blocks:
+            block.close()
+
+    def unlink(self):
+        for block in self.blocks:
+            block.unlink()
+
+def get_dictionary_encoded_values(name, data):
+    if isinstance(data.dtype, pd.CategoricalDtype):
+        return data.cat.codes.to_numpy(), data.cat.categories.tolist()
+
+    try:
+        codes, categories = pd.factorize(data)
+    except TypeError:
+        raise CannotShareColumn("Column {} cannot be dictionary encoded.".format(name))
+
+    categories = list(categories)
+    codes = pd.Categorical.from_codes(codes, categories=categories).codes
+
+    return codes, categories
+
+def export_column(blocks, name, data):
+    if data.dtype.kind in "biufcmM" and not isinstance(data.dtype, pd.CategoricalDtype):
+        values = data.to_numpy()
+        categories = None
+    else:
+        values, categories = get_dictionary_encoded_values(name=name, data=data)
+
+    values = np.ascontiguousarray(values)
+    shared_memory_name = blocks.create(array=values)
+
+    return SharedColumn(
+        name=name,
+        shared_memory_name=shared_memory_name,
+        dtype=values.dtype.str,
+        length=len(values),
+        categories=categories
+    )
+
+def attach_column(blocks, column):
+    values = blocks.attach(name=column.shared_memory_name, dtype=column.dtype, length=column.length)
+
+    if column.is_dictionary_encoded():
+        return pd.Categorical.from_codes(values, categories=column.categories)
+
+    return values
+
+class SharedTablesExport:
+    def __init__(self, blocks, manifest):
+        self.blocks = blocks
+        self.manifest = manifest
+
+    def close(self):
+        self.blocks.close()
+
+    def unlink(self):
+        self.blocks.unlink()
+
+class SharedTables:
+    def __init__(self, blocks, tables):
+        self.blocks = blocks
+        self.tables = tables
+
+    def close(self):
+        self.tables = []
+        self.blocks.close()
+
+def export_data_source_to_shared_memory(data_source):
+    blocks = SharedMemoryBlocks()
+    manifest = []
+
+    for table_type, table in data_source.tables.items():
+        data_frame = table.data_frame
+        columns = [
+            export_column(blocks=blocks, name=column_name, data=data_frame[column_name])
+            for column_name in data_frame.columns
+        ]
+
+        index = None
+
+        if not data_frame.index.equals(pd.RangeIndex(len(data_frame))):
+            index = export_column(blocks=blocks, name=None, data=data_frame.index.to_series())
+
+        manifest.append(SharedTable(table_type=table_type, columns=columns, index=index))
+
+    return SharedTablesExport(blocks=blocks, manifest=manifest)
+
+def attach_shared_data_frame(blocks, shared_table):
+    data = {column.name: attach_column(blocks=blocks, column=column) for column in shared_table.columns}
+
+    if shared_table.index is not None:
+        index = pd.Index(attach_column(blocks=blocks, column=shared_table.index))
+    else:
+        index = pd.RangeIndex(shared_table.columns[0].length if shared_table.columns else 0)
+
+    return pd.DataFrame(data, index=index, copy=False)
+
+def attach_shared_tables(manifest):
+    blocks = SharedMemoryBlocks()
+    tables = []
+
+    for shared_table in manifest:
+        data_frame = attach_shared_data_frame(blocks=blocks, shared_table=shared_table)
+        table_type = shared_table.table_type
+        tables.append(table_type.from_evaluated_data_frame(data_frame=data_frame))
+
+    return SharedTables(blocks=blocks, tables=tables)
@@ -0,0 +1,80 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+default_spill_chunk_rows = 1000000
+
+def is_parquet_available():
+    try:
+        import pyarrow
+    except ImportError:
+        return False
+
+    return True
+
+def get_hash_partition_numbers(data_frame, field_names, partitions_count):
+    hashes = pd.util.hash_pandas_object(data_frame[field_names], index=False).to_numpy()
+
+    return (hashes % np.uint64(partitions_count)).astype(np.int64)
+
+def write_partition(data_frame, path):
+    if is_parquet_available():
+        data_frame.to_parquet(path, index=False)
+    else:
+        data_frame.to_pickle(path)
+
+def read_partition(path):
+    if is_parquet_available():
+        return pd.read_parquet(path)
+
+    return pd.read_pickle(path)
+
+def spill_hash_partitions(data_frames, field_names, partitions_count, directory):
+    paths = {}
+
+    for chunk_number, data_frame in enumerate(data_frames):
+        partition_numbers = get_hash_partition_numbers(
+            data_frame=data_frame,
+            field_names=field_names,
+            partitions_count=partitions_count
+        )
+        order = np.argsort(partition_numbers, kind="stable")
+        offsets = np.searchsorted(partition_numbers[order], np.arange(partitions_count + 1))
+
+        for partition_number in range(partitions_count):
+            positions = order[offsets[partition_number]:offsets[partition_number + 1]]
+
+            if not len(positions):
+                continue
+
+            path = os.path.join(directory, "partition-{:05d}-{:05d}".format(partition_number, chunk_number))
+            write_partition(data_frame=data_frame.take(positions).reset_index(drop=True), path=path)
+            paths.setdefault(partition_number, []).append(path)
+
+    return [paths[partition_number] for partition_number in sorted(paths.keys())]
+
+def read_partition_chunks(paths):
+    return pd.concat([read_partition(path) for path in paths], ignore_index=True)
+
+def aggregate_spilled_partitions(data_frames, field_names, partitions_count, aggregate_partition, workers=1, directory=None):
+    with tempfile.TemporaryDirectory(dir=directory) as spill_directory:
+        partitions_paths = spill_hash_partitions(
+            data_frames=data_frames,
+            field_names=field_names,
+            partitions_count=partitions_count,
+            directory=spill_directory
+        )
+
+        def aggregate_paths(paths):
+            return aggregate_partition(read_partition_chunks(paths))
+
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(aggregate_paths, partitions_paths))
+        else:
+            results = [aggregate_paths(paths) for paths in partitions_paths]
+
+    return results
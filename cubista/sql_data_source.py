@@ -0,0 +1,388 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+import cubista
+from .data_source import DataSource
+
+row_number_field_name = "__row_number"
+
+sql_aggregate_functions = {
+    "sum": "SUM({})",
+    "min": "MIN({})",
+    "max": "MAX({})",
+    "mean": "AVG({})",
+    "count": "COUNT({})",
+    "size": "COUNT(*)",
+    "nunique": "COUNT(DISTINCT {})"
+}
+
+def quote_name(name):
+    return '"{}"'.format(name.replace('"', '""'))
+
+def get_join_condition(left_alias, field_names, right_alias, referenced_field_names):
+    return " AND ".join([
+        "{}.{} = {}.{}".format(left_alias, quote_name(field_name), right_alias, quote_name(referenced_field_name))
+        for field_name, referenced_field_name in zip(field_names, referenced_field_names)
+    ])
+
+class SqlDataSource(DataSource):
+    def __init__(self, tables, connection=None, validation=None, validation_workers=1, collect_all_errors=False):
+        self.connection = connection or sqlite3.connect(":memory:")
+        self.sql_table_names = {}
+        self.evaluated_fields = set()
+        self.original_data_frames = {}
+
+        super(SqlDataSource, self).__init__(
+            tables=tables,
+            lazy=True,
+            validation=validation,
+            validation_workers=validation_workers,
+            collect_all_errors=collect_all_errors
+        )
+
+        self.evaluate_tables_in_sql()
+        self.lazy = False
+
+    @classmethod
+    async def build_async(cls, tables, executor=None, progress=None, **kwargs):
+        if kwargs.get("connection") is None:
+            kwargs["connection"] = sqlite3.connect(":memory:", check_same_thread=False)
+
+        return await cls.build_in_executor_async(tables=tables, executor=executor, progress=progress, **kwargs)
+
+    def execute(self, sql, parameters=None):
+        connection = self.connection
+
+        if parameters is None:
+            return connection.execute(sql)
+
+        return connection.execute(sql, parameters)
+
+    def read_data_frame(self, sql):
+        result = self.execute(sql)
+
+        if hasattr(result, "fetchdf"):
+            return result.fetchdf()
+
+        column_names = [description[0] for description in result.description]
+
+        return pd.DataFrame.from_records(result.fetchall(), columns=column_names)
+
+    def load_data_frame(self, sql_table_name, data_frame):
+        connection = self.connection
+
+        if hasattr(connection, "register"):
+            connection.register("cubista_loaded_data_frame", data_frame)
+            self.execute("CREATE OR REPLACE TABLE {} AS SELECT * FROM cubista_loaded_data_frame".format(quote_name(sql_table_name)))
+            connection.unregister("cubista_loaded_data_frame")
+        else:
+            data_frame.to_sql(sql_table_name, connection, index=False, if_exists="replace")
+
+    def replace_table(self, sql_table_name, select_sql, parameters=None):
+        new_sql_table_name = "{}__new".format(sql_table_name)
+
+        self.execute("CREATE TABLE {} AS {}".format(quote_name(new_sql_table_name), select_sql), parameters)
+        self.execute("DROP TABLE {}".format(quote_name(sql_table_name)))
+        self.execute("ALTER TABLE {} RENAME TO {}".format(quote_name(new_sql_table_name), quote_name(sql_table_name)))
+
+    def get_sql_column_names(self, sql_table_name):
+        result = self.execute("SELECT * FROM {} LIMIT 0".format(quote_name(sql_table_name)))
+
+        return [description[0] for description in result.description]
+
+    def read_table(self, table):
+        sql_table_name = self.sql_table_names[type(table)]
+        data_frame = self.read_data_frame("SELECT * FROM {} ORDER BY {}".format(
+            quote_name(sql_table_name),
+            quote_name(row_number_field_name)
+        ))
+
+        return self.restore_data_types(table=table, data_frame=data_frame)
+
+    def load_tables(self):
+        tables = self.tables
+
+        for number, (table_type, table) in enumerate(tables.items()):
+            sql_table_name = "t{}_{}".format(number, table_type.__name__)
+            data_frame = table.data_frame.reset_index(drop=True)
+            data_frame[row_number_field_name] = np.arange(len(data_frame), dtype=np.int64)
+
+            self.sql_table_names[table_type] = sql_table_name
+            self.load_data_frame(sql_table_name=sql_table_name, data_frame=data_frame)
+
+            for field_name, field_object in table.get_fields().items():
+                if cubista.is_stored_field(field_object):
+                    self.evaluated_fields.add((table_type, field_name))
+
+    def is_aggregation_field(self, table, field_object):
+        if not isinstance(table, cubista.AggregatedTable):
+            return False
+
+        return field_object.is_required_for_aggregation() or isinstance(field_object, cubista.AutoIncrementPrimaryKeyField)
+
+    def get_field_dependencies(self, table, field_object):
+        if self.is_aggregation_field(table=table, field_object=field_object):
+            return [
+                dependency for dependency in table.get_aggregation_dependencies()
+                if dependency[0] != type(table)
+            ]
+
+        return [dependency for dependency in field_object.get_dependencies() if dependency != (type(table), field_object.name)]
+
+    def is_ready_to_be_evaluated_in_sql(self, table, field_object):
+        evaluated_fields = self.evaluated_fields
+        dependencies = self.get_field_dependencies(table=table, field_object=field_object)
+
+        return all([dependency in evaluated_fields for dependency in dependencies])
+
+    def evaluate_foreign_key_in_sql(self, table, field_object):
+        sql_table_name = self.sql_table_names[type(table)]
+        referenced_table = field_object.get_referenced_table()
+        referenced_sql_table_name = self.sql_table_names[type(referenced_table)]
+        join_condition = get_join_condition(
+            left_alias="t",
+            field_names=field_object.get_key_field_names(),
+            right_alias="r",
+            referenced_field_names=field_object.get_referenced_key_field_names()
+        )
+
+        if field_object.how == "inner":
+            self.replace_table(sql_table_name=sql_table_name, select_sql="SELECT t.* FROM {} t WHERE EXISTS (SELECT 1 FROM {} r WHERE {})".format(
+                quote_name(sql_table_name),
+                quote_name(referenced_sql_table_name),
+                join_condition
+            ))
+        elif field_object.on is None:
+            field_name = field_object.name
+            referenced_field_name = field_object.get_referenced_key_field_names()[0]
+            selected_columns = [
+                "COALESCE(r.{}, ?) AS {}".format(quote_name(referenced_field_name), quote_name(column_name))
+                if column_name == field_name else "t.{}".format(quote_name(column_name))
+                for column_name in self.get_sql_column_names(sql_table_name=sql_table_name)
+            ]
+
+            self.replace_table(
+                sql_table_name=sql_table_name,
+                select_sql="SELECT {} FROM {} t LEFT JOIN {} r ON {}".format(
+                    ", ".join(selected_columns),
+                    quote_name(sql_table_name),
+                    quote_name(referenced_sql_table_name),
+                    join_condition
+                ),
+                parameters=[field_object.default]
+            )
+
+    def evaluate_pull_by_foreign_key_in_sql(self, table, field_object):
+        sql_table_name = self.sql_table_names[type(table)]
+        referenced_table = field_object.get_referenced_table()
+        referenced_sql_table_name = self.sql_table_names[type(referenced_table)]
+        join_type = "JOIN" if field_object.how == "inner" else "LEFT JOIN"
+        join_condition = get_join_condition(
+            left_alias="t",
+            field_names=field_object.get_key_field_names(),
+            right_alias="r",
+            referenced_field_names=field_object.get_referenced_key_field_names()
+        )
+
+        self.replace_table(sql_table_name=sql_table_name, select_sql="SELECT t.*, r.{} AS {} FROM {} t {} {} r ON {}".format(
+            quote_name(field_object.source_field),
+            quote_name(field_object.name),
+            quote_name(sql_table_name),
+            join_type,
+            quote_name(referenced_sql_table_name),
+            join_condition
+        ))
+
+    def evaluate_calculated_field_in_sql(self, table, field_object):
+        sql_table_name = self.sql_table_names[type(table)]
+
+        self.replace_table(sql_table_name=sql_table_name, select_sql="SELECT t.*, ({}) AS {} FROM {} t".format(
+            field_object.sql_expression,
+            quote_name(field_object.name),
+            quote_name(sql_table_name)
+        ))
+
+    def evaluate_field_in_pandas(self, table, field_object):
+        sql_table_name = self.sql_table_names[type(table)]
+
+        table.data_frame = self.read_table(table=table)
+        field_object.evaluate()
+        self.load_data_frame(sql_table_name=sql_table_name, data_frame=table.data_frame)
+
+    def can_aggregate_in_sql(self, table):
+        fields = table.get_fields()
+
+        if table.get_buckets() or table.is_filtered():
+            return False
+
+        for field_name, field_object in fields.items():
+            if not isinstance(field_object, cubista.AggregatedField):
+                continue
+
+            aggregate_function = field_object.aggregate_function
+
+            if field_object.is_aggregated_by_segments() or not isinstance(aggregate_function, str):
+                return False
+
+            if aggregate_function not in sql_aggregate_functions:
+                return False
+
+        return True
+
+    def aggregate_in_sql(self, table):
+        fields = table.get_fields()
+        sql_table_name = self.sql_table_names[type(table)]
+        source_table = table.get_source_table()
+        source_sql_table_name = self.sql_table_names[type(source_table)]
+        group_by_field_names = table.Aggregation.group_by
+        source_field_name_to_destination_field_name_mapping = table.get_aggregated_source_field_name_to_destination_field_name_mapping()
+        primary_key_field_name = table.get_primary_key_field_name()
+
+        group_by_columns = ", ".join(["s.{}".format(quote_name(field_name)) for field_name in group_by_field_names])
+        selected_columns = [
+            "s.{} AS {}".format(quote_name(field_name), quote_name(source_field_name_to_destination_field_name_mapping.get(field_name, field_name)))
+            for field_name in group_by_field_names
+        ]
+
+        for field_name, field_object in fields.items():
+            if isinstance(field_object, cubista.AggregatedField):
+                source_column = "s.{}".format(quote_name(field_object.source))
+                aggregate_expression = sql_aggregate_functions[field_object.aggregate_function].format(source_column)
+                selected_columns.append("{} AS {}".format(aggregate_expression, quote_name(field_name)))
+
+        window_clause = "ORDER BY {}".format(group_by_columns) if group_by_field_names else ""
+        selected_columns.append("-(ROW_NUMBER() OVER ({})) - 1 AS {}".format(window_clause, quote_name(primary_key_field_name)))
+        selected_columns.append("ROW_NUMBER() OVER ({}) - 1 AS {}".format(window_clause, quote_name(row_number_field_name)))
+
+        select_sql = "SELECT {} FROM {} s".format(", ".join(selected_columns), quote_name(source_sql_table_name))
+
+        if group_by_field_names:
+            not_null_condition = " AND ".join(["s.{} IS NOT NULL".format(quote_name(field_name)) for field_name in group_by_field_names])
+            select_sql = "{} WHERE {} GROUP BY {}".format(select_sql, not_null_condition, group_by_columns)
+
+        self.execute("DROP TABLE {}".format(quote_name(sql_table_name)))
+        self.execute("CREATE TABLE {} AS {}".format(quote_name(sql_table_name), select_sql))
+
+    def aggregate_in_pandas(self, table):
+        sql_table_name = self.sql_table_names[type(table)]
+        source_table = table.get_source_table()
+
+        source_table.data_frame = self.read_table(table=source_table)
+        table.aggregate()
+        table.data_frame[row_number_field_name] = np.arange(len(table.data_frame), dtype=np.int64)
+        self.load_data_frame(sql_table_name=sql_table_name, data_frame=table.data_frame)
+
+    def evaluate_field_in_sql(self, table, field_object):
+        if self.is_aggregation_field(table=table, field_object=field_object):
+            if self.can_aggregate_in_sql(table=table):
+                self.aggregate_in_sql(table=table)
+            else:
+                self.aggregate_in_pandas(table=table)
+
+            for field_name, aggregation_field_object in table.get_fields().items():
+                if self.is_aggregation_field(table=table, field_object=aggregation_field_object):
+                    self.evaluated_fields.add((type(table), field_name))
+        elif isinstance(field_object, cubista.ForeignKey):
+            self.evaluate_foreign_key_in_sql(table=table, field_object=field_object)
+        elif isinstance(field_object, cubista.PullByForeignKey):
+            self.evaluate_pull_by_foreign_key_in_sql(table=table, field_object=field_object)
+        elif isinstance(field_object, cubista.CalculatedField) and field_object.sql_expression is not None:
+            self.evaluate_calculated_field_in_sql(table=table, field_object=field_object)
+        else:
+            self.evaluate_field_in_pandas(table=table, field_object=field_object)
+
+        self.evaluated_fields.add((type(table), field_object.name))
+
+    def get_fields_to_evaluate_in_sql(self):
+        tables = self.tables
+        evaluated_fields = self.evaluated_fields
+
+        return [
+            (table, field_object)
+            for table_type, table in tables.items()
+            for field_name, field_object in table.get_fields().items()
+            if (table_type, field_name) not in evaluated_fields
+        ]
+
+    def get_original_data_type(self, table, column_name):
+        original_data_frame = self.original_data_frames.get(type(table), table.data_frame)
+
+        if column_name not in original_data_frame.columns:
+            return None
+
+        return original_data_frame[column_name].dtype
+
+    def get_originating_field(self, table, field_object):
+        if isinstance(field_object, cubista.PullByForeignKey):
+            referenced_table = field_object.get_referenced_table()
+            source_field = referenced_table.get_fields()[field_object.source_field]
+
+            return self.get_originating_field(table=referenced_table, field_object=source_field)
+
+        if isinstance(field_object, cubista.GroupField):
+            source_table = table.get_source_table()
+            source_field = source_table.get_fields()[field_object.source]
+
+            return self.get_originating_field(table=source_table, field_object=source_field)
+
+        return table, field_object
+
+    def restore_data_types(self, table, data_frame):
+        fields = table.get_fields()
+
+        for column_name in data_frame.columns:
+            field_object = fields.get(column_name)
+            originating_table = table
+            originating_column_name = column_name
+
+            if field_object is not None:
+                originating_table, field_object = self.get_originating_field(table=table, field_object=field_object)
+                originating_column_name = field_object.name
+
+            original_data_type = self.get_original_data_type(table=originating_table, column_name=originating_column_name)
+
+            if original_data_type is not None and original_data_type.kind == "M":
+                data_frame[column_name] = pd.to_datetime(data_frame[column_name]).astype(original_data_type)
+            elif isinstance(field_object, cubista.DateField):
+                data_frame[column_name] = pd.to_datetime(data_frame[column_name]).dt.date
+            elif isinstance(field_object, cubista.BoolField) or (original_data_type is not None and original_data_type.kind == "b"):
+                data_frame[column_name] = data_frame[column_name].astype("boolean" if data_frame[column_name].isna().any() else bool)
+
+        return data_frame
+
+    def read_tables(self):
+        tables = self.tables
+
+        for _, table in tables.items():
+            table.data_frame = self.read_table(table=table).drop(columns=[row_number_field_name])
+            table.mark_references_checked()
+
+    def evaluate_tables_in_sql(self):
+        original_data_frames = {table_type: table.data_frame for table_type, table in self.tables.items()}
+        self.original_data_frames = original_data_frames
+
+        self.load_tables()
+
+        fields_to_evaluate = self.get_fields_to_evaluate_in_sql()
+
+        while fields_to_evaluate:
+            for table, field_object in fields_to_evaluate:
+                if (type(table), field_object.name) in self.evaluated_fields:
+                    continue
+
+                if self.is_ready_to_be_evaluated_in_sql(table=table, field_object=field_object):
+                    self.evaluate_field_in_sql(table=table, field_object=field_object)
+
+            not_evaluated_fields = self.get_fields_to_evaluate_in_sql()
+
+            if len(fields_to_evaluate) == len(not_evaluated_fields):
+                raise cubista.CannotEvaluateFields("{}".format(", ".join([str(field_object) for _, field_object in not_evaluated_fields])))
+
+            fields_to_evaluate = not_evaluated_fields
+
+        for table_type, table in self.tables.items():
+            table.data_frame = original_data_frames[table_type]
+
+        self.read_tables()
@@ -1,20 +1,42 @@
+import numpy as np
 import pandas as pd
 
 import cubista
-from .exceptions import FieldDoesNotExist
 
 class Table:
     class Fields:
         pass
 
-    def __init__(self, data_frame):
+    def __init__(self, data_frame, validate=True, validation_workers=1):
         self.data_source = None
         self.data_frame = data_frame
+        self.indexes = {}
+        self.statistics = {}
         self.set_field_names_and_table()
+        self.reset_references()
 
-        self.check_all_not_evaluated_fields_exist_in_data_frame_and_raise_exception_otherwise()
-        self.check_all_not_evaluated_fields_has_correct_data_type_in_data_frame_and_raise_exception_otherwise()
-        self.check_only_one_primary_key_specified_and_raise_exception_otherwise()
+        validation_report = self.validate(validate=validate, workers=validation_workers)
+        validation_report.raise_first_error()
+
+    @classmethod
+    def from_evaluated_data_frame(cls, data_frame):
+        table = cls.__new__(cls)
+        table.data_source = None
+        table.data_frame = data_frame
+        table.indexes = {}
+        table.statistics = {}
+        table.validation_report = cubista.ValidationReport()
+        table.set_field_names_and_table()
+        table.mark_references_checked()
+
+        return table
+
+    def validate(self, validate=True, workers=1):
+        table_validator = cubista.get_table_validator(table_type=type(self))
+        validation_report = table_validator.validate(data_frame=self.data_frame, validate=validate, workers=workers)
+        self.validation_report = validation_report if validate else None
+
+        return validation_report
 
     def get_fields(self):
         return { key: value for key, value in self.Fields.__dict__.items() if not key.startswith("__")}
@@ -25,41 +47,51 @@ class Table:
             field_object.name = field_name
             field_object.table = self
 
-    def check_all_not_evaluated_fields_exist_in_data_frame_and_raise_exception_otherwise(self):
-        fields = self.get_fields()
-        data_frame = self.data_frame
-        data_frame_columns = data_frame.columns
+    def get_backend(self):
+        data_source = self.data_source
 
-        for field_name, field_object in fields.items():
-            if field_object.is_evaluated():
-                if field_name not in data_frame_columns:
-                    raise FieldDoesNotExist("Field {} not found in {}".format(field_name, ", ".join(data_frame_columns)))
+        if data_source is None:
+            return cubista.get_backend(backend="pandas")
+
+        return data_source.backend
+
+    def is_field_required(self, field_object):
+        data_source = self.data_source
 
-    def check_all_not_evaluated_fields_has_correct_data_type_in_data_frame_and_raise_exception_otherwise(self):
+        return data_source is None or data_source.is_field_required(field_object=field_object)
+
+    def get_data_frame_protected_from_evaluation(self):
         fields = self.get_fields()
-        data_frame = self.data_frame
+        data_frame = self.data_frame.copy(deep=False)
 
         for field_name, field_object in fields.items():
-            if field_object.is_evaluated():
-                data = data_frame[field_name]
-                field_object.check_field_has_correct_data_type_in_data_frame_column_raise_exception_otherwise(data=data)
+            if isinstance(field_object, cubista.ForeignKey) and field_name in data_frame.columns:
+                data_frame[field_name] = data_frame[field_name].copy()
 
-    def check_only_one_primary_key_specified_and_raise_exception_otherwise(self):
-        fields = self.get_fields()
+        return data_frame
 
-        primary_keys_count = sum([field_object.primary_key for _, field_object in fields.items()])
+    def check_references_raise_exception_otherwise(self):
+        fields = self.get_fields()
 
-        if not primary_keys_count:
-            raise cubista.NoPrimaryKeySpecified("No primary key specified in {}.".format(type(self)))
+        for field_name, field_object in fields.items():
+            if self.is_field_required(field_object=field_object):
+                field_object.check_references_raise_exception_otherwise()
 
-        if primary_keys_count > 1:
-            raise cubista.MoreThanOnePrimaryKeySpecified("Only one primary key is allowed for {} but {} found.".format(type(self), primary_keys_count))
+        self.invalidate_indexes()
 
-    def check_references_raise_exception_otherwise(self):
+    def set_references_checked(self, references_checked):
         fields = self.get_fields()
 
         for field_name, field_object in fields.items():
-            field_object.check_references_raise_exception_otherwise()
+            if isinstance(field_object, cubista.ForeignKey):
+                field_object.references_checked = references_checked
+                field_object.referenced_positions_cache = None
+
+    def reset_references(self):
+        self.set_references_checked(references_checked=False)
+
+    def mark_references_checked(self):
+        self.set_references_checked(references_checked=True)
 
     def get_primary_key_field_name(self):
         fields = self.get_fields()
@@ -68,13 +100,179 @@ class Table:
             if field_object.primary_key:
                 return field_name
 
+    def create_index(self, field_name):
+        field_object = self.get_fields()[field_name]
+        values = self.data_frame[field_name]
+
+        if field_object.primary_key:
+            return cubista.UniqueHashIndex(values=values)
+
+        if isinstance(field_object, cubista.ForeignKey):
+            return cubista.HashIndex(values=values)
+
+        if getattr(field_object, "index", False):
+            return cubista.SortedIndex(values=values)
+
+        raise cubista.FieldIsNotIndexed("Field {} of {} has no index.".format(field_name, type(self)))
+
+    def get_index(self, field_name):
+        indexes = self.indexes
+        data_frame = self.data_frame
+
+        indexed_data_frame, index = indexes.get(field_name, (None, None))
+
+        if indexed_data_frame is not data_frame or len(indexed_data_frame) != len(data_frame):
+            index = self.create_index(field_name=field_name)
+            indexes[field_name] = (data_frame, index)
+
+        return index
+
+    def invalidate_indexes(self):
+        self.indexes = {}
+        self.statistics = {}
+
+    def get_column_statistics(self, field_name):
+        statistics = self.statistics
+        data_frame = self.data_frame
+
+        statistics_data_frame, column_statistics = statistics.get(field_name, (None, None))
+
+        if statistics_data_frame is not data_frame or column_statistics.rows_count != len(data_frame):
+            column_statistics = cubista.get_column_statistics(data=data_frame[field_name])
+            statistics[field_name] = (data_frame, column_statistics)
+
+        return column_statistics
+
+    def get_statistics(self):
+        fields = self.get_fields()
+        data_frame = self.data_frame
+
+        return {
+            field_name: self.get_column_statistics(field_name=field_name)
+            for field_name in fields.keys() if field_name in data_frame.columns
+        }
+
+    def export(self, path, format="csv", chunk_rows=None, workers=1, partition_by=None):
+        return cubista.export_table(
+            table=self,
+            path=path,
+            format=format,
+            chunk_rows=chunk_rows or cubista.default_chunk_rows,
+            workers=workers,
+            partition_by=partition_by
+        )
+
+    def is_sorted_by(self, field_names):
+        data_frame = self.data_frame
+
+        if not field_names or not all([field_name in data_frame.columns for field_name in field_names]):
+            return False
+
+        if len(field_names) == 1:
+            data = data_frame[field_names[0]]
+
+            return not data.isna().any() and cubista.is_monotonic_increasing(data=data)
+
+        column_statistics = self.get_column_statistics(field_name=field_names[0])
+
+        return column_statistics.is_monotonic_increasing and column_statistics.is_unique()
+
+    def get_row_position_by_primary_key(self, value):
+        primary_key_field_name = self.get_primary_key_field_name()
+        index = self.get_index(field_name=primary_key_field_name)
+
+        return index.get_position(key=value)
+
+    def get_row_positions_by_primary_keys(self, values):
+        primary_key_field_name = self.get_primary_key_field_name()
+        index = self.get_index(field_name=primary_key_field_name)
+
+        return index.get_positions(keys=values)
+
+    def get_row_positions_by_foreign_key(self, field_name, value):
+        index = self.get_index(field_name=field_name)
+
+        return index.get_positions(key=value)
+
+    def get_row_positions_in_range(self, field_name, low=None, high=None, include_high=True):
+        index = self.get_index(field_name=field_name)
+
+        return index.get_positions_in_range(low=low, high=high, include_high=include_high)
+
+    def get_rows(self, positions):
+        return self.data_frame.iloc[positions]
+
+    def is_derived_field(self, field_object):
+        return not cubista.is_stored_field(field_object) and not isinstance(field_object, cubista.ForeignKey)
+
+    def get_derived_field_names(self):
+        fields = self.get_fields()
+
+        return [field_name for field_name, field_object in fields.items() if self.is_derived_field(field_object=field_object)]
+
+    def get_rows_by_primary_keys(self, values):
+        positions = self.get_row_positions_by_primary_keys(values=values)
+
+        return self.data_frame.take(positions[positions >= 0])
+
+    def has_window_fields(self):
+        fields = self.get_fields()
+
+        return any([isinstance(field_object, cubista.WindowField) for _, field_object in fields.items()])
+
+    def evaluate_rows(self, positions):
+        data_source = self.data_source
+        data_frame = self.data_frame
+        fields = self.get_fields()
+        derived_field_names = [field_name for field_name in self.get_derived_field_names() if field_name in data_frame.columns]
+
+        if self.has_window_fields():
+            positions = np.arange(len(data_frame))
+
+        rows = data_frame.take(positions).drop(columns=derived_field_names)
+        rows.index = positions
+        self.data_frame = rows
+        self.reset_references()
+        freed_fields = data_source.freed_fields
+        data_source.freed_fields = set([freed_field for freed_field in freed_fields if freed_field[0] != type(self)])
+
+        try:
+            self.check_references_raise_exception_otherwise()
+            data_source.evaluate_table_objects(table_objects=[self])
+            evaluated_rows = self.data_frame
+        finally:
+            self.data_frame = data_frame
+            data_source.freed_fields = freed_fields
+            self.mark_references_checked()
+
+        evaluated_positions = evaluated_rows.index.to_numpy()
+        evaluated_field_names = [
+            field_name for field_name in evaluated_rows.columns
+            if field_name in fields and (self.is_derived_field(field_object=fields[field_name]) or isinstance(fields[field_name], cubista.ForeignKey))
+        ]
+
+        for field_name in evaluated_field_names:
+            cubista.set_rows(
+                data_frame=data_frame,
+                positions=evaluated_positions,
+                column_name=field_name,
+                values=evaluated_rows[field_name]
+            )
+
+        dropped_positions = np.setdiff1d(positions, evaluated_positions)
+
+        if len(dropped_positions):
+            self.data_frame = cubista.remove_rows(data_frame=data_frame, positions=dropped_positions)
+
+        self.invalidate_indexes()
+
     def get_fields_to_evaluate(self):
         fields = self.get_fields()
 
         result = []
 
         for _, field_object in fields.items():
-            if not field_object.is_evaluated():
+            if not field_object.is_evaluated() and self.is_field_required(field_object=field_object):
                 result.append(field_object)
 
         return result
@@ -86,15 +284,42 @@ class Table:
             if field_to_evaluate.is_ready_to_be_evaluated():
                 field_to_evaluate.evaluate()
 
+def check_top_n_by_raise_exception_otherwise(top_n, top_n_by, field_names):
+    if top_n and top_n_by not in field_names:
+        raise cubista.UnknownTopNField("Top n field must be one of {}, but {} found.".format(field_names, top_n_by))
+
 class AggregatedTable(Table):
     class Aggregation:
         source = None
         sort_by: [str] = []
         group_by: [str] = []
+        spill_partitions: int = 0
+        spill_workers: int = 1
+        spill_directory: str = None
+        spill_chunk_rows = cubista.default_spill_chunk_rows
+        where: [tuple] = []
+        having: [tuple] = []
+        top_n: int = 0
+        top_n_by: str = None
+
+    partial_aggregate_merge_functions = {
+        "sum": "sum",
+        "min": "min",
+        "max": "max",
+        "count": "sum",
+        "size": "sum",
+        "any": "any",
+        "all": "all"
+    }
 
     def __init__(self):
         data_frame = pd.DataFrame()
         super(AggregatedTable, self).__init__(data_frame=data_frame)
+        check_top_n_by_raise_exception_otherwise(
+            top_n=self.get_top_n(),
+            top_n_by=getattr(self.Aggregation, "top_n_by", None),
+            field_names=list(self.get_fields().keys())
+        )
 
     def are_fields_evaluated_in_source_table(self, field_names):
         source_table_type = self.Aggregation.source()
@@ -130,6 +355,11 @@ class AggregatedTable(Table):
         if not self.are_fields_evaluated_in_source_table(field_names=group_by_field_names):
             return False
 
+        where_field_names = [predicate.field_name for predicate in self.get_where_predicates()]
+
+        if not self.are_fields_evaluated_in_source_table(field_names=where_field_names):
+            return False
+
         if not self.are_fields_required_for_aggregation_evaluated_in_source_table():
             return False
 
@@ -141,7 +371,7 @@ class AggregatedTable(Table):
         result = {}
 
         for field_name, field_object in fields.items():
-            if isinstance(field_object, cubista.AggregatedField):
+            if isinstance(field_object, cubista.AggregatedField) and not field_object.is_aggregated_by_segments():
                 source_field = field_object.source
                 aggregate_function = field_object.aggregate_function
                 result[source_field] = aggregate_function
@@ -154,43 +384,391 @@ class AggregatedTable(Table):
         result = {}
 
         for field_name, field_object in fields.items():
+            if isinstance(field_object, cubista.AggregatedField) and field_object.is_aggregated_by_segments():
+                continue
+
             if isinstance(field_object, cubista.AggregatedField) or isinstance(field_object, cubista.GroupField):
                 source_field = field_object.source
                 result[source_field] = field_name
 
         return result
 
-    def aggregate(self):
+    def get_aggregated_by_segments_fields(self):
+        fields = self.get_fields()
+
+        result = {}
+
+        for field_name, field_object in fields.items():
+            if isinstance(field_object, cubista.AggregatedField) and field_object.is_aggregated_by_segments():
+                result[field_name] = field_object
+
+        return result
+
+    def get_buckets(self):
+        fields = self.get_fields()
+
+        result = {}
+
+        for field_name, field_object in fields.items():
+            if isinstance(field_object, cubista.GroupField) and field_object.bucket is not None:
+                result[field_object.source] = field_object.bucket
+
+        return result
+
+    def get_where_predicates(self):
+        where = getattr(self.Aggregation, "where", [])
+
+        return [cubista.Predicate(field_name=field_name, operator_name=operator_name, value=value) for field_name, operator_name, value in where]
+
+    def get_having_predicates(self):
+        having = getattr(self.Aggregation, "having", [])
+
+        return [cubista.Predicate(field_name=field_name, operator_name=operator_name, value=value) for field_name, operator_name, value in having]
+
+    def get_top_n(self):
+        return getattr(self.Aggregation, "top_n", 0)
+
+    def is_filtered(self):
+        return bool(self.get_where_predicates() or self.get_having_predicates() or self.get_top_n())
+
+    def filter_source_data_frame(self, source_data_frame):
+        where_predicates = self.get_where_predicates()
+
+        if not where_predicates:
+            return source_data_frame
+
+        return cubista.filter_data_frame(data_frame=source_data_frame, predicates=where_predicates)
+
+    def filter_groups(self, data_frame):
+        having_predicates = self.get_having_predicates()
+
+        if not having_predicates:
+            return data_frame
+
+        return cubista.filter_data_frame(data_frame=data_frame, predicates=having_predicates).reset_index(drop=True)
+
+    def select_top_groups(self, data_frame):
+        top_n = self.get_top_n()
+
+        if not top_n or len(data_frame) <= top_n:
+            return data_frame
+
+        top_n_by = self.Aggregation.top_n_by
+        top_positions = data_frame[top_n_by].reset_index(drop=True).nlargest(top_n).index.to_numpy()
+
+        return data_frame.take(np.sort(top_positions)).reset_index(drop=True)
+
+    def select_groups(self, data_frame):
+        data_frame = self.filter_groups(data_frame=data_frame)
+
+        return self.select_top_groups(data_frame=data_frame)
+
+    def get_source_table(self):
         source_table_type = self.Aggregation.source()
         data_source = self.data_source
-        source_table = data_source.tables[source_table_type]
-        aggregated_source_field_name_to_destination_field_name_mapping = self.get_aggregated_source_field_name_to_destination_field_name_mapping()
-        reduced_field_names = aggregated_source_field_name_to_destination_field_name_mapping.keys()
+
+        return data_source.tables[source_table_type]
+
+    def get_group_index(self):
+        source_table = self.get_source_table()
+        data_source = self.data_source
         sort_by_field_names = self.Aggregation.sort_by
         group_by_field_names = self.Aggregation.group_by
+        buckets = self.get_buckets()
+
+        return data_source.get_group_index(
+            table=source_table,
+            sort_by_field_names=sort_by_field_names,
+            group_by_field_names=group_by_field_names,
+            buckets=buckets
+        )
+
+    def aggregate_by_segments(self, source_data_frame, new_data_frame, group_index):
+        aggregated_by_segments_fields = self.get_aggregated_by_segments_fields()
+        segment_positions = group_index.get_segment_positions()
+        offsets = group_index.offsets
+
+        for field_name, field_object in aggregated_by_segments_fields.items():
+            values = source_data_frame[field_object.source].to_numpy()[segment_positions]
+            new_data_frame[field_name] = field_object.aggregate_segments(values, offsets)
+
+    def aggregate_data_frame(self, source_data_frame, group_index):
+        aggregated_source_field_name_to_destination_field_name_mapping = self.get_aggregated_source_field_name_to_destination_field_name_mapping()
         aggregated_field_name_to_aggregate_function_mapping = self.get_aggregated_field_name_to_aggregate_function_mapping()
-        new_data_frame = source_table.data_frame
-        new_data_frame = new_data_frame.sort_values(by=sort_by_field_names)
-        new_data_frame = new_data_frame[reduced_field_names]
-        new_data_frame = new_data_frame.groupby(group_by_field_names)
-        new_data_frame = new_data_frame.agg(aggregated_field_name_to_aggregate_function_mapping)
-        new_data_frame = new_data_frame.reset_index()
+        group_by_field_names = self.Aggregation.group_by
+        segment_positions = group_index.get_segment_positions()
+        first_positions = group_index.get_first_positions()
+        segment_codes = group_index.codes[group_index.segment_order]
+
+        buckets = self.get_buckets()
+
+        new_data_frame = source_data_frame[group_by_field_names].take(first_positions).reset_index(drop=True)
+        new_data_frame = cubista.get_bucketed_data_frame(data_frame=new_data_frame, buckets=buckets)
+
+        if aggregated_field_name_to_aggregate_function_mapping:
+            backend = self.get_backend()
+            aggregated_data_frame = source_data_frame[list(aggregated_field_name_to_aggregate_function_mapping.keys())]
+            aggregated_data_frame = aggregated_data_frame.take(segment_positions)
+            aggregated_data_frame = backend.aggregate_segments(
+                data_frame=aggregated_data_frame,
+                segment_codes=segment_codes,
+                aggregate_functions=aggregated_field_name_to_aggregate_function_mapping
+            )
+            new_data_frame = pd.concat([new_data_frame, aggregated_data_frame], axis=1)
 
         new_data_frame = new_data_frame.rename(columns=aggregated_source_field_name_to_destination_field_name_mapping)
 
+        self.aggregate_by_segments(source_data_frame=source_data_frame, new_data_frame=new_data_frame, group_index=group_index)
+
+        return new_data_frame
+
+    def assign_primary_key(self, data_frame):
         primary_key_field_name = self.get_primary_key_field_name()
 
-        new_data_frame[primary_key_field_name] = new_data_frame.apply(
-            lambda x: -x.name - 2,
-            axis=1
+        data_frame[primary_key_field_name] = -np.arange(len(data_frame), dtype=np.int64) - 2
+
+    def aggregate_partition(self, source_data_frame):
+        sort_by_field_names = self.Aggregation.sort_by
+        group_by_field_names = self.Aggregation.group_by
+        buckets = self.get_buckets()
+        backend = self.get_backend()
+        group_index = backend.build_group_index(
+            data_frame=source_data_frame,
+            sort_by_field_names=sort_by_field_names,
+            group_by_field_names=group_by_field_names,
+            buckets=buckets
+        )
+
+        return self.aggregate_data_frame(source_data_frame=source_data_frame, group_index=group_index)
+
+    def get_spilled_field_names(self):
+        fields = self.get_fields()
+        sort_by_field_names = self.Aggregation.sort_by
+        group_by_field_names = self.Aggregation.group_by
+
+        result = list(group_by_field_names)
+
+        for field_name in sort_by_field_names:
+            if field_name not in result:
+                result.append(field_name)
+
+        for field_name, field_object in fields.items():
+            if field_object.is_required_for_aggregation() and field_object.source not in result:
+                result.append(field_object.source)
+
+        return result
+
+    def get_spilled_chunk(self, source_data_frame):
+        spilled_field_names = self.get_spilled_field_names()
+        buckets = self.get_buckets()
+        source_data_frame = self.filter_source_data_frame(source_data_frame=source_data_frame)
+
+        return cubista.get_bucketed_data_frame(data_frame=source_data_frame[spilled_field_names], buckets=buckets)
+
+    def iterate_spilled_chunks(self, source_data_frame, chunk_rows):
+        for offset in range(0, len(source_data_frame), chunk_rows):
+            yield self.get_spilled_chunk(source_data_frame=source_data_frame.iloc[offset:offset + chunk_rows])
+
+    def aggregate_with_spilling(self, source_data_frame):
+        group_by_field_names = self.Aggregation.group_by
+        partitions_count = getattr(self.Aggregation, "spill_partitions", 0)
+        workers = getattr(self.Aggregation, "spill_workers", 1)
+        directory = getattr(self.Aggregation, "spill_directory", None)
+        chunk_rows = getattr(self.Aggregation, "spill_chunk_rows", cubista.default_spill_chunk_rows)
+
+        partition_data_frames = cubista.aggregate_spilled_partitions(
+            data_frames=self.iterate_spilled_chunks(source_data_frame=source_data_frame, chunk_rows=chunk_rows),
+            field_names=group_by_field_names,
+            partitions_count=partitions_count,
+            aggregate_partition=self.aggregate_partition,
+            workers=workers,
+            directory=directory
         )
 
+        if not partition_data_frames:
+            return self.aggregate_partition(source_data_frame=self.get_spilled_chunk(source_data_frame=source_data_frame.iloc[:0]))
+
+        grouped_field_names = self.get_grouped_field_names()
+
+        new_data_frame = pd.concat(partition_data_frames, ignore_index=True)
+        new_data_frame = new_data_frame.sort_values(by=grouped_field_names, kind="stable")
+
+        return new_data_frame.reset_index(drop=True)
+
+    def get_grouped_field_names(self):
+        group_by_field_names = self.Aggregation.group_by
+        aggregated_source_field_name_to_destination_field_name_mapping = self.get_aggregated_source_field_name_to_destination_field_name_mapping()
+
+        return [
+            aggregated_source_field_name_to_destination_field_name_mapping.get(field_name, field_name)
+            for field_name in group_by_field_names
+        ]
+
+    def get_partial_aggregate_merge_mapping(self):
+        fields = self.get_fields()
+        partial_aggregate_merge_functions = self.partial_aggregate_merge_functions
+
+        result = {}
+
+        for field_name, field_object in fields.items():
+            if not isinstance(field_object, cubista.AggregatedField):
+                continue
+
+            aggregate_function = field_object.aggregate_function
+
+            if field_object.is_aggregated_by_segments() or not isinstance(aggregate_function, str):
+                return None
+
+            if aggregate_function not in partial_aggregate_merge_functions:
+                return None
+
+            result[field_name] = partial_aggregate_merge_functions[aggregate_function]
+
+        return result
+
+    def can_merge_partial_aggregates(self, groups_are_disjoint):
+        return groups_are_disjoint or self.get_partial_aggregate_merge_mapping() is not None
+
+    def merge_partial_aggregates(self, partial_data_frames, groups_are_disjoint):
+        grouped_field_names = self.get_grouped_field_names()
+        columns = partial_data_frames[0].columns
+
+        new_data_frame = pd.concat(partial_data_frames, ignore_index=True)
+
+        if not groups_are_disjoint:
+            partial_aggregate_merge_mapping = self.get_partial_aggregate_merge_mapping()
+            new_data_frame = new_data_frame.groupby(grouped_field_names).agg(partial_aggregate_merge_mapping)
+            new_data_frame = new_data_frame.reset_index()[columns]
+
+        new_data_frame = new_data_frame.sort_values(by=grouped_field_names, kind="stable").reset_index(drop=True)
+        new_data_frame = self.select_groups(data_frame=new_data_frame)
+        self.assign_primary_key(data_frame=new_data_frame)
+
         self.data_frame = new_data_frame
 
-    def evaluate(self):
-        is_ready_to_be_aggregated = self.is_ready_to_be_aggregated()
+    def aggregate(self):
+        source_table = self.get_source_table()
+
+        if getattr(self.Aggregation, "spill_partitions", 0):
+            new_data_frame = self.aggregate_with_spilling(source_data_frame=source_table.data_frame)
+        elif self.get_where_predicates():
+            new_data_frame = self.aggregate_partition(source_data_frame=self.filter_source_data_frame(source_data_frame=source_table.data_frame))
+        else:
+            group_index = self.get_group_index()
+            new_data_frame = self.aggregate_data_frame(source_data_frame=source_table.data_frame, group_index=group_index)
+
+        new_data_frame = self.select_groups(data_frame=new_data_frame)
+        self.assign_primary_key(data_frame=new_data_frame)
+
+        self.data_frame = new_data_frame
+
+    def is_derived_field(self, field_object):
+        if field_object.is_required_for_aggregation() or field_object.primary_key:
+            return False
+
+        return super(AggregatedTable, self).is_derived_field(field_object=field_object)
+
+    def reaggregate_groups(self, old_source_rows, new_source_rows):
+        data_source = self.data_source
+        data_frame = self.data_frame
+        source_data_frame = self.get_source_table().data_frame
+        group_by_field_names = self.Aggregation.group_by
+        grouped_field_names = self.get_grouped_field_names()
+        primary_key_field_name = self.get_primary_key_field_name()
+        buckets = self.get_buckets()
+
+        if self.get_top_n():
+            return self.reaggregate_all_groups()
+
+        changed_keys = pd.concat([old_source_rows[group_by_field_names], new_source_rows[group_by_field_names]], ignore_index=True)
+        changed_keys = cubista.get_bucketed_data_frame(data_frame=changed_keys, buckets=buckets)
+        source_keys = source_data_frame[group_by_field_names].reset_index(drop=True)
+        source_keys = cubista.get_bucketed_data_frame(data_frame=source_keys, buckets=buckets)
+
+        source_positions = cubista.get_positions_by_keys(
+            data_frame=source_keys,
+            field_names=group_by_field_names,
+            keys_data_frame=changed_keys,
+            key_field_names=group_by_field_names
+        )
+        new_groups = self.aggregate_partition(source_data_frame=self.filter_source_data_frame(source_data_frame=source_data_frame.take(source_positions)))
+        new_groups = self.filter_groups(data_frame=new_groups)
+
+        changed_group_keys = changed_keys.rename(columns=dict(zip(group_by_field_names, grouped_field_names)))
+        old_group_positions = cubista.get_positions_by_keys(
+            data_frame=data_frame,
+            field_names=grouped_field_names,
+            keys_data_frame=changed_group_keys,
+            key_field_names=grouped_field_names
+        )
+        old_rows = data_frame.take(old_group_positions).copy()
+
+        old_group_primary_keys = old_rows[primary_key_field_name].to_numpy()
+        matched_positions = cubista.get_referenced_positions(
+            data_frame=new_groups,
+            field_names=grouped_field_names,
+            referenced_data_frame=old_rows,
+            referenced_field_names=grouped_field_names
+        )
+        is_new_group = matched_positions < 0
+        first_new_primary_key = min(data_frame[primary_key_field_name].min() if len(data_frame) else -1, -1) - 1
+
+        primary_keys = np.zeros(len(new_groups), dtype=np.int64)
+        primary_keys[~is_new_group] = old_group_primary_keys[matched_positions[~is_new_group]]
+        primary_keys[is_new_group] = first_new_primary_key - np.arange(is_new_group.sum(), dtype=np.int64)
+        new_groups[primary_key_field_name] = primary_keys
 
-        if is_ready_to_be_aggregated:
+        new_data_frame = pd.concat([cubista.remove_rows(data_frame=data_frame, positions=old_group_positions), new_groups], ignore_index=True)
+        self.data_frame = new_data_frame.sort_values(by=grouped_field_names, kind="stable").reset_index(drop=True)
+        data_source.invalidate_caches(table_type=type(self))
+
+        self.evaluate_rows(positions=self.get_row_positions_by_primary_keys(values=primary_keys))
+
+        return old_rows, self.get_rows_by_primary_keys(values=primary_keys)
+
+    def reaggregate_all_groups(self):
+        data_source = self.data_source
+        old_rows = self.data_frame.copy()
+
+        self.aggregate()
+        data_source.invalidate_caches(table_type=type(self))
+        self.evaluate_rows(positions=np.arange(len(self.data_frame)))
+
+        return old_rows, self.data_frame.copy()
+
+    def is_aggregated(self):
+        primary_key_field_name = self.get_primary_key_field_name()
+        data_frame = self.data_frame
+
+        return primary_key_field_name in data_frame.columns
+
+    def get_aggregation_dependencies(self):
+        fields = self.get_fields()
+        source_table_type = self.Aggregation.source()
+        sort_by_field_names = self.Aggregation.sort_by
+        group_by_field_names = self.Aggregation.group_by
+
+        where_field_names = [predicate.field_name for predicate in self.get_where_predicates()]
+
+        result = [(source_table_type, field_name) for field_name in sort_by_field_names + group_by_field_names + where_field_names]
+
+        for field_name, field_object in fields.items():
+            if field_object.is_required_for_aggregation():
+                result.append((type(self), field_name))
+                result.append((source_table_type, field_object.source))
+            elif field_object.primary_key:
+                result.append((type(self), field_name))
+
+        return result
+
+    def is_required_to_be_aggregated(self):
+        fields = self.get_fields()
+        primary_key_field_name = self.get_primary_key_field_name()
+
+        return self.is_field_required(field_object=fields[primary_key_field_name])
+
+    def evaluate(self):
+        if not self.is_aggregated() and self.is_required_to_be_aggregated() and self.is_ready_to_be_aggregated():
             self.aggregate()
 
         super(AggregatedTable, self).evaluate()
\ No newline at end of file
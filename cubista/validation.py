@@ -0,0 +1,214 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import cubista
+from .validation_report import ValidationIssue, ValidationReport, default_sample_rows_count
+
+default_validation_sample_size = 10000
+
+class ValidationPolicy:
+    checks_values = True
+
+    def get_sample_positions(self, rows_count):
+        return None
+
+class FullValidation(ValidationPolicy):
+    pass
+
+class DtypeOnlyValidation(ValidationPolicy):
+    checks_values = False
+
+class SampleValidation(ValidationPolicy):
+    def __init__(self, rows=None, fraction=None, seed=0):
+        if rows is None and fraction is None:
+            rows = default_validation_sample_size
+
+        self.rows = rows
+        self.fraction = fraction
+        self.seed = seed
+
+    def get_sample_size(self, rows_count):
+        if self.rows is not None:
+            return self.rows
+
+        return int(math.ceil(rows_count * self.fraction))
+
+    def get_sample_positions(self, rows_count):
+        sample_size = self.get_sample_size(rows_count=rows_count)
+
+        if rows_count <= sample_size:
+            return None
+
+        random_generator = np.random.default_rng(self.seed)
+
+        return np.sort(random_generator.choice(rows_count, size=sample_size, replace=False))
+
+validation_policies = {
+    "full": FullValidation,
+    "dtype-only": DtypeOnlyValidation,
+    "sample": SampleValidation
+}
+
+def get_validation_policy(validate):
+    if isinstance(validate, ValidationPolicy):
+        return validate
+
+    if validate is True:
+        return FullValidation()
+
+    if validate is False or validate is None:
+        return None
+
+    if validate not in validation_policies:
+        raise cubista.UnknownValidationMode("Validation mode must be one of {}, but {} found.".format([True, False] + list(validation_policies.keys()), validate))
+
+    return validation_policies[validate]()
+
+class TableValidator:
+    def __init__(self, table_type):
+        fields = {key: value for key, value in table_type.Fields.__dict__.items() if not key.startswith("__")}
+
+        self.table_name = str(table_type)
+        self.stored_fields = [
+            (field_name, field_object) for field_name, field_object in fields.items()
+            if cubista.is_stored_field(field_object)
+        ]
+        self.primary_keys_count = sum([field_object.primary_key for _, field_object in fields.items()])
+
+    def get_not_existing_fields_issues(self, data_frame):
+        data_frame_columns = data_frame.columns
+        stored_fields = self.stored_fields
+
+        return [
+            ValidationIssue(
+                exception_type=cubista.FieldDoesNotExist,
+                message="Field {} not found in {}".format(field_name, ", ".join(data_frame_columns)),
+                field_name=field_name
+            )
+            for field_name, _ in stored_fields if field_name not in data_frame_columns
+        ]
+
+    def get_primary_keys_count_issues(self):
+        table_name = self.table_name
+        primary_keys_count = self.primary_keys_count
+
+        if not primary_keys_count:
+            return [ValidationIssue(
+                exception_type=cubista.NoPrimaryKeySpecified,
+                message="No primary key specified in {}.".format(table_name)
+            )]
+
+        if primary_keys_count > 1:
+            return [ValidationIssue(
+                exception_type=cubista.MoreThanOnePrimaryKeySpecified,
+                message="Only one primary key is allowed for {} but {} found.".format(table_name, primary_keys_count)
+            )]
+
+        return []
+
+    @staticmethod
+    def get_column_issues(data_frame, field_object, validation_policy, sample_positions):
+        data = data_frame[field_object.name]
+        issues = []
+
+        if not validation_policy.checks_values:
+            issues = issues + field_object.get_column_data_type_issues(data=data, required_types=field_object.required_types)
+        elif sample_positions is None:
+            issues = issues + field_object.get_data_type_and_nulls_issues(
+                data=data,
+                required_types=field_object.required_types,
+                nulls=field_object.nulls
+            )
+        else:
+            sampled_issues = field_object.get_data_type_and_nulls_issues(
+                data=data.iloc[sample_positions],
+                required_types=field_object.required_types,
+                nulls=field_object.nulls
+            )
+
+            for issue in sampled_issues:
+                issue.positions = sample_positions[issue.positions]
+
+            issues = issues + sampled_issues
+
+        if field_object.primary_key and (not validation_policy.checks_values or sample_positions is not None):
+            issues = issues + field_object.get_nulls_issues(data=data, nulls=field_object.nulls)
+
+        issues = field_object.get_issues_ordered_by_first_position(issues=issues)
+
+        return issues + field_object.get_uniqueness_issues(data=data, unique=field_object.unique)
+
+    def validate(self, data_frame, validate=True, workers=1, sample_rows_count=default_sample_rows_count):
+        validation_policy = get_validation_policy(validate=validate)
+        report = ValidationReport()
+
+        if validation_policy is None:
+            report.issues = self.get_primary_keys_count_issues()
+
+            for issue in report.issues:
+                issue.table_name = self.table_name
+
+            return report
+
+        stored_fields = self.stored_fields
+        not_existing_fields_issues = self.get_not_existing_fields_issues(data_frame=data_frame)
+        not_existing_field_names = [issue.field_name for issue in not_existing_fields_issues]
+        existing_field_objects = [
+            field_object for field_name, field_object in stored_fields if field_name not in not_existing_field_names
+        ]
+        sample_positions = validation_policy.get_sample_positions(rows_count=len(data_frame))
+
+        def get_field_issues(field_object):
+            return self.get_column_issues(
+                data_frame=data_frame,
+                field_object=field_object,
+                validation_policy=validation_policy,
+                sample_positions=sample_positions
+            )
+
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                fields_issues = list(executor.map(get_field_issues, existing_field_objects))
+        else:
+            fields_issues = [get_field_issues(field_object) for field_object in existing_field_objects]
+
+        report.issues = not_existing_fields_issues
+
+        for field_issues in fields_issues:
+            report.issues = report.issues + field_issues
+
+        report.issues = report.issues + self.get_primary_keys_count_issues()
+
+        for issue in report.issues:
+            issue.table_name = self.table_name
+            issue.set_sample_rows(data_frame=data_frame, sample_rows_count=sample_rows_count)
+
+        return report
+
+def get_table_validator(table_type):
+    table_validator = table_type.__dict__.get("table_validator")
+
+    if table_validator is None:
+        table_validator = TableValidator(table_type=table_type)
+        table_type.table_validator = table_validator
+
+    return table_validator
+
+def validate_tables(tables, validate=True, workers=1):
+    def validate_table(table):
+        return table.validate(validate=validate)
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            table_reports = list(executor.map(validate_table, tables))
+    else:
+        table_reports = [validate_table(table) for table in tables]
+
+    report = ValidationReport()
+
+    for table_report in table_reports:
+        report.extend(table_report)
+
+    return report
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from .exceptions import ValidationFailed
+
+default_sample_rows_count = 5
+
+class ValidationIssue:
+    def __init__(self, exception_type, message, field_name=None, positions=None, count=None):
+        if positions is None:
+            positions = np.array([], dtype=np.int64)
+
+        if count is None:
+            count = len(positions)
+
+        self.exception_type = exception_type
+        self.message = message
+        self.table_name = None
+        self.field_name = field_name
+        self.positions = positions
+        self.count = count
+        self.sample_positions = positions[:default_sample_rows_count]
+        self.sample_rows = None
+
+    def set_sample_rows(self, data_frame, sample_rows_count):
+        self.sample_positions = self.positions[:sample_rows_count]
+
+        if not len(self.positions):
+            return
+
+        self.sample_rows = data_frame.iloc[self.sample_positions]
+
+    def raise_exception(self):
+        raise self.exception_type(self.message)
+
+    def __str__(self):
+        return "{}.{}: {} ({} row(s))".format(self.table_name, self.field_name, self.message, self.count)
+
+class ValidationReport:
+    def __init__(self, issues=None):
+        self.issues = list(issues or [])
+
+    def is_valid(self):
+        return not self.issues
+
+    def extend(self, report):
+        self.issues.extend(report.issues)
+
+    def raise_first_error(self):
+        if self.issues:
+            self.issues[0].raise_exception()
+
+    def raise_all_errors(self):
+        if self.issues:
+            raise ValidationFailed(self)
+
+    def __str__(self):
+        return "{} validation issue(s) found:\n{}".format(len(self.issues), "\n".join([str(issue) for issue in self.issues]))
+
+    def to_data_frame(self):
+        return pd.DataFrame({
+            "table": [issue.table_name for issue in self.issues],
+            "field": [issue.field_name for issue in self.issues],
+            "error": [issue.exception_type.__name__ for issue in self.issues],
+            "count": [issue.count for issue in self.issues],
+            "sample_positions": [issue.sample_positions.tolist() for issue in self.issues],
+            "message": [issue.message for issue in self.issues]
+        })
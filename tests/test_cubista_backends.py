@@ -0,0 +1,120 @@
+import pytest
+
+import cubista
+import pandas as pd
+
+def test_when_data_source_has_unknown_backend_raises_exception():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+
+    table = Table(data_frame=pd.DataFrame({"id": [1]}))
+
+    with pytest.raises(cubista.UnknownBackend):
+        _ = cubista.DataSource(tables=[table], backend="spark")
+
+def test_when_polars_backend_is_requested_without_polars_raises_exception():
+    if cubista.is_polars_available():
+        pytest.skip("polars is installed")
+
+    with pytest.raises(cubista.BackendIsNotAvailable):
+        _ = cubista.get_backend(backend="polars")
+
+def test_when_data_source_has_backend_object_aggregation_and_pulls_run_on_it():
+    class CountingBackend(cubista.PandasBackend):
+        def __init__(self):
+            self.calls = []
+
+        def build_group_index(self, data_frame, sort_by_field_names, group_by_field_names, buckets=None):
+            self.calls.append("build_group_index")
+            return super(CountingBackend, self).build_group_index(data_frame, sort_by_field_names, group_by_field_names, buckets)
+
+        def aggregate_segments(self, data_frame, segment_codes, aggregate_functions):
+            self.calls.append("aggregate_segments")
+            return super(CountingBackend, self).aggregate_segments(data_frame, segment_codes, aggregate_functions)
+
+        def get_referenced_positions(self, data_frame, field_names, referenced_data_frame, referenced_field_names):
+            self.calls.append("get_referenced_positions")
+            return super(CountingBackend, self).get_referenced_positions(data_frame, field_names, referenced_data_frame, referenced_field_names)
+
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            city = cubista.StringField()
+
+    class Order(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+            customer_city = cubista.PullByForeignKey(lambda: Customer, source_field="city", via="customer_id")
+            amount = cubista.FloatField()
+
+    class OrdersByCity(cubista.AggregatedTable):
+        class Aggregation:
+            source = lambda: Order
+            sort_by = ["customer_city"]
+            group_by = ["customer_city"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            city = cubista.GroupField(source="customer_city")
+            amount = cubista.AggregatedField(source="amount", aggregate_function="sum")
+
+    backend = CountingBackend()
+    customers = Customer(data_frame=pd.DataFrame({"id": [1, 2], "city": ["Oslo", "Rome"]}))
+    orders = Order(data_frame=pd.DataFrame({"id": [1, 2, 3], "customer_id": [2, 1, 2], "amount": [1.0, 2.0, 3.0]}))
+
+    data_source = cubista.DataSource(tables=[customers, orders, OrdersByCity()], backend=backend)
+
+    assert data_source.tables[OrdersByCity].data_frame["amount"].tolist() == [2.0, 4.0]
+    assert backend.calls == ["get_referenced_positions", "build_group_index", "aggregate_segments"]
+
+def test_when_polars_backend_is_used_results_match_pandas_backend():
+    pytest.importorskip("polars")
+
+    def get_tables():
+        class Customer(cubista.Table):
+            class Fields:
+                id = cubista.FloatField(primary_key=True, unique=True)
+                city = cubista.StringField()
+
+        class Order(cubista.Table):
+            class Fields:
+                id = cubista.IntField(primary_key=True, unique=True)
+                customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+                customer_city = cubista.PullByForeignKey(lambda: Customer, source_field="city", via="customer_id")
+                amount = cubista.FloatField()
+                quantity = cubista.IntField()
+
+        class OrdersByCity(cubista.AggregatedTable):
+            class Aggregation:
+                source = lambda: Order
+                sort_by = ["customer_city"]
+                group_by = ["customer_city"]
+
+            class Fields:
+                id = cubista.AutoIncrementPrimaryKeyField()
+                city = cubista.GroupField(source="customer_city")
+                amount = cubista.AggregatedField(source="amount", aggregate_function="sum")
+                average_quantity = cubista.AggregatedField(source="quantity", aggregate_function="mean")
+                orders = cubista.AggregatedField(source="id", aggregate_function="count")
+                customers = cubista.AggregatedField(source="customer_id", aggregate_function="nunique")
+
+        customers = Customer(data_frame=pd.DataFrame({"id": [-1.0, 1.0, 2.0], "city": ["unknown", "Oslo", "Rome"]}))
+        orders = Order(data_frame=pd.DataFrame({
+            "id": [1, 2, 3, 4],
+            "customer_id": [2, 1, 2, 3],
+            "amount": [1.0, 2.0, 3.0, 4.0],
+            "quantity": [1, 2, 4, 8]
+        }))
+
+        return [customers, orders, OrdersByCity()]
+
+    pandas_tables = get_tables()
+    polars_tables = get_tables()
+
+    _ = cubista.DataSource(tables=pandas_tables, backend="pandas")
+    _ = cubista.DataSource(tables=polars_tables, backend="polars")
+
+    for pandas_table, polars_table in zip(pandas_tables, polars_tables):
+        pd.testing.assert_frame_equal(polars_table.data_frame, pandas_table.data_frame)
@@ -1,6 +1,11 @@
 import pytest
+import asyncio
+import datetime
+import threading
+import time
 
 import cubista
+import numpy as np
 import pandas as pd
 
 def test_when_data_source_is_created_table_knows_its_data_source():
@@ -268,4 +273,984 @@ def test_create_table_with_grouping_and_aggregation():
     assert table2.data_frame.columns.tolist() == ["table1_name", "table1_value_sum", "id"]
     assert table2.data_frame["id"].tolist() == [-2, -3]
     assert table2.data_frame["table1_name"].tolist() == ["group 1", "group 2"]
-    assert table2.data_frame["table1_value_sum"].tolist() == [3.0, 7.0]
\ No newline at end of file
+    assert table2.data_frame["table1_value_sum"].tolist() == [3.0, 7.0]
+
+def test_create_table_with_vectorized_aggregate_function_over_group_segments():
+    class Table1(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+            value = cubista.FloatField()
+
+    class Table2(cubista.AggregatedTable):
+        class Aggregation:
+            source: cubista.Table = lambda: Table1
+            sort_by = ["id"]
+            group_by = ["name"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            table1_name = cubista.GroupField(source="name")
+            table1_value_sum = cubista.AggregatedField(
+                source="value",
+                aggregate_function=lambda values, offsets: np.add.reduceat(values, offsets[:-1]),
+                engine="vectorized"
+            )
+
+    data1 = {
+        "id": [4, 3, 2, 1, 5],
+        "name": ["group 2", "group 1", "group 2", "group 1", "group 3"],
+        "value": [1.0, 2.0, 3.0, 4.0, 5.0]
+    }
+    data_frame1 = pd.DataFrame(data1)
+    table1 = Table1(data_frame=data_frame1)
+
+    table2 = Table2()
+
+    _ = cubista.DataSource(tables=[
+        table1,
+        table2
+    ])
+
+    assert table2.data_frame["table1_name"].tolist() == ["group 1", "group 2", "group 3"]
+    assert table2.data_frame["table1_value_sum"].tolist() == [6.0, 4.0, 5.0]
+
+def test_create_table_with_jit_aggregate_function_receives_group_values_in_sort_order():
+    def last_not_null(values):
+        result = np.nan
+
+        for value in values:
+            if not np.isnan(value):
+                result = value
+
+        return result
+
+    class Table1(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+            value = cubista.FloatField(nulls=True)
+
+    class Table2(cubista.AggregatedTable):
+        class Aggregation:
+            source: cubista.Table = lambda: Table1
+            sort_by = ["id"]
+            group_by = ["name"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            table1_name = cubista.GroupField(source="name")
+            table1_value_sum = cubista.AggregatedField(source="value", aggregate_function="sum")
+            table1_value_last = cubista.AggregatedField(source="value", aggregate_function=last_not_null, engine="jit")
+
+    data1 = {
+        "id": [4, 3, 2, 1],
+        "name": ["group 1", "group 1", "group 2", "group 2"],
+        "value": [None, 1.0, 3.0, 4.0]
+    }
+    data_frame1 = pd.DataFrame(data1)
+    table1 = Table1(data_frame=data_frame1)
+
+    table2 = Table2()
+
+    _ = cubista.DataSource(tables=[
+        table1,
+        table2
+    ])
+
+    assert table2.data_frame.columns.tolist() == ["table1_name", "table1_value_sum", "table1_value_last", "id"]
+    assert table2.data_frame["table1_value_sum"].tolist() == [1.0, 7.0]
+    assert table2.data_frame["table1_value_last"].tolist() == [1.0, 3.0]
+
+def test_when_aggregated_tables_share_source_sort_and_grouping_source_is_sorted_once(monkeypatch):
+    class Table1(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+            value = cubista.FloatField()
+
+    class Table2(cubista.AggregatedTable):
+        class Aggregation:
+            source: cubista.Table = lambda: Table1
+            sort_by = ["id"]
+            group_by = ["name"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            table1_name = cubista.GroupField(source="name")
+            table1_value_first = cubista.AggregatedField(source="value", aggregate_function="first")
+
+    class Table3(cubista.AggregatedTable):
+        class Aggregation:
+            source: cubista.Table = lambda: Table1
+            sort_by = ["id"]
+            group_by = ["name"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            table1_name = cubista.GroupField(source="name")
+            table1_value_last = cubista.AggregatedField(source="value", aggregate_function="last")
+
+    builds = []
+    build = cubista.GroupIndex.build.__func__
+
+    def counting_build(cls, data_frame, sort_by_field_names, group_by_field_names, buckets=None):
+        builds.append((tuple(sort_by_field_names), tuple(group_by_field_names)))
+        return build(cls, data_frame, sort_by_field_names, group_by_field_names, buckets)
+
+    monkeypatch.setattr(cubista.GroupIndex, "build", classmethod(counting_build))
+
+    data1 = {
+        "id": [4, 3, 2, 1],
+        "name": ["group 1", "group 1", "group 2", "group 2"],
+        "value": [1.0, 2.0, 3.0, 4.0]
+    }
+    data_frame1 = pd.DataFrame(data1)
+    table1 = Table1(data_frame=data_frame1)
+
+    table2 = Table2()
+    table3 = Table3()
+
+    _ = cubista.DataSource(tables=[
+        table1,
+        table2,
+        table3
+    ])
+
+    assert builds == [(("id",), ("name",))]
+    assert table2.data_frame["table1_value_first"].tolist() == [2.0, 4.0]
+    assert table3.data_frame["table1_value_last"].tolist() == [1.0, 3.0]
+
+def test_when_source_data_frame_is_replaced_cached_group_index_is_rebuilt():
+    class Table1(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+
+    data1 = {
+        "id": [1, 2],
+        "name": ["group 1", "group 2"]
+    }
+    table1 = Table1(data_frame=pd.DataFrame(data1))
+
+    data_source = cubista.DataSource(tables=[table1])
+
+    group_index = data_source.get_group_index(table=table1, sort_by_field_names=["id"], group_by_field_names=["name"])
+    assert data_source.get_group_index(table=table1, sort_by_field_names=["id"], group_by_field_names=["name"]) is group_index
+
+    table1.data_frame = pd.DataFrame({"id": [1, 2, 3], "name": ["group 1", "group 2", "group 2"]})
+
+    rebuilt_group_index = data_source.get_group_index(table=table1, sort_by_field_names=["id"], group_by_field_names=["name"])
+    assert rebuilt_group_index is not group_index
+    assert rebuilt_group_index.group_count == 2
+
+def test_when_aggregation_spills_partitions_result_matches_in_memory_aggregation(tmp_path):
+    class Table1(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+            value = cubista.FloatField()
+
+    class InMemoryTable(cubista.AggregatedTable):
+        class Aggregation:
+            source: cubista.Table = lambda: Table1
+            sort_by = ["id"]
+            group_by = ["name"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            table1_name = cubista.GroupField(source="name")
+            table1_value_sum = cubista.AggregatedField(source="value", aggregate_function="sum")
+            table1_value_last = cubista.AggregatedField(source="id", aggregate_function="last")
+
+    class SpilledTable(cubista.AggregatedTable):
+        class Aggregation:
+            source: cubista.Table = lambda: Table1
+            sort_by = ["id"]
+            group_by = ["name"]
+            spill_partitions = 3
+            spill_workers = 2
+            spill_directory = str(tmp_path)
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            table1_name = cubista.GroupField(source="name")
+            table1_value_sum = cubista.AggregatedField(source="value", aggregate_function="sum")
+            table1_value_last = cubista.AggregatedField(source="id", aggregate_function="last")
+
+    class ChunkedSpilledTable(cubista.AggregatedTable):
+        class Aggregation:
+            source: cubista.Table = lambda: Table1
+            sort_by = ["id"]
+            group_by = ["name"]
+            spill_partitions = 3
+            spill_chunk_rows = 6
+            spill_directory = str(tmp_path)
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            table1_name = cubista.GroupField(source="name")
+            table1_value_sum = cubista.AggregatedField(source="value", aggregate_function="sum")
+            table1_value_last = cubista.AggregatedField(source="id", aggregate_function="last")
+
+    data1 = {
+        "id": list(range(20, 0, -1)),
+        "name": ["group {}".format(value % 7) for value in range(20)],
+        "value": [float(value) for value in range(20)]
+    }
+    table1 = Table1(data_frame=pd.DataFrame(data1))
+    in_memory_table = InMemoryTable()
+    spilled_table = SpilledTable()
+    chunked_spilled_table = ChunkedSpilledTable()
+
+    _ = cubista.DataSource(tables=[
+        table1,
+        in_memory_table,
+        spilled_table,
+        chunked_spilled_table
+    ])
+
+    pd.testing.assert_frame_equal(spilled_table.data_frame, in_memory_table.data_frame)
+    pd.testing.assert_frame_equal(chunked_spilled_table.data_frame, in_memory_table.data_frame)
+    assert list(tmp_path.iterdir()) == []
+
+def test_when_data_source_is_built_asynchronously_tables_are_evaluated_and_progress_is_reported():
+    class Table1(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+
+    class Table2(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            table1_id = cubista.ForeignKey(lambda: Table1, default=-1)
+            table1_name = cubista.PullByForeignKey(lambda: Table1, source_field="name")
+            table1_name_length = cubista.CalculatedField(lambda x: len(x["table1_name"]), source_fields=["table1_name"])
+
+    table1 = Table1(data_frame=pd.DataFrame({"id": [1, 2], "name": ["one", "three"]}))
+    table2 = Table2(data_frame=pd.DataFrame({"id": [1, 2], "table1_id": [1, 3]}))
+    progress = []
+
+    data_source = asyncio.run(cubista.DataSource.build_async(
+        tables=[table1, table2],
+        progress=lambda stage, evaluated, total: progress.append((stage, evaluated, total))
+    ))
+
+    assert table2.data_source == data_source
+    assert table2.data_frame["table1_id"].tolist() == [1, -1]
+    assert table2.data_frame["table1_name_length"].tolist() == [3, 5]
+    assert progress[0] == ("check references", 0, 3)
+    assert progress[-1][1:] == (3, 3)
+
+def test_when_asynchronous_build_is_cancelled_remaining_stages_are_not_evaluated():
+    class Table1(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+            name_length = cubista.CalculatedField(lambda x: len(x["name"]), source_fields=["name"])
+
+    class Table2(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            table1_id = cubista.ForeignKey(lambda: Table1, default=-1)
+            table1_name_length = cubista.PullByForeignKey(lambda: Table1, source_field="name_length")
+
+    table1 = Table1(data_frame=pd.DataFrame({"id": [1, 2], "name": ["one", "three"]}))
+    table2 = Table2(data_frame=pd.DataFrame({"id": [1, 2], "table1_id": [1, 2]}))
+
+    async def build_and_cancel():
+        def cancel_after_first_pass(stage, evaluated, total):
+            if stage != "check references":
+                task.cancel()
+
+        task = asyncio.ensure_future(cubista.DataSource.build_async(tables=[table2, table1], progress=cancel_after_first_pass))
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(build_and_cancel())
+
+    assert "name_length" in table1.data_frame.columns
+    assert "table1_name_length" not in table2.data_frame.columns
+
+def test_when_hot_swap_data_source_is_refreshed_new_data_source_replaces_old_one():
+    class Table1(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+
+    old_table = Table1(data_frame=pd.DataFrame({"id": [1]}))
+    old_data_source = cubista.DataSource(tables=[old_table])
+    hot_swap_data_source = cubista.HotSwapDataSource(data_source=old_data_source)
+
+    new_table = Table1(data_frame=pd.DataFrame({"id": [1, 2]}))
+
+    async def refresh():
+        return await hot_swap_data_source.refresh(tables=[new_table])
+
+    new_data_source = asyncio.run(refresh())
+
+    assert hot_swap_data_source.data_source is new_data_source
+    assert hot_swap_data_source.data_source.tables[Table1].data_frame["id"].tolist() == [1, 2]
+    assert old_data_source.tables[Table1].data_frame["id"].tolist() == [1]
+
+def test_when_asynchronous_build_is_cancelled_during_pass_it_waits_for_pass_to_finish():
+    pass_started = threading.Event()
+
+    def get_name_length(x):
+        pass_started.set()
+        time.sleep(0.05)
+
+        return len(x["name"])
+
+    class Table1(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+            name_length = cubista.CalculatedField(get_name_length, source_fields=["name"])
+
+    table1 = Table1(data_frame=pd.DataFrame({"id": [1, 2], "name": ["one", "three"]}))
+
+    async def build_and_cancel():
+        task = asyncio.ensure_future(cubista.DataSource.build_async(tables=[table1]))
+        await asyncio.get_running_loop().run_in_executor(None, pass_started.wait)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert table1.data_frame["name_length"].tolist() == [3, 5]
+
+    asyncio.run(build_and_cancel())
+
+def test_when_hot_swap_data_source_is_refreshed_old_data_source_rejects_writes_and_lazy_queries():
+    class Table1(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            value = cubista.IntField()
+
+    old_table = Table1(data_frame=pd.DataFrame({"id": [1], "value": [10]}))
+    old_data_source = cubista.DataSource(tables=[old_table])
+    hot_swap_data_source = cubista.HotSwapDataSource(data_source=old_data_source)
+
+    new_table = Table1(data_frame=pd.DataFrame({"id": [1, 2], "value": [10, 20]}))
+    asyncio.run(hot_swap_data_source.refresh(tables=[new_table]))
+
+    with pytest.raises(cubista.DataSourceIsReplaced):
+        old_data_source.upsert(Table1, pd.DataFrame({"id": [3], "value": [30]}))
+
+    with pytest.raises(cubista.DataSourceIsReplaced):
+        old_data_source.evaluate_query(cubista.Query(data_source=old_data_source, table_type=Table1))
+
+    assert old_data_source.tables[Table1].data_frame["value"].tolist() == [10]
+
+def test_when_aggregated_table_groups_by_date_part_field_datetime64_dates_are_bucketed():
+    class Sales(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            date = cubista.DateField()
+            month = cubista.DatePartField(source="date", part="month")
+            amount = cubista.FloatField()
+
+    class SalesByMonth(cubista.AggregatedTable):
+        class Aggregation:
+            source = lambda: Sales
+            sort_by = ["month"]
+            group_by = ["month"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            month = cubista.GroupField(source="month")
+            amount = cubista.AggregatedField(source="amount", aggregate_function="sum")
+
+    sales = Sales(data_frame=pd.DataFrame({
+        "id": [1, 2, 3],
+        "date": pd.to_datetime(["2021-02-01", "2021-01-15", "2021-02-20"]),
+        "amount": [1.0, 2.0, 3.0]
+    }))
+    data_source = cubista.DataSource(tables=[sales, SalesByMonth()])
+    sales_by_month = data_source.tables[SalesByMonth].data_frame
+
+    assert data_source.tables[Sales].data_frame["date"].dtype.kind == "M"
+    assert sales_by_month["month"].tolist() == [1, 2]
+    assert sales_by_month["amount"].tolist() == [2.0, 4.0]
+
+def test_when_group_field_has_month_bucket_dates_are_grouped_by_month_without_source_column():
+    class Sales(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            date = cubista.DateField()
+            amount = cubista.FloatField()
+
+    class SalesByMonth(cubista.AggregatedTable):
+        class Aggregation:
+            source = lambda: Sales
+            sort_by = ["date"]
+            group_by = ["date"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            month = cubista.GroupField(source="date", bucket="month")
+            amount = cubista.AggregatedField(source="amount", aggregate_function="sum")
+
+    class SalesByDay(cubista.AggregatedTable):
+        class Aggregation:
+            source = lambda: Sales
+            sort_by = ["date"]
+            group_by = ["date"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            day = cubista.GroupField(source="date")
+            amount = cubista.AggregatedField(source="amount", aggregate_function="sum")
+
+    sales = Sales(data_frame=pd.DataFrame({
+        "id": [1, 2, 3],
+        "date": [datetime.date(2021, 2, 1), datetime.date(2021, 1, 15), datetime.date(2021, 2, 20)],
+        "amount": [1.0, 2.0, 3.0]
+    }))
+    data_source = cubista.DataSource(tables=[sales, SalesByMonth(), SalesByDay()])
+    sales_by_month = data_source.tables[SalesByMonth].data_frame
+
+    assert sales_by_month["month"].tolist() == [pd.Timestamp(2021, 1, 1), pd.Timestamp(2021, 2, 1)]
+    assert sales_by_month["amount"].tolist() == [2.0, 4.0]
+    assert len(data_source.tables[SalesByDay].data_frame) == 3
+    assert data_source.tables[Sales].data_frame.columns.tolist() == ["id", "date", "amount"]
+
+def test_when_group_field_has_unknown_bucket_raises_exception():
+    with pytest.raises(cubista.UnknownDateBucket):
+        _ = cubista.GroupField(source="date", bucket="decade")
+
+def test_when_pull_by_foreign_key_uses_composite_key_values_are_pulled_by_all_key_fields():
+    class Price(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            store = cubista.StringField()
+            product = cubista.IntField()
+            price = cubista.FloatField()
+
+    class Sale(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            store = cubista.StringField()
+            product = cubista.IntField()
+            price_key = cubista.ForeignKey(lambda: Price, on=["store", "product"])
+            price = cubista.PullByForeignKey(lambda: Price, source_field="price", on=["store", "product"])
+
+    prices = Price(data_frame=pd.DataFrame({
+        "id": [1, 2, 3],
+        "store": ["a", "a", "b"],
+        "product": [1, 2, 1],
+        "price": [10.0, 20.0, 30.0]
+    }))
+    sales = Sale(data_frame=pd.DataFrame({
+        "id": [1, 2, 3, 4],
+        "store": pd.Categorical(["b", "a", "c", "a"]),
+        "product": [1, 2, 1, 1]
+    }, index=[10, 11, 12, 13]))
+
+    _ = cubista.DataSource(tables=[prices, sales])
+
+    assert sales.data_frame.index.tolist() == [10, 11, 12, 13]
+    assert sales.data_frame["price"].tolist()[:2] == [30.0, 20.0]
+    assert np.isnan(sales.data_frame["price"].tolist()[2])
+    assert sales.data_frame["price"].tolist()[3] == 10.0
+
+def test_when_foreign_key_has_inner_join_type_rows_referencing_nowhere_are_dropped():
+    class Price(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            store = cubista.StringField()
+            product = cubista.IntField()
+            price = cubista.FloatField()
+
+    class Sale(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            store = cubista.StringField(nulls=True)
+            product = cubista.IntField()
+            price_key = cubista.ForeignKey(lambda: Price, on=["store", "product"], how="inner")
+            price = cubista.PullByForeignKey(lambda: Price, source_field="price", on=["store", "product"], how="inner")
+
+    prices = Price(data_frame=pd.DataFrame({
+        "id": [1, 2],
+        "store": ["a", "b"],
+        "product": [1, 1],
+        "price": [10.0, 30.0]
+    }))
+    sales = Sale(data_frame=pd.DataFrame({
+        "id": [1, 2, 3],
+        "store": ["b", "a", None],
+        "product": [1, 2, 1]
+    }))
+
+    _ = cubista.DataSource(tables=[prices, sales])
+
+    assert sales.data_frame["id"].tolist() == [1]
+    assert sales.data_frame["price"].tolist() == [30.0]
+
+def test_when_composite_referenced_key_is_not_unique_raises_exception():
+    class Price(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            store = cubista.StringField()
+
+    class Sale(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            store = cubista.StringField()
+            price_key = cubista.ForeignKey(lambda: Price, on=["store"])
+
+    prices = Price(data_frame=pd.DataFrame({"id": [1, 2], "store": ["a", "a"]}))
+    sales = Sale(data_frame=pd.DataFrame({"id": [1], "store": ["a"]}))
+
+    with pytest.raises(cubista.ReferencedKeyIsNotUnique):
+        _ = cubista.DataSource(tables=[prices, sales])
+
+def test_when_pull_by_foreign_key_names_foreign_key_values_are_pulled_through_it():
+    class Warehouse(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            city = cubista.StringField()
+
+    class Shipment(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            ship_from_id = cubista.ForeignKey(lambda: Warehouse, default=-1)
+            ship_to_id = cubista.ForeignKey(lambda: Warehouse, default=-1)
+            ship_from_city = cubista.PullByForeignKey(lambda: Warehouse, source_field="city", via="ship_from_id")
+            ship_to_city = cubista.PullByForeignKey(lambda: Warehouse, source_field="city", via="ship_to_id")
+
+    warehouses = Warehouse(data_frame=pd.DataFrame({"id": [-1, 1, 2], "city": ["unknown", "Oslo", "Rome"]}))
+    shipments = Shipment(data_frame=pd.DataFrame({"id": [1, 2], "ship_from_id": [1, 2], "ship_to_id": [2, 3]}))
+
+    _ = cubista.DataSource(tables=[warehouses, shipments])
+
+    assert shipments.data_frame["ship_to_id"].tolist() == [2, -1]
+    assert shipments.data_frame["ship_from_city"].tolist() == ["Oslo", "Rome"]
+    assert shipments.data_frame["ship_to_city"].tolist() == ["Rome", "unknown"]
+
+def test_when_several_fields_are_pulled_via_foreign_key_keys_are_hashed_once(monkeypatch):
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+            city = cubista.StringField()
+
+    class Order(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+            customer_name = cubista.PullByForeignKey(lambda: Customer, source_field="name", via="customer_id")
+            customer_city = cubista.PullByForeignKey(lambda: Customer, source_field="city", via="customer_id")
+
+    lookups = []
+    get_referenced_positions = cubista.get_referenced_positions
+
+    def counting_get_referenced_positions(**kwargs):
+        lookups.append(kwargs["field_names"])
+        return get_referenced_positions(**kwargs)
+
+    monkeypatch.setattr(cubista, "get_referenced_positions", counting_get_referenced_positions)
+
+    customers = Customer(data_frame=pd.DataFrame({"id": [1, 2], "name": ["Ann", "Bob"], "city": ["Oslo", "Rome"]}))
+    orders = Order(data_frame=pd.DataFrame({"id": [1, 2, 3], "customer_id": [2, 1, 2]}))
+
+    _ = cubista.DataSource(tables=[customers, orders])
+
+    assert orders.data_frame["customer_name"].tolist() == ["Bob", "Ann", "Bob"]
+    assert orders.data_frame["customer_city"].tolist() == ["Rome", "Oslo", "Rome"]
+    assert lookups == [["customer_id"]]
+
+def test_when_transient_field_is_consumed_its_column_is_freed():
+    class Sale(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            store = cubista.StringField()
+            price = cubista.FloatField()
+            quantity = cubista.IntField()
+            amount = cubista.CalculatedField(lambda_expression=lambda x: x["price"] * x["quantity"], source_fields=["price", "quantity"], transient=True)
+            amount_with_tax = cubista.CalculatedField(lambda_expression=lambda x: x["amount"] * 1.5, source_fields=["amount"])
+
+    class SalesTotal(cubista.AggregatedTable):
+        class Aggregation:
+            source = lambda: Sale
+            sort_by = []
+            group_by = ["store"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            store = cubista.GroupField(source="store")
+            amount = cubista.AggregatedField(source="amount", aggregate_function="sum")
+
+    sales = Sale(data_frame=pd.DataFrame({"id": [1, 2], "store": ["a", "a"], "price": [1.0, 2.0], "quantity": [3, 4]}))
+    sales_total = SalesTotal()
+
+    data_source = cubista.DataSource(tables=[sales, sales_total])
+
+    assert "amount" not in sales.data_frame.columns
+    assert sales.data_frame["amount_with_tax"].tolist() == [4.5, 12.0]
+    assert sales_total.data_frame["amount"].tolist() == [11.0]
+    assert data_source.get_fields_to_evaluate() == []
+    assert data_source.query(Sale).select("id", "amount").execute()["amount"].tolist() == [3.0, 8.0]
+
+def test_when_memory_limit_is_exceeded_cold_columns_are_spilled_and_restored():
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+
+    class Order(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+            customer_name = cubista.PullByForeignKey(lambda: Customer, source_field="name", via="customer_id")
+            customer_name_length = cubista.CalculatedField(lambda_expression=lambda x: len(x["customer_name"]), source_fields=["customer_name"])
+
+    spilled_columns = []
+    customers = Customer(data_frame=pd.DataFrame({"id": [-1, 1, 2], "name": ["unknown", "Ann", "Bobby"]}))
+    orders = Order(data_frame=pd.DataFrame({"id": [1, 2, 3], "customer_id": [2, 1, 3]}))
+
+    class SpillRecordingDataSource(cubista.DataSource):
+        def spill_column(self, table_type, field_name):
+            spilled_columns.append((table_type, field_name))
+            super(SpillRecordingDataSource, self).spill_column(table_type=table_type, field_name=field_name)
+
+    data_source = SpillRecordingDataSource(tables=[customers, orders], memory_limit=0)
+
+    assert (Customer, "name") in spilled_columns
+    assert customers.data_frame["name"].tolist() == ["unknown", "Ann", "Bobby"]
+    assert orders.data_frame["customer_name"].tolist() == ["Bobby", "Ann", "unknown"]
+    assert orders.data_frame["customer_name_length"].tolist() == [5, 3, 7]
+    assert data_source.spilled_columns == {}
+
+def test_when_columns_are_spilled_and_restored_their_data_types_are_kept():
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+            is_active = cubista.BoolField(nulls=True)
+
+    class Order(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+            customer_name = cubista.PullByForeignKey(lambda: Customer, source_field="name", via="customer_id")
+            customer_is_active = cubista.PullByForeignKey(lambda: Customer, source_field="is_active", via="customer_id")
+
+    def evaluate_data_frames(**kwargs):
+        customers = Customer(data_frame=pd.DataFrame({
+            "id": [-1, 1, 2],
+            "name": pd.Categorical(["unknown", "Ann", "Bobby"]),
+            "is_active": pd.array([None, True, False], dtype="boolean")
+        }))
+        orders = Order(data_frame=pd.DataFrame({"id": [1, 2, 3], "customer_id": [2, 1, 3]}))
+        _ = cubista.DataSource(tables=[customers, orders], **kwargs)
+
+        return [customers.data_frame, orders.data_frame]
+
+    expected_data_frames = evaluate_data_frames()
+    data_frames = evaluate_data_frames(memory_limit=0)
+
+    for data_frame, expected_data_frame in zip(data_frames, expected_data_frames):
+        assert data_frame.dtypes.to_dict() == expected_data_frame.dtypes.to_dict()
+
+def test_when_evaluation_fails_after_spilling_columns_are_restored_and_spill_directory_is_removed(tmp_path):
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+
+    class Order(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+            customer_name = cubista.PullByForeignKey(lambda: Customer, source_field="name", via="customer_id")
+            broken = cubista.CalculatedField(lambda_expression=lambda x: x["missing"], source_fields=["missing"])
+
+    customers = Customer(data_frame=pd.DataFrame({"id": [-1, 1], "name": ["unknown", "Ann"]}))
+    orders = Order(data_frame=pd.DataFrame({"id": [1, 2], "customer_id": [1, 2]}))
+
+    with pytest.raises(cubista.CannotEvaluateFields):
+        cubista.DataSource(tables=[customers, orders], memory_limit=0, spill_directory=str(tmp_path))
+
+    assert customers.data_frame["name"].tolist() == ["unknown", "Ann"]
+    assert list(tmp_path.iterdir()) == []
+
+def test_when_window_fields_are_evaluated_values_are_computed_per_partition():
+    class Sale(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            store = cubista.StringField()
+            day = cubista.IntField()
+            amount = cubista.FloatField()
+            store_amount = cubista.WindowField(source="amount", function="sum", partition_by=["store"])
+            store_balance = cubista.WindowField(source="amount", function="sum", partition_by=["store"], order_by=["day"])
+            store_moving_mean = cubista.WindowField(source="amount", function="mean", partition_by=["store"], order_by=["day"], frame=2)
+            store_day_number = cubista.WindowField(source="amount", function="row_number", partition_by=["store"], order_by=["day"])
+            total_amount = cubista.WindowField(source="amount", function="sum")
+            store_share = cubista.CalculatedField(lambda_expression=lambda x: x["amount"] / x["store_amount"], source_fields=["amount", "store_amount"])
+
+    sales = Sale(data_frame=pd.DataFrame({
+        "id": [1, 2, 3, 4, 5],
+        "store": ["a", "b", "a", "a", "b"],
+        "day": [3, 1, 1, 2, 2],
+        "amount": [1.0, 2.0, 3.0, 4.0, 6.0]
+    }))
+
+    data_source = cubista.DataSource(tables=[sales])
+
+    assert sales.data_frame["store_amount"].tolist() == [8.0, 8.0, 8.0, 8.0, 8.0]
+    assert sales.data_frame["store_balance"].tolist() == [8.0, 2.0, 3.0, 7.0, 8.0]
+    assert sales.data_frame["store_moving_mean"].tolist() == [2.5, 2.0, 3.0, 3.5, 4.0]
+    assert sales.data_frame["store_day_number"].tolist() == [3, 1, 1, 2, 2]
+    assert sales.data_frame["total_amount"].tolist() == [16.0, 16.0, 16.0, 16.0, 16.0]
+    assert sales.data_frame["store_share"].tolist() == [0.125, 0.25, 0.375, 0.5, 0.75]
+
+    data_source.upsert(Sale, pd.DataFrame({"id": [6], "store": ["b"], "day": [0], "amount": [8.0]}))
+
+    assert sales.data_frame["store_amount"].tolist() == [8.0, 16.0, 8.0, 8.0, 16.0, 16.0]
+    assert sales.data_frame["store_balance"].tolist() == [8.0, 10.0, 3.0, 7.0, 16.0, 8.0]
+    assert sales.data_frame["total_amount"].tolist() == [24.0] * 6
+
+def test_when_rows_are_deleted_window_fields_are_evaluated_over_remaining_rows():
+    class Sale(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            day = cubista.IntField()
+            amount = cubista.FloatField()
+            running_amount = cubista.WindowField(source="amount", function="sum", partition_by=[], order_by=["day"])
+            total_amount = cubista.WindowField(source="amount", function="sum")
+
+    sales = Sale(data_frame=pd.DataFrame({"id": [1, 2, 3], "day": [1, 2, 3], "amount": [1.0, 2.0, 3.0]}))
+    data_source = cubista.DataSource(tables=[sales])
+
+    data_source.delete(Sale, [1])
+
+    assert sales.data_frame["id"].tolist() == [2, 3]
+    assert sales.data_frame["running_amount"].tolist() == [2.0, 5.0]
+    assert sales.data_frame["total_amount"].tolist() == [5.0, 5.0]
+
+def test_when_aggregation_has_where_having_and_top_n_only_selected_groups_are_kept():
+    class Sale(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            store = cubista.StringField()
+            returned = cubista.BoolField()
+            amount = cubista.FloatField()
+
+    class TopStores(cubista.AggregatedTable):
+        class Aggregation:
+            source = lambda: Sale
+            sort_by = []
+            group_by = ["store"]
+            where = [("returned", "==", False)]
+            having = [("sales_count", ">=", 2)]
+            top_n = 2
+            top_n_by = "amount"
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            store = cubista.GroupField(source="store")
+            amount = cubista.AggregatedField(source="amount", aggregate_function="sum")
+            sales_count = cubista.AggregatedField(source="id", aggregate_function="count")
+
+    sales = Sale(data_frame=pd.DataFrame({
+        "id": [1, 2, 3, 4, 5, 6, 7, 8, 9],
+        "store": ["a", "a", "b", "b", "c", "c", "d", "d", "e"],
+        "returned": [False, False, False, True, False, False, False, False, False],
+        "amount": [1.0, 2.0, 100.0, 1.0, 5.0, 5.0, 2.0, 2.0, 50.0]
+    }))
+    top_stores = TopStores()
+
+    data_source = cubista.DataSource(tables=[sales, top_stores])
+
+    assert top_stores.data_frame["store"].tolist() == ["c", "d"]
+    assert top_stores.data_frame["amount"].tolist() == [10.0, 4.0]
+    assert top_stores.data_frame["id"].tolist() == [-2, -3]
+    assert data_source.query(TopStores).where("store", "==", "d").execute()["amount"].tolist() == [4.0]
+
+    lazy_data_source = cubista.DataSource(tables=[Sale(data_frame=sales.data_frame.copy()), TopStores()], lazy=True)
+
+    assert lazy_data_source.query(TopStores).where("store", "==", "a").execute()["amount"].tolist() == []
+
+@pytest.mark.parametrize("top_n_by", [None, "missing"])
+def test_when_top_n_field_is_not_aggregated_table_field_raises_exception(top_n_by):
+    class Sale(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            store = cubista.StringField()
+            amount = cubista.FloatField()
+
+    class TopStores(cubista.AggregatedTable):
+        class Aggregation:
+            source = lambda: Sale
+            sort_by = []
+            group_by = ["store"]
+            top_n = 1
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            store = cubista.GroupField(source="store")
+            amount = cubista.AggregatedField(source="amount", aggregate_function="sum")
+
+    TopStores.Aggregation.top_n_by = top_n_by
+
+    with pytest.raises(cubista.UnknownTopNField):
+        _ = TopStores()
+
+def test_when_source_is_already_sorted_by_sort_by_field_aggregation_does_not_sort(monkeypatch):
+    class Sale(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            store = cubista.StringField()
+            amount = cubista.FloatField()
+
+    class SalesByStore(cubista.AggregatedTable):
+        class Aggregation:
+            source = lambda: Sale
+            sort_by = ["id"]
+            group_by = ["store"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            store = cubista.GroupField(source="store")
+            last_amount = cubista.AggregatedField(source="amount", aggregate_function="last")
+
+    sorts = []
+    get_sort_permutation = cubista.GroupIndex.get_sort_permutation
+
+    def counting_get_sort_permutation(data_frame, sort_by_field_names):
+        sorts.append(sort_by_field_names)
+        return get_sort_permutation(data_frame=data_frame, sort_by_field_names=sort_by_field_names)
+
+    monkeypatch.setattr(cubista.GroupIndex, "get_sort_permutation", staticmethod(counting_get_sort_permutation))
+
+    sales = Sale(data_frame=pd.DataFrame({"id": [1, 2, 3], "store": ["b", "a", "b"], "amount": [1.0, 2.0, 3.0]}))
+    sales_by_store = SalesByStore()
+
+    _ = cubista.DataSource(tables=[sales, sales_by_store])
+
+    assert sorts == [[]]
+    assert sales_by_store.data_frame["last_amount"].tolist() == [2.0, 3.0]
+
+def test_when_dimensions_are_pruned_only_referenced_rows_are_evaluated():
+    class Region(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            region_id = cubista.ForeignKey(lambda: Region, default=-1)
+            name = cubista.StringField()
+            name_length = cubista.CalculatedField(lambda_expression=lambda x: len(x["name"]), source_fields=["name"])
+            region_name = cubista.PullByForeignKey(lambda: Region, source_field="name", via="region_id")
+
+    class Order(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+            customer_name_length = cubista.PullByForeignKey(lambda: Customer, source_field="name_length", via="customer_id")
+            customer_region_name = cubista.PullByForeignKey(lambda: Customer, source_field="region_name", via="customer_id")
+
+    regions = Region(data_frame=pd.DataFrame({"id": [-1, 1, 2, 3], "name": ["unknown", "north", "south", "east"]}))
+    customers = Customer(data_frame=pd.DataFrame({
+        "id": [-1, 1, 2, 3, 4],
+        "region_id": [-1, 1, 2, 3, 3],
+        "name": ["unknown", "Ann", "Bob", "Cid", "Dora"]
+    }))
+    orders = Order(data_frame=pd.DataFrame({"id": [1, 2, 3], "customer_id": [2, 4, 5]}))
+
+    _ = cubista.DataSource(tables=[regions, customers, orders], prune_dimensions=True)
+
+    assert customers.data_frame["id"].tolist() == [-1, 2, 4]
+    assert customers.data_frame.index.tolist() == [0, 1, 2]
+    assert customers.data_frame["name_length"].tolist() == [7, 3, 4]
+    assert regions.data_frame["id"].tolist() == [-1, 2, 3]
+    assert orders.data_frame["customer_name_length"].tolist() == [3, 4, 7]
+    assert orders.data_frame["customer_region_name"].tolist() == ["south", "east", "unknown"]
+
+def test_when_dimensions_are_pruned_asynchronous_build_matches_synchronous_build():
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+            name_length = cubista.CalculatedField(lambda_expression=lambda x: len(x["name"]), source_fields=["name"])
+
+    class Order(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+            customer_name_length = cubista.PullByForeignKey(lambda: Customer, source_field="name_length", via="customer_id")
+
+    def evaluate_data_frames(data_source_factory):
+        customers = Customer(data_frame=pd.DataFrame({"id": [-1, 1, 2, 3], "name": ["unknown", "Ann", "Bob", "Cid"]}))
+        orders = Order(data_frame=pd.DataFrame({"id": [1, 2], "customer_id": [2, 5]}))
+        _ = data_source_factory([customers, orders])
+
+        return [customers.data_frame, orders.data_frame]
+
+    expected_data_frames = evaluate_data_frames(lambda tables: cubista.DataSource(tables=tables, prune_dimensions=True))
+    data_frames = evaluate_data_frames(lambda tables: asyncio.run(cubista.DataSource.build_async(tables=tables, prune_dimensions=True)))
+
+    assert expected_data_frames[0]["id"].tolist() == [-1, 2]
+
+    for data_frame, expected_data_frame in zip(data_frames, expected_data_frames):
+        pd.testing.assert_frame_equal(data_frame, expected_data_frame)
+
+def test_when_dimensions_are_pruned_rows_cannot_be_changed():
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+
+    class Order(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+            customer_name = cubista.PullByForeignKey(lambda: Customer, source_field="name", via="customer_id")
+
+    customers = Customer(data_frame=pd.DataFrame({"id": [-1, 1, 2, 4], "name": ["unknown", "Ann", "Bob", "Dora"]}))
+    orders = Order(data_frame=pd.DataFrame({"id": [1, 2], "customer_id": [1, 2]}))
+
+    data_source = cubista.DataSource(tables=[customers, orders], prune_dimensions=True)
+
+    with pytest.raises(cubista.PrunedDataSourceIsNotChangeable):
+        data_source.upsert(Order, pd.DataFrame({"id": [3], "customer_id": [4]}))
+
+    with pytest.raises(cubista.PrunedDataSourceIsNotChangeable):
+        data_source.delete(Customer, [1])
+
+    assert orders.data_frame["id"].tolist() == [1, 2]
+
+def test_when_dimension_is_aggregated_it_is_not_pruned():
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            city = cubista.StringField()
+
+    class Order(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+
+    class CustomersByCity(cubista.AggregatedTable):
+        class Aggregation:
+            source = lambda: Customer
+            sort_by = []
+            group_by = ["city"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            city = cubista.GroupField(source="city")
+            customers_count = cubista.AggregatedField(source="id", aggregate_function="count")
+
+    customers = Customer(data_frame=pd.DataFrame({"id": [-1, 1, 2], "city": ["unknown", "Oslo", "Oslo"]}))
+    orders = Order(data_frame=pd.DataFrame({"id": [1], "customer_id": [1]}))
+    customers_by_city = CustomersByCity()
+
+    _ = cubista.DataSource(tables=[customers, orders, customers_by_city], prune_dimensions=True)
+
+    assert customers.data_frame["id"].tolist() == [-1, 1, 2]
+    assert customers_by_city.data_frame["customers_count"].tolist() == [2, 1]
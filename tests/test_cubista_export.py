@@ -0,0 +1,97 @@
+import pytest
+import datetime
+
+import cubista
+import pandas as pd
+
+def get_data_source():
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+
+    class Sale(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            month = cubista.IntField()
+            customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+            quantity = cubista.IntField(nulls=True)
+            customer_name = cubista.PullByForeignKey(lambda: Customer, source_field="name", via="customer_id")
+
+    customers = Customer(data_frame=pd.DataFrame({"id": [-1, 1, 2], "name": ["unknown", "Ann", "Bob"]}))
+    sales = Sale(data_frame=pd.DataFrame({
+        "id": [1, 2, 3, 4, 5],
+        "month": [2, 1, 2, 1, 2],
+        "customer_id": [1, 2, 3, 1, 2],
+        "quantity": [1.0, None, 3.0, 4.0, 5.0]
+    }))
+
+    return cubista.DataSource(tables=[customers, sales]), Customer, Sale
+
+def test_when_table_is_exported_to_csv_in_chunks_file_equals_whole_table(tmp_path):
+    data_source, _, Sale = get_data_source()
+    path = tmp_path / "sales.csv"
+
+    paths = data_source.tables[Sale].export(path=str(path), format="csv", chunk_rows=2, workers=2)
+    exported_data_frame = pd.read_csv(path, dtype={"quantity": "Int64"})
+
+    assert paths == [str(path)]
+    assert exported_data_frame.columns.tolist() == ["id", "month", "customer_id", "quantity", "customer_name"]
+    assert exported_data_frame["customer_name"].tolist() == ["Ann", "Bob", "unknown", "Ann", "Bob"]
+    assert exported_data_frame["quantity"].tolist() == [1, pd.NA, 3, 4, 5]
+    assert path.read_text().splitlines()[2] == "2,1,2,,Bob"
+
+def test_when_table_is_exported_with_partition_by_each_value_gets_own_directory(tmp_path):
+    data_source, _, Sale = get_data_source()
+
+    paths = data_source.tables[Sale].export(path=str(tmp_path / "sales"), format="csv", chunk_rows=1, partition_by="month")
+
+    assert paths == [str(tmp_path / "sales" / "month=1" / "part-00000.csv"), str(tmp_path / "sales" / "month=2" / "part-00000.csv")]
+    assert pd.read_csv(paths[0])["id"].tolist() == [2, 4]
+    assert pd.read_csv(paths[1])["id"].tolist() == [1, 3, 5]
+    assert "month" not in pd.read_csv(paths[1]).columns
+
+def test_when_data_source_is_exported_every_table_is_written(tmp_path):
+    data_source, Customer, Sale = get_data_source()
+
+    paths = data_source.export_all(directory=str(tmp_path), partition_by={Sale: "month"})
+
+    assert paths[Customer] == [str(tmp_path / "{}.csv".format(cubista.get_table_file_name(Customer)))]
+    assert paths[Customer][0].endswith(".Customer.csv")
+    assert len(paths[Sale]) == 2
+    assert pd.read_csv(paths[Customer][0])["name"].tolist() == ["unknown", "Ann", "Bob"]
+
+def test_when_partition_values_are_dates_or_contain_path_separators_directory_names_are_escaped():
+    assert cubista.get_partition_directory_name(field_name="day", value=datetime.date(2024, 1, 31)) == "day=2024-01-31"
+    assert cubista.get_partition_directory_name(field_name="day", value=pd.Timestamp("2024-01-31")) == "day=2024-01-31"
+    assert cubista.get_partition_directory_name(field_name="time", value=pd.Timestamp("2024-01-31 10:30")) == "time=2024-01-31T10%3A30%3A00"
+    assert cubista.get_partition_directory_name(field_name="path", value="a/b=c") == "path=a%2Fb%3Dc"
+    assert cubista.get_partition_directory_name(field_name="name", value=None) == "name=__HIVE_DEFAULT_PARTITION__"
+
+def test_when_table_is_exported_with_partition_by_date_directories_are_named_by_iso_dates(tmp_path):
+    class Sale(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            day = cubista.DateField()
+
+    sales = Sale(data_frame=pd.DataFrame({"id": [1, 2], "day": pd.to_datetime(["2024-01-31", "2024-02-01"])}))
+
+    paths = sales.export(path=str(tmp_path / "sales"), format="csv", partition_by="day")
+
+    assert paths == [
+        str(tmp_path / "sales" / "day=2024-01-31" / "part-00000.csv"),
+        str(tmp_path / "sales" / "day=2024-02-01" / "part-00000.csv")
+    ]
+
+def test_when_export_format_is_unknown_raises_exception(tmp_path):
+    data_source, Customer, _ = get_data_source()
+
+    with pytest.raises(cubista.UnknownExportFormat):
+        data_source.tables[Customer].export(path=str(tmp_path / "customers.xlsx"), format="xlsx")
+
+def test_when_pyarrow_is_not_installed_parquet_export_raises_exception(tmp_path, monkeypatch):
+    data_source, Customer, _ = get_data_source()
+    monkeypatch.setattr(cubista, "is_parquet_available", lambda: False)
+
+    with pytest.raises(cubista.ExportFormatIsNotAvailable):
+        data_source.tables[Customer].export(path=str(tmp_path / "customers.parquet"), format="parquet")
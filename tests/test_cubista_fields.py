@@ -441,6 +441,35 @@ def test_when_field_has_date_type_and_requires_unique_but_value_repeats_raises_e
     with pytest.raises(cubista.NonUniqueValuesFound):
         _ = Table(data_frame=data_frame)
 
+def test_when_field_has_date_type_and_data_frame_has_datetime64_data_type_keeps_data_type():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.DateField(nulls=True)
+            pk = cubista.IntField(primary_key=True, unique=True)
+
+    data = {
+        "id": pd.to_datetime(["2021-01-01", None]).astype("datetime64[s]"),
+        "pk": [1, 2]
+    }
+
+    table = Table(data_frame=pd.DataFrame(data))
+
+    assert table.data_frame["id"].dtype == "datetime64[s]"
+
+def test_when_field_has_int_type_but_data_frame_has_datetime64_data_type_raises_exception():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+
+    data_frame = pd.DataFrame({"id": pd.to_datetime(["2021-01-01"])})
+
+    with pytest.raises(cubista.FieldTypeMismatch):
+        _ = Table(data_frame=data_frame)
+
+def test_when_date_part_field_has_unknown_part_raises_exception():
+    with pytest.raises(cubista.UnknownDatePart):
+        _ = cubista.DatePartField(source="date", part="century")
+
 def test_when_field_has_date_type_and_primary_key_and_not_unique_raises_exception():
     with pytest.raises(cubista.PrimaryKeyMustBeUnique):
         class _(cubista.Table):
@@ -460,4 +489,83 @@ def test_when_field_has_auto_increment_primary_key_type_it_has_attribute_primary
 
     table = Table()
 
-    assert table.Fields.id.primary_key == True
\ No newline at end of file
+    assert table.Fields.id.primary_key == True
+
+def test_when_aggregated_field_has_unknown_engine_raises_exception():
+    with pytest.raises(cubista.UnknownAggregateEngine):
+        _ = cubista.AggregatedField(source="value", aggregate_function="sum", engine="unknown")
+
+def test_when_foreign_key_has_unknown_join_type_raises_exception():
+    with pytest.raises(cubista.UnknownJoinType):
+        _ = cubista.ForeignKey(lambda: None, default=-1, how="outer")
+
+def test_when_window_field_has_unknown_function_raises_exception():
+    with pytest.raises(cubista.UnknownWindowFunction):
+        _ = cubista.WindowField(source="value", function="median", partition_by=["store"])
+
+def test_when_window_field_has_running_frame_and_partition_only_function_raises_exception():
+    with pytest.raises(cubista.UnknownWindowFunction):
+        _ = cubista.WindowField(source="value", function="first", partition_by=["store"], order_by=["day"])
+
+def test_when_window_field_has_unknown_frame_raises_exception():
+    with pytest.raises(cubista.UnknownWindowFrame):
+        _ = cubista.WindowField(source="value", function="sum", partition_by=["store"], frame=0)
+
+def test_when_foreign_key_references_nowhere_default_position_is_looked_up_once(monkeypatch):
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+
+    class Order(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+            customer_name = cubista.PullByForeignKey(lambda: Customer, source_field="name", via="customer_id")
+
+    lookup_rows_counts = []
+    get_referenced_positions = cubista.get_referenced_positions
+
+    def counting_get_referenced_positions(data_frame, field_names, referenced_data_frame, referenced_field_names):
+        lookup_rows_counts.append(len(data_frame))
+
+        return get_referenced_positions(
+            data_frame=data_frame,
+            field_names=field_names,
+            referenced_data_frame=referenced_data_frame,
+            referenced_field_names=referenced_field_names
+        )
+
+    monkeypatch.setattr(cubista, "get_referenced_positions", counting_get_referenced_positions)
+
+    customers = Customer(data_frame=pd.DataFrame({"id": [-1, 1], "name": ["unknown", "Ann"]}))
+    orders = Order(data_frame=pd.DataFrame({"id": [1, 2, 3], "customer_id": [1, 2, 3]}))
+
+    _ = cubista.DataSource(tables=[customers, orders])
+
+    assert lookup_rows_counts == [3, 1]
+    assert orders.data_frame["customer_id"].tolist() == [1, -1, -1]
+    assert orders.data_frame["customer_name"].tolist() == ["Ann", "unknown", "unknown"]
+
+def test_when_pull_by_foreign_key_is_via_field_that_is_not_foreign_key_to_same_table_raises_exception():
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+
+    class Region(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+
+    class Order(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            region_id = cubista.ForeignKey(lambda: Region, default=-1)
+            customer_name = cubista.PullByForeignKey(lambda: Customer, source_field="name", via="region_id")
+
+    customers = Customer(data_frame=pd.DataFrame({"id": [1], "name": ["Ann"]}))
+    regions = Region(data_frame=pd.DataFrame({"id": [-1, 1]}))
+    orders = Order(data_frame=pd.DataFrame({"id": [1], "region_id": [1]}))
+
+    with pytest.raises(cubista.ForeignKeyDoesNotMatch):
+        _ = cubista.DataSource(tables=[customers, regions, orders])
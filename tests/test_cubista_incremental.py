@@ -0,0 +1,163 @@
+import pytest
+
+import cubista
+import pandas as pd
+
+def get_tables(customers_data_frame, orders_data_frame):
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+
+    class Order(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+            customer_name = cubista.PullByForeignKey(lambda: Customer, source_field="name", via="customer_id")
+            amount = cubista.FloatField()
+            double_amount = cubista.CalculatedField(lambda_expression=lambda x: x["amount"] * 2, source_fields=["amount"])
+
+    class OrdersByCustomer(cubista.AggregatedTable):
+        class Aggregation:
+            source = lambda: Order
+            sort_by = ["customer_name"]
+            group_by = ["customer_name"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            customer_name = cubista.GroupField(source="customer_name")
+            amount = cubista.AggregatedField(source="amount", aggregate_function="sum")
+
+    customers = Customer(data_frame=customers_data_frame.copy())
+    orders = Order(data_frame=orders_data_frame.copy())
+
+    return cubista.DataSource(tables=[customers, orders, OrdersByCustomer()]), Customer, Order, OrdersByCustomer
+
+def get_data_frames():
+    customers_data_frame = pd.DataFrame({"id": [-1, 1, 2], "name": ["unknown", "Ann", "Bob"]})
+    orders_data_frame = pd.DataFrame({"id": [1, 2, 3], "customer_id": [1, 2, 1], "amount": [1.0, 2.0, 3.0]})
+
+    return customers_data_frame, orders_data_frame
+
+def assert_matches_rebuild(data_source, customer_type, order_type, aggregated_type):
+    customers_data_frame = data_source.tables[customer_type].data_frame[["id", "name"]].reset_index(drop=True)
+    orders_data_frame = data_source.tables[order_type].data_frame[["id", "customer_id", "amount"]].reset_index(drop=True)
+    rebuilt_data_source, rebuilt_customer_type, rebuilt_order_type, rebuilt_aggregated_type = get_tables(customers_data_frame, orders_data_frame)
+
+    pd.testing.assert_frame_equal(
+        data_source.tables[order_type].data_frame.reset_index(drop=True),
+        rebuilt_data_source.tables[rebuilt_order_type].data_frame.reset_index(drop=True)
+    )
+    pd.testing.assert_frame_equal(
+        data_source.tables[aggregated_type].data_frame[["customer_name", "amount"]],
+        rebuilt_data_source.tables[rebuilt_aggregated_type].data_frame[["customer_name", "amount"]]
+    )
+
+def test_when_dimension_row_is_upserted_pulled_values_and_affected_groups_are_recomputed():
+    data_source, Customer, Order, OrdersByCustomer = get_tables(*get_data_frames())
+    bob_group_id = data_source.tables[OrdersByCustomer].data_frame.set_index("customer_name").loc["Bob", "id"]
+
+    data_source.upsert(Customer, pd.DataFrame({"id": [1, 3], "name": ["Anna", "Cid"]}))
+
+    assert data_source.tables[Order].data_frame["customer_name"].tolist() == ["Anna", "Bob", "Anna"]
+    assert data_source.tables[OrdersByCustomer].data_frame["customer_name"].tolist() == ["Anna", "Bob"]
+    assert data_source.tables[OrdersByCustomer].data_frame.set_index("customer_name").loc["Bob", "id"] == bob_group_id
+    assert_matches_rebuild(data_source, Customer, Order, OrdersByCustomer)
+
+def test_when_fact_rows_are_upserted_and_deleted_aggregated_groups_follow():
+    data_source, Customer, Order, OrdersByCustomer = get_tables(*get_data_frames())
+
+    data_source.upsert(Order, pd.DataFrame({"id": [2, 4], "customer_id": [1, 5], "amount": [10.0, 4.0]}))
+
+    assert data_source.tables[Order].data_frame["customer_id"].tolist() == [1, 1, 1, -1]
+    assert data_source.tables[Order].data_frame["double_amount"].tolist() == [2.0, 20.0, 6.0, 8.0]
+    assert data_source.tables[OrdersByCustomer].data_frame["customer_name"].tolist() == ["Ann", "unknown"]
+    assert_matches_rebuild(data_source, Customer, Order, OrdersByCustomer)
+
+    data_source.delete(Order, [4])
+
+    assert data_source.tables[OrdersByCustomer].data_frame["customer_name"].tolist() == ["Ann"]
+    assert_matches_rebuild(data_source, Customer, Order, OrdersByCustomer)
+
+def test_when_referenced_dimension_row_is_deleted_foreign_keys_are_repaired():
+    data_source, Customer, Order, OrdersByCustomer = get_tables(*get_data_frames())
+
+    data_source.delete(Customer, [2])
+
+    assert data_source.tables[Order].data_frame["customer_id"].tolist() == [1, -1, 1]
+    assert data_source.tables[Order].data_frame["customer_name"].tolist() == ["Ann", "unknown", "Ann"]
+    assert_matches_rebuild(data_source, Customer, Order, OrdersByCustomer)
+
+def test_when_aggregated_table_rows_are_deleted_raises_exception():
+    data_source, Customer, Order, OrdersByCustomer = get_tables(*get_data_frames())
+
+    with pytest.raises(cubista.TableIsNotChangeable):
+        data_source.delete(OrdersByCustomer, [-2])
+
+def test_when_fact_rows_are_upserted_top_n_groups_are_selected_again():
+    class Order(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            customer_name = cubista.StringField()
+            amount = cubista.FloatField()
+
+    class TopCustomer(cubista.AggregatedTable):
+        class Aggregation:
+            source = lambda: Order
+            sort_by = []
+            group_by = ["customer_name"]
+            top_n = 1
+            top_n_by = "amount"
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            customer_name = cubista.GroupField(source="customer_name")
+            amount = cubista.AggregatedField(source="amount", aggregate_function="sum")
+
+    orders = Order(data_frame=pd.DataFrame({"id": [1, 2, 3], "customer_name": ["Ann", "Bob", "Ann"], "amount": [1.0, 2.0, 3.0]}))
+    top_customer = TopCustomer()
+    data_source = cubista.DataSource(tables=[orders, top_customer])
+
+    assert top_customer.data_frame["customer_name"].tolist() == ["Ann"]
+
+    data_source.upsert(Order, pd.DataFrame({"id": [2], "customer_name": ["Bob"], "amount": [10.0]}))
+
+    assert top_customer.data_frame["customer_name"].tolist() == ["Bob"]
+    assert top_customer.data_frame["amount"].tolist() == [10.0]
+
+def test_when_aggregate_is_pulled_back_into_referenced_table_changes_propagate_until_fixpoint():
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+            total = cubista.PullByForeignKey(lambda: OrdersByCustomer, source_field="amount", on=["id"], referenced_on=["customer_id"])
+
+    class Order(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+            amount = cubista.FloatField()
+
+    class OrdersByCustomer(cubista.AggregatedTable):
+        class Aggregation:
+            source = lambda: Order
+            sort_by = []
+            group_by = ["customer_id"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            customer_id = cubista.GroupField(source="customer_id")
+            amount = cubista.AggregatedField(source="amount", aggregate_function="sum")
+
+    customers = Customer(data_frame=pd.DataFrame({"id": [-1, 1, 2], "name": ["unknown", "Ann", "Bob"]}))
+    orders = Order(data_frame=pd.DataFrame({"id": [1, 2], "customer_id": [1, 2], "amount": [1.0, 2.0]}))
+    data_source = cubista.DataSource(tables=[customers, orders, OrdersByCustomer()])
+
+    data_source.upsert(Order, pd.DataFrame({"id": [3], "customer_id": [1], "amount": [5.0]}))
+
+    assert customers.data_frame["total"].tolist()[1:] == [6.0, 2.0]
+
+    data_source.delete(Order, [2])
+
+    assert customers.data_frame["total"].tolist()[1] == 6.0
+    assert pd.isna(customers.data_frame["total"].tolist()[2])
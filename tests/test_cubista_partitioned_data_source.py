@@ -0,0 +1,347 @@
+import pytest
+import asyncio
+
+import cubista
+import pandas as pd
+
+class Customer(cubista.Table):
+    class Fields:
+        id = cubista.IntField(primary_key=True, unique=True)
+        name = cubista.StringField()
+
+class Sale(cubista.Table):
+    class Fields:
+        id = cubista.IntField(primary_key=True, unique=True)
+        month = cubista.IntField()
+        customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+        value = cubista.FloatField()
+        double_value = cubista.CalculatedField(lambda x: x["value"] * 2, source_fields=["value"])
+
+class SalesByCustomer(cubista.AggregatedTable):
+    class Aggregation:
+        source: cubista.Table = lambda: Sale
+        sort_by = ["id"]
+        group_by = ["customer_id"]
+
+    class Fields:
+        id = cubista.AutoIncrementPrimaryKeyField()
+        customer_id = cubista.GroupField(source="customer_id")
+        value_sum = cubista.AggregatedField(source="double_value", aggregate_function="sum")
+        sales_count = cubista.AggregatedField(source="id", aggregate_function="count")
+
+class SalesByMonth(cubista.AggregatedTable):
+    class Aggregation:
+        source: cubista.Table = lambda: Sale
+        sort_by = ["id"]
+        group_by = ["month"]
+
+    class Fields:
+        id = cubista.AutoIncrementPrimaryKeyField()
+        month = cubista.GroupField(source="month")
+        value_mean = cubista.AggregatedField(source="value", aggregate_function="mean")
+
+class SalesMean(cubista.AggregatedTable):
+    class Aggregation:
+        source: cubista.Table = lambda: Sale
+        sort_by = ["id"]
+        group_by = ["customer_id"]
+
+    class Fields:
+        id = cubista.AutoIncrementPrimaryKeyField()
+        customer_id = cubista.GroupField(source="customer_id")
+        value_mean = cubista.AggregatedField(source="value", aggregate_function="mean")
+
+def create_tables():
+    customers = {
+        "id": [1, 2, 3],
+        "name": ["one", "two", "three"]
+    }
+    sales = {
+        "id": [10, 11, 12, 13, 14, 15],
+        "month": [1, 2, 1, 3, 2, 3],
+        "customer_id": [1, 2, 3, 4, 1, 2],
+        "value": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    }
+
+    return [
+        Customer(data_frame=pd.DataFrame(customers)),
+        Sale(data_frame=pd.DataFrame(sales)),
+        SalesByCustomer(),
+        SalesByMonth(),
+        SalesMean()
+    ]
+
+def evaluate_data_frames(data_source_factory):
+    tables = create_tables()
+    _ = data_source_factory(tables)
+
+    return [table.data_frame for table in tables]
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_when_partitioned_data_source_is_created_tables_are_equal_to_data_source_tables(workers):
+    expected_data_frames = evaluate_data_frames(lambda tables: cubista.DataSource(tables=tables))
+    data_frames = evaluate_data_frames(lambda tables: cubista.PartitionedDataSource(
+        tables=tables,
+        partition_by={Sale: "month"},
+        workers=workers,
+        shards_count=3
+    ))
+
+    for data_frame, expected_data_frame in zip(data_frames, expected_data_frames):
+        pd.testing.assert_frame_equal(data_frame, expected_data_frame)
+
+def test_when_partitioned_data_source_is_built_asynchronously_tables_are_equal_to_data_source_tables():
+    expected_data_frames = evaluate_data_frames(lambda tables: cubista.DataSource(tables=tables))
+    data_frames = evaluate_data_frames(lambda tables: asyncio.run(cubista.PartitionedDataSource.build_async(
+        tables=tables,
+        partition_by={Sale: "month"},
+        workers=1
+    )))
+
+    for data_frame, expected_data_frame in zip(data_frames, expected_data_frames):
+        pd.testing.assert_frame_equal(data_frame, expected_data_frame)
+
+def test_when_partitioned_data_source_is_created_tables_know_their_data_source():
+    tables = create_tables()
+
+    data_source = cubista.PartitionedDataSource(tables=tables, partition_by={Sale: "month"}, workers=1)
+
+    assert all(table.data_source == data_source for table in tables)
+    assert tables[1].data_frame["customer_id"].tolist() == [1, 2, 3, -1, 1, 2]
+
+def test_when_window_field_spans_shards_it_is_evaluated_after_merge():
+    class Purchase(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            month = cubista.IntField()
+            customer_id = cubista.IntField()
+            value = cubista.FloatField()
+            month_value = cubista.WindowField(source="value", function="sum", partition_by=["month"])
+            customer_balance = cubista.WindowField(source="value", function="sum", partition_by=["customer_id"], order_by=["month", "id"])
+            customer_share = cubista.CalculatedField(lambda x: x["value"] / x["customer_balance"], source_fields=["value", "customer_balance"])
+
+    class PurchasesByCustomer(cubista.AggregatedTable):
+        class Aggregation:
+            source: cubista.Table = lambda: Purchase
+            sort_by = ["id"]
+            group_by = ["customer_id"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            customer_id = cubista.GroupField(source="customer_id")
+            customer_share_max = cubista.AggregatedField(source="customer_share", aggregate_function="max")
+
+    def evaluate_window_data_frames(data_source_factory):
+        purchases = Purchase(data_frame=pd.DataFrame({
+            "id": [10, 11, 12, 13, 14, 15],
+            "month": [1, 2, 1, 3, 2, 3],
+            "customer_id": [1, 2, 3, 1, 1, 2],
+            "value": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+        }))
+        purchases_by_customer = PurchasesByCustomer()
+        _ = data_source_factory([purchases, purchases_by_customer])
+
+        return [purchases.data_frame, purchases_by_customer.data_frame]
+
+    expected_data_frames = evaluate_window_data_frames(lambda tables: cubista.DataSource(tables=tables))
+    data_frames = evaluate_window_data_frames(lambda tables: cubista.PartitionedDataSource(
+        tables=tables,
+        partition_by={Purchase: "month"},
+        workers=1,
+        shards_count=3
+    ))
+
+    for data_frame, expected_data_frame in zip(data_frames, expected_data_frames):
+        pd.testing.assert_frame_equal(data_frame, expected_data_frame, check_like=True)
+
+def test_when_aggregation_is_filtered_partitioned_data_source_selects_groups_after_merge():
+    class TopCustomers(cubista.AggregatedTable):
+        class Aggregation:
+            source: cubista.Table = lambda: Sale
+            sort_by = ["id"]
+            group_by = ["customer_id"]
+            where = [("value", ">", 1.0)]
+            having = [("sales_count", ">=", 1)]
+            top_n = 2
+            top_n_by = "value_sum"
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            customer_id = cubista.GroupField(source="customer_id")
+            value_sum = cubista.AggregatedField(source="value", aggregate_function="sum")
+            sales_count = cubista.AggregatedField(source="id", aggregate_function="count")
+
+    def evaluate_top_customers(data_source_factory):
+        tables = create_tables()[:2] + [TopCustomers()]
+        _ = data_source_factory(tables)
+
+        return tables[2].data_frame
+
+    expected_data_frame = evaluate_top_customers(lambda tables: cubista.DataSource(tables=tables))
+    data_frame = evaluate_top_customers(lambda tables: cubista.PartitionedDataSource(
+        tables=tables,
+        partition_by={Sale: "month"},
+        workers=1,
+        shards_count=3
+    ))
+
+    assert expected_data_frame["customer_id"].tolist() == [1, 2]
+    pd.testing.assert_frame_equal(data_frame, expected_data_frame)
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_when_partition_field_is_bucketed_partial_aggregates_of_one_bucket_are_merged(workers):
+    class DailySale(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            day = cubista.DateField()
+            value = cubista.FloatField()
+
+    class SalesByMonth(cubista.AggregatedTable):
+        class Aggregation:
+            source: cubista.Table = lambda: DailySale
+            sort_by = ["id"]
+            group_by = ["day"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            month = cubista.GroupField(source="day", bucket="month")
+            value_sum = cubista.AggregatedField(source="value", aggregate_function="sum")
+
+    def evaluate_sales_by_month(data_source_factory):
+        sales = DailySale(data_frame=pd.DataFrame({
+            "id": [1, 2, 3, 4],
+            "day": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03", "2024-02-01"]),
+            "value": [1.0, 2.0, 3.0, 4.0]
+        }))
+        sales_by_month = SalesByMonth()
+        _ = data_source_factory([sales, sales_by_month])
+
+        return sales_by_month.data_frame
+
+    expected_data_frame = evaluate_sales_by_month(lambda tables: cubista.DataSource(tables=tables))
+    data_frame = evaluate_sales_by_month(lambda tables: cubista.PartitionedDataSource(
+        tables=tables,
+        partition_by={DailySale: "day"},
+        workers=workers,
+        shards_count=2
+    ))
+
+    assert expected_data_frame["value_sum"].tolist() == [6.0, 4.0]
+    pd.testing.assert_frame_equal(data_frame, expected_data_frame)
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_when_dimension_pulls_deferred_aggregate_it_is_evaluated_after_merge(workers):
+    class Client(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            total = cubista.PullByForeignKey(lambda: PurchasesByClient, source_field="value_sum", on=["id"], referenced_on=["client_id"])
+
+    class Purchase(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            month = cubista.IntField()
+            client_id = cubista.ForeignKey(lambda: Client, default=-1)
+            value = cubista.FloatField()
+
+    class PurchasesByClient(cubista.AggregatedTable):
+        class Aggregation:
+            source: cubista.Table = lambda: Purchase
+            sort_by = ["id"]
+            group_by = ["client_id"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            client_id = cubista.GroupField(source="client_id")
+            value_sum = cubista.AggregatedField(source="value", aggregate_function="sum")
+
+    def evaluate_clients(data_source_factory):
+        clients = Client(data_frame=pd.DataFrame({"id": [-1, 1, 2]}))
+        purchases = Purchase(data_frame=pd.DataFrame({
+            "id": [1, 2, 3, 4],
+            "month": [1, 2, 1, 2],
+            "client_id": [1, 2, 1, 2],
+            "value": [1.0, 2.0, 3.0, 4.0]
+        }))
+        _ = data_source_factory([clients, purchases, PurchasesByClient()])
+
+        return clients.data_frame
+
+    expected_data_frame = evaluate_clients(lambda tables: cubista.DataSource(tables=tables))
+    data_frame = evaluate_clients(lambda tables: cubista.PartitionedDataSource(
+        tables=tables,
+        partition_by={Purchase: "month"},
+        workers=workers,
+        shards_count=2
+    ))
+
+    assert expected_data_frame["total"].tolist()[1:] == [4.0, 6.0]
+    pd.testing.assert_frame_equal(data_frame, expected_data_frame)
+
+def test_when_partitioned_table_references_other_partitioned_table_references_are_checked_on_full_frame():
+    class Purchase(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            month = cubista.IntField()
+            value = cubista.FloatField()
+
+    class Refund(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            month = cubista.IntField()
+            purchase_id = cubista.ForeignKey(lambda: Purchase, default=-1)
+            purchase_value = cubista.PullByForeignKey(lambda: Purchase, source_field="value", via="purchase_id")
+
+    def evaluate_refunds(data_source_factory):
+        purchases = Purchase(data_frame=pd.DataFrame({"id": [-1, 1, 2], "month": [1, 1, 2], "value": [0.0, 1.0, 2.0]}))
+        refunds = Refund(data_frame=pd.DataFrame({"id": [1, 2], "month": [2, 3], "purchase_id": [1, 2]}))
+        _ = data_source_factory([purchases, refunds])
+
+        return refunds.data_frame
+
+    expected_data_frame = evaluate_refunds(lambda tables: cubista.DataSource(tables=tables))
+    data_frame = evaluate_refunds(lambda tables: cubista.PartitionedDataSource(
+        tables=tables,
+        partition_by={Purchase: "month", Refund: "month"},
+        workers=1,
+        shards_count=3
+    ))
+
+    assert expected_data_frame["purchase_value"].tolist() == [1.0, 2.0]
+    pd.testing.assert_frame_equal(data_frame, expected_data_frame)
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_when_inner_pull_drops_rows_partitioned_data_source_reassembles_surviving_rows(workers):
+    class Price(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            product = cubista.IntField()
+            price = cubista.FloatField()
+
+    class Purchase(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            month = cubista.IntField()
+            product = cubista.IntField()
+            price = cubista.PullByForeignKey(lambda: Price, source_field="price", on=["product"], how="inner")
+
+    def evaluate_purchases(data_source_factory):
+        prices = Price(data_frame=pd.DataFrame({"id": [1, 2], "product": [1, 2], "price": [10.0, 20.0]}))
+        purchases = Purchase(data_frame=pd.DataFrame({
+            "id": [1, 2, 3, 4, 5, 6],
+            "month": [1, 2, 1, 2, 3, 3],
+            "product": [1, 3, 2, 2, 3, 1]
+        }))
+        _ = data_source_factory([prices, purchases])
+
+        return purchases.data_frame
+
+    expected_data_frame = evaluate_purchases(lambda tables: cubista.DataSource(tables=tables))
+    data_frame = evaluate_purchases(lambda tables: cubista.PartitionedDataSource(
+        tables=tables,
+        partition_by={Purchase: "month"},
+        workers=workers,
+        shards_count=2
+    ))
+
+    assert expected_data_frame["id"].tolist() == [1, 3, 4, 6]
+    pd.testing.assert_frame_equal(data_frame, expected_data_frame)
@@ -0,0 +1,156 @@
+import pytest
+
+import cubista
+import pandas as pd
+
+def create_tables(calls):
+    def count_call(name, value):
+        calls.append(name)
+        return value
+
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+            name_length = cubista.CalculatedField(lambda x: count_call("name_length", len(x["name"])), source_fields=["name"])
+
+    class Sale(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            region = cubista.StringField()
+            customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+            value = cubista.FloatField()
+            double_value = cubista.CalculatedField(lambda x: count_call("double_value", x["value"] * 2), source_fields=["value"])
+            triple_value = cubista.CalculatedField(lambda x: count_call("triple_value", x["value"] * 3), source_fields=["value"])
+
+    class SalesByRegion(cubista.AggregatedTable):
+        class Aggregation:
+            source: cubista.Table = lambda: Sale
+            sort_by = ["id"]
+            group_by = ["region"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            region = cubista.GroupField(source="region")
+            value_sum = cubista.AggregatedField(source="double_value", aggregate_function="sum")
+
+    customers = {
+        "id": [1, 2],
+        "name": ["one", "two"]
+    }
+    sales = {
+        "id": [1, 2, 3, 4],
+        "region": ["north", "south", "north", "east"],
+        "customer_id": [1, 2, 5, 1],
+        "value": [1.0, 2.0, 3.0, 4.0]
+    }
+
+    return [
+        Customer(data_frame=pd.DataFrame(customers)),
+        Sale(data_frame=pd.DataFrame(sales)),
+        SalesByRegion()
+    ]
+
+def test_when_data_source_is_evaluated_query_filters_and_selects_fields():
+    calls = []
+    customer, sale, sales_by_region = create_tables(calls=calls)
+    data_source = cubista.DataSource(tables=[customer, sale, sales_by_region])
+
+    result = data_source.query(type(sale)).where("double_value", ">", 3.0).where("region", "in", ["north", "east"]).select("id", "customer_id").execute()
+
+    assert result["id"].tolist() == [3, 4]
+    assert result["customer_id"].tolist() == [-1, 1]
+
+def test_when_data_source_is_lazy_stored_field_predicates_are_pushed_down_before_evaluation():
+    calls = []
+    customer, sale, sales_by_region = create_tables(calls=calls)
+    data_source = cubista.DataSource(tables=[customer, sale, sales_by_region], lazy=True)
+
+    result = data_source.query(type(sale)).where("region", "==", "north").select("id", "customer_id", "double_value").execute()
+
+    assert result["id"].tolist() == [1, 3]
+    assert result["customer_id"].tolist() == [1, -1]
+    assert result["double_value"].tolist() == [2.0, 6.0]
+    assert calls == ["double_value", "double_value"]
+
+def test_when_data_source_is_lazy_group_predicates_are_pushed_down_to_aggregation_source():
+    calls = []
+    customer, sale, sales_by_region = create_tables(calls=calls)
+    data_source = cubista.DataSource(tables=[customer, sale, sales_by_region], lazy=True)
+
+    result = data_source.query(type(sales_by_region)).where("region", "!=", "south").where("value_sum", ">", 5.0).select("region", "value_sum").execute()
+
+    assert result["region"].tolist() == ["east", "north"]
+    assert result["value_sum"].tolist() == [8.0, 8.0]
+    assert calls.count("double_value") == 3
+    assert "triple_value" not in calls
+    assert "name_length" not in calls
+
+def test_when_lazy_query_is_executed_tables_are_left_unevaluated():
+    calls = []
+    customer, sale, sales_by_region = create_tables(calls=calls)
+    data_source = cubista.DataSource(tables=[customer, sale, sales_by_region], lazy=True)
+
+    _ = data_source.query(type(sale)).where("region", "==", "north").execute()
+
+    assert sale.data_frame.columns.tolist() == ["id", "region", "customer_id", "value"]
+    assert sale.data_frame["customer_id"].tolist() == [1, 2, 5, 1]
+    assert sales_by_region.data_frame.empty
+
+def test_when_predicate_has_unknown_operator_raises_exception():
+    with pytest.raises(cubista.UnknownPredicateOperator):
+        _ = cubista.Predicate(field_name="id", operator_name="like", value="a")
+
+def test_when_aggregate_is_pulled_back_into_filtered_table_lazy_query_matches_eager_query():
+    def get_tables():
+        class Fact(cubista.Table):
+            class Fields:
+                id = cubista.IntField(primary_key=True, unique=True)
+                store = cubista.StringField()
+                amount = cubista.FloatField()
+                store_total = cubista.PullByForeignKey(lambda: StoreTotal, source_field="amount", on=["store"], referenced_on=["store"])
+
+        class StoreTotal(cubista.AggregatedTable):
+            class Aggregation:
+                source = lambda: Fact
+                sort_by = []
+                group_by = ["store"]
+
+            class Fields:
+                id = cubista.AutoIncrementPrimaryKeyField()
+                store = cubista.GroupField(source="store")
+                amount = cubista.AggregatedField(source="amount", aggregate_function="sum")
+
+        facts = Fact(data_frame=pd.DataFrame({"id": [1, 2, 3], "store": ["a", "a", "a"], "amount": [5.0, 20.0, 30.0]}))
+
+        return [facts, StoreTotal()], Fact
+
+    eager_tables, Fact = get_tables()
+    eager_result = cubista.DataSource(tables=eager_tables).query(Fact).where("amount", ">", 10).select("id", "store_total").execute()
+
+    lazy_tables, Fact = get_tables()
+    lazy_result = cubista.DataSource(tables=lazy_tables, lazy=True).query(Fact).where("amount", ">", 10).select("id", "store_total").execute()
+
+    assert eager_result["store_total"].tolist() == [55.0, 55.0]
+    pd.testing.assert_frame_equal(lazy_result.reset_index(drop=True), eager_result.reset_index(drop=True))
+
+def test_when_table_has_window_fields_lazy_query_matches_eager_query():
+    def get_tables():
+        class Sale(cubista.Table):
+            class Fields:
+                id = cubista.IntField(primary_key=True, unique=True)
+                day = cubista.IntField()
+                amount = cubista.FloatField()
+                running_amount = cubista.WindowField(source="amount", function="sum", partition_by=[], order_by=["day"])
+                total_amount = cubista.WindowField(source="amount", function="sum")
+
+        return [Sale(data_frame=pd.DataFrame({"id": [1, 2, 3], "day": [1, 2, 3], "amount": [5.0, 20.0, 30.0]}))], Sale
+
+    eager_tables, Sale = get_tables()
+    eager_result = cubista.DataSource(tables=eager_tables).query(Sale).where("amount", ">", 10).select("id", "running_amount", "total_amount").execute()
+
+    lazy_tables, Sale = get_tables()
+    lazy_result = cubista.DataSource(tables=lazy_tables, lazy=True).query(Sale).where("amount", ">", 10).select("id", "running_amount", "total_amount").execute()
+
+    assert eager_result["running_amount"].tolist() == [25.0, 55.0]
+    pd.testing.assert_frame_equal(lazy_result.reset_index(drop=True), eager_result.reset_index(drop=True))
@@ -0,0 +1,123 @@
+import asyncio
+import subprocess
+import sys
+
+import pytest
+
+import cubista
+import pandas as pd
+
+def get_tables():
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+            name_length = cubista.CalculatedField(lambda_expression=lambda x: len(x["name"]), source_fields=["name"])
+
+    class Order(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+            customer_name_length = cubista.PullByForeignKey(lambda: Customer, source_field="name_length", via="customer_id")
+
+    customers = Customer(data_frame=pd.DataFrame({"id": [1, 2], "name": ["Ann", "Robert"]}))
+    orders = Order(data_frame=pd.DataFrame({"id": [1, 2], "customer_id": [2, 1]}))
+
+    return [orders, customers]
+
+def test_when_schema_plan_is_compiled_dependencies_precede_dependent_fields():
+    data_source = cubista.DataSource(tables=get_tables(), lazy=True)
+
+    plan = cubista.compile_schema_plan(data_source=data_source)
+    field_names = [field_name for _, field_name in plan.evaluation_order]
+
+    assert field_names.index("name_length") < field_names.index("customer_name_length")
+    assert field_names.index("customer_id") < field_names.index("customer_name_length")
+
+def test_when_plan_directory_is_given_plan_is_compiled_once_and_loaded_from_disk(tmp_path, monkeypatch):
+    compilations = []
+    compile_schema_plan = cubista.compile_schema_plan
+
+    def counting_compile_schema_plan(data_source):
+        compilations.append(data_source)
+        return compile_schema_plan(data_source=data_source)
+
+    monkeypatch.setattr(cubista, "compile_schema_plan", counting_compile_schema_plan)
+
+    first_data_source = cubista.DataSource(tables=get_tables(), plan_directory=str(tmp_path))
+    second_data_source = cubista.DataSource(tables=get_tables(), plan_directory=str(tmp_path))
+
+    assert len(compilations) == 1
+    assert len(list(tmp_path.glob("schema-plan-*"))) == 1
+    assert first_data_source.plan == second_data_source.plan
+    assert list(second_data_source.tables.values())[0].data_frame["customer_name_length"].tolist() == [6, 3]
+
+def test_when_data_source_is_built_asynchronously_plan_directory_is_used(tmp_path):
+    first_data_source = cubista.DataSource(tables=get_tables(), plan_directory=str(tmp_path))
+    second_data_source = asyncio.run(cubista.DataSource.build_async(tables=get_tables(), plan_directory=str(tmp_path)))
+
+    assert second_data_source.plan == first_data_source.plan
+    assert list(second_data_source.tables.values())[0].data_frame["customer_name_length"].tolist() == [6, 3]
+
+def test_when_plan_is_compiled_for_other_tables_raises_exception():
+    class Table1(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+
+    plan = cubista.compile_schema_plan(data_source=cubista.DataSource(tables=get_tables(), lazy=True))
+    table1 = Table1(data_frame=pd.DataFrame({"id": [1]}))
+
+    with pytest.raises(cubista.SchemaPlanDoesNotMatch):
+        _ = cubista.DataSource(tables=[table1], plan=plan)
+
+def test_when_plan_is_compiled_for_other_schema_of_same_tables_raises_exception():
+    plan = cubista.compile_schema_plan(data_source=cubista.DataSource(tables=get_tables(), lazy=True))
+
+    with pytest.raises(cubista.SchemaPlanDoesNotMatch):
+        _ = cubista.DataSource(tables=get_tables(), plan=plan._replace(schema_hash="other"))
+
+def test_when_cubista_is_imported_pandas_is_not_imported_until_first_use():
+    code = "import sys, cubista; print('pandas' in sys.modules); cubista.Table; print('pandas' in sys.modules)"
+
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+
+    assert output.split() == ["False", "True"]
+
+def test_when_cubista_name_is_used_only_its_module_is_imported():
+    code = "import sys, cubista; cubista.HotSwapDataSource; print('cubista.hot_swap' in sys.modules, 'cubista.sql_data_source' in sys.modules)"
+
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+
+    assert output.split() == ["True", "False"]
+
+def test_when_cubista_names_are_used_from_many_threads_every_name_is_found():
+    code = "\n".join([
+        "import threading, cubista",
+        "errors = []",
+        "def use(name):",
+        "    try:",
+        "        getattr(cubista, name)",
+        "    except AttributeError as exception:",
+        "        errors.append(exception)",
+        "threads = [threading.Thread(target=use, args=(name,)) for name in ['Table', 'DataSource', 'Query', 'export_table'] * 4]",
+        "_ = [thread.start() for thread in threads]",
+        "_ = [thread.join() for thread in threads]",
+        "print(len(errors))"
+    ])
+
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+
+    assert output.split() == ["0"]
+
+def test_when_plan_directory_is_given_column_statistics_are_not_saved_implicitly(tmp_path):
+    _ = cubista.DataSource(tables=get_tables(), plan_directory=str(tmp_path))
+
+    assert list(tmp_path.glob("statistics-*")) == []
+
+def test_when_statistics_are_saved_they_are_loaded_back(tmp_path):
+    data_source = cubista.DataSource(tables=get_tables())
+    data_source.save_statistics(directory=str(tmp_path))
+    statistics = cubista.load_statistics(data_source=data_source, directory=str(tmp_path))
+    table_type = list(data_source.tables.keys())[0]
+
+    assert statistics[cubista.get_table_type_name(table_type)] == data_source.tables[table_type].get_statistics()
@@ -0,0 +1,129 @@
+import multiprocessing
+
+import pytest
+
+import cubista
+import numpy as np
+import pandas as pd
+
+class Customer(cubista.Table):
+    class Fields:
+        id = cubista.IntField(primary_key=True, unique=True)
+        name = cubista.StringField(nulls=True)
+
+class Sale(cubista.Table):
+    class Fields:
+        id = cubista.IntField(primary_key=True, unique=True)
+        customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+        value = cubista.FloatField()
+
+def create_data_source():
+    customers = {
+        "id": [1, 2, 3],
+        "name": ["one", None, "one"]
+    }
+    sales = {
+        "id": [1, 2],
+        "customer_id": [1, 5],
+        "value": [1.0, 2.0]
+    }
+
+    return cubista.DataSource(tables=[
+        Customer(data_frame=pd.DataFrame(customers)),
+        Sale(data_frame=pd.DataFrame(sales))
+    ])
+
+def test_when_data_source_is_exported_to_shared_memory_attached_tables_have_same_values():
+    data_source = create_data_source()
+    export = cubista.export_data_source_to_shared_memory(data_source)
+
+    try:
+        shared_tables = cubista.attach_shared_tables(export.manifest)
+        customer, sale = shared_tables.tables
+
+        assert isinstance(customer, Customer)
+        assert customer.data_frame["id"].tolist() == [1, 2, 3]
+        assert customer.data_frame["name"].cat.categories.tolist() == ["one"]
+        assert customer.data_frame["name"].tolist()[0] == "one"
+        assert pd.isnull(customer.data_frame["name"].tolist()[1])
+        assert sale.data_frame["customer_id"].tolist() == [1, -1]
+        assert sale.data_frame["value"].tolist() == [1.0, 2.0]
+
+        shared_tables.close()
+    finally:
+        export.close()
+        export.unlink()
+
+def test_when_shared_tables_are_attached_values_are_read_only():
+    data_source = create_data_source()
+    export = cubista.export_data_source_to_shared_memory(data_source)
+
+    try:
+        shared_tables = cubista.attach_shared_tables(export.manifest)
+        _, sale = shared_tables.tables
+
+        with pytest.raises(ValueError):
+            sale.data_frame["value"].to_numpy()[0] = 5.0
+
+        del sale
+        shared_tables.close()
+    finally:
+        export.close()
+        export.unlink()
+
+def test_when_string_column_is_attached_its_codes_share_memory_with_shared_block():
+    data_source = create_data_source()
+    export = cubista.export_data_source_to_shared_memory(data_source)
+
+    try:
+        shared_tables = cubista.attach_shared_tables(export.manifest)
+        customer, _ = shared_tables.tables
+        name_column = [column for column in export.manifest[0].columns if column.name == "name"][0]
+        name_block = [block for block in shared_tables.blocks.blocks if block.name == name_column.shared_memory_name][0]
+        block_values = np.frombuffer(name_block.buf, dtype=np.uint8)
+
+        assert np.shares_memory(customer.data_frame["name"].array.codes, block_values)
+
+        del block_values
+        del customer
+        shared_tables.close()
+    finally:
+        export.close()
+        export.unlink()
+
+def test_when_shared_tables_are_attached_data_source_can_be_created_without_reevaluation():
+    data_source = create_data_source()
+    export = cubista.export_data_source_to_shared_memory(data_source)
+
+    try:
+        shared_tables = cubista.attach_shared_tables(export.manifest)
+        attached_data_source = cubista.DataSource(tables=shared_tables.tables)
+
+        assert attached_data_source.tables[Sale].data_frame["customer_id"].tolist() == [1, -1]
+
+        del attached_data_source
+        shared_tables.close()
+    finally:
+        export.close()
+        export.unlink()
+
+def get_shared_value_sum(manifest):
+    shared_tables = cubista.attach_shared_tables(manifest)
+    _, sale = shared_tables.tables
+    result = float(np.sum(sale.data_frame["value"].to_numpy()))
+    del sale
+    shared_tables.close()
+
+    return result
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="requires fork start method")
+def test_when_shared_tables_are_attached_in_worker_process_values_are_available():
+    data_source = create_data_source()
+    export = cubista.export_data_source_to_shared_memory(data_source)
+
+    try:
+        with multiprocessing.get_context("fork").Pool(processes=1) as pool:
+            assert pool.apply(get_shared_value_sum, (export.manifest,)) == 3.0
+    finally:
+        export.close()
+        export.unlink()
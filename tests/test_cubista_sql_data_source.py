@@ -0,0 +1,162 @@
+import datetime
+import sqlite3
+
+import cubista
+import pandas as pd
+
+def test_when_schema_is_evaluated_in_sql_result_matches_pandas_evaluation():
+    def get_tables():
+        class Customer(cubista.Table):
+            class Fields:
+                id = cubista.IntField(primary_key=True, unique=True)
+                name = cubista.StringField()
+                signup_date = cubista.DateField()
+                is_vip = cubista.BoolField()
+                name_length = cubista.CalculatedField(
+                    lambda_expression=lambda x: len(x["name"]),
+                    source_fields=["name"],
+                    sql_expression="LENGTH(name)"
+                )
+
+        class Order(cubista.Table):
+            class Fields:
+                id = cubista.IntField(primary_key=True, unique=True)
+                customer_id = cubista.ForeignKey(lambda: Customer, default=-1)
+                customer_name = cubista.PullByForeignKey(lambda: Customer, source_field="name", via="customer_id")
+                customer_signup_date = cubista.PullByForeignKey(lambda: Customer, source_field="signup_date", via="customer_id")
+                customer_is_vip = cubista.PullByForeignKey(lambda: Customer, source_field="is_vip", via="customer_id")
+                amount = cubista.FloatField()
+                double_amount = cubista.CalculatedField(lambda_expression=lambda x: x["amount"] * 2, source_fields=["amount"])
+
+        class OrdersByCustomer(cubista.AggregatedTable):
+            class Aggregation:
+                source = lambda: Order
+                sort_by = ["customer_name"]
+                group_by = ["customer_name"]
+
+            class Fields:
+                id = cubista.AutoIncrementPrimaryKeyField()
+                customer_name = cubista.GroupField(source="customer_name")
+                amount = cubista.AggregatedField(source="amount", aggregate_function="sum")
+                orders = cubista.AggregatedField(source="id", aggregate_function="count")
+
+        class OrdersBySignup(cubista.AggregatedTable):
+            class Aggregation:
+                source = lambda: Order
+                sort_by = ["customer_signup_date", "customer_is_vip"]
+                group_by = ["customer_signup_date", "customer_is_vip"]
+
+            class Fields:
+                id = cubista.AutoIncrementPrimaryKeyField()
+                signup_date = cubista.GroupField(source="customer_signup_date")
+                is_vip = cubista.GroupField(source="customer_is_vip")
+                amount = cubista.AggregatedField(source="amount", aggregate_function="sum")
+
+        customers = Customer(data_frame=pd.DataFrame({
+            "id": [-1, 1, 2],
+            "name": ["unknown", "Ann", "Bob"],
+            "signup_date": [datetime.date(2000, 1, 1), datetime.date(2024, 1, 31), datetime.date(2024, 2, 1)],
+            "is_vip": [False, True, False]
+        }))
+        orders = Order(data_frame=pd.DataFrame({
+            "id": [1, 2, 3, 4],
+            "customer_id": [2, 1, 2, 7],
+            "amount": [1.0, 2.0, 3.0, 4.0]
+        }))
+
+        return customers, orders, OrdersByCustomer(), OrdersBySignup()
+
+    pandas_data_source = cubista.DataSource(tables=get_tables())
+    sql_data_source = cubista.SqlDataSource(tables=get_tables(), connection=sqlite3.connect(":memory:"))
+
+    for pandas_table, sql_table in zip(pandas_data_source.tables.values(), sql_data_source.tables.values()):
+        for column_name in ["customer_signup_date", "customer_is_vip", "signup_date", "is_vip"]:
+            if column_name in sql_table.data_frame.columns:
+                assert sql_table.data_frame[column_name].tolist() == pandas_table.data_frame[column_name].tolist()
+                assert sql_table.data_frame[column_name].dtype == pandas_table.data_frame[column_name].dtype
+
+        pd.testing.assert_frame_equal(
+            sql_table.data_frame,
+            pandas_table.data_frame[sql_table.data_frame.columns],
+            check_dtype=False
+        )
+
+def test_when_aggregate_function_is_not_expressible_in_sql_it_is_evaluated_in_pandas():
+    class Sale(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            store = cubista.StringField()
+            amount = cubista.FloatField()
+
+    class SalesByStore(cubista.AggregatedTable):
+        class Aggregation:
+            source = lambda: Sale
+            sort_by = ["store"]
+            group_by = ["store"]
+
+        class Fields:
+            id = cubista.AutoIncrementPrimaryKeyField()
+            store = cubista.GroupField(source="store")
+            amount_range = cubista.AggregatedField(source="amount", aggregate_function=lambda x: x.max() - x.min())
+
+    sales = Sale(data_frame=pd.DataFrame({"id": [1, 2, 3], "store": ["b", "a", "b"], "amount": [1.0, 2.0, 5.0]}))
+
+    data_source = cubista.SqlDataSource(tables=[sales, SalesByStore()])
+    sales_by_store = data_source.tables[SalesByStore].data_frame
+
+    assert sales_by_store["store"].tolist() == ["a", "b"]
+    assert sales_by_store["amount_range"].tolist() == [0.0, 4.0]
+    assert sales_by_store["id"].tolist() == [-2, -3]
+
+def test_when_field_is_evaluated_in_pandas_declared_dates_and_bools_are_restored():
+    class Sale(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            date = cubista.DateField()
+            is_refund = cubista.BoolField()
+            month = cubista.DatePartField(source="date", part="month")
+            refund_label = cubista.CalculatedField(lambda_expression=lambda x: str(x["is_refund"]), source_fields=["is_refund"])
+
+    sales = Sale(data_frame=pd.DataFrame({
+        "id": [1, 2],
+        "date": [datetime.date(2024, 1, 31), datetime.date(2024, 2, 1)],
+        "is_refund": [False, True]
+    }))
+
+    data_source = cubista.SqlDataSource(tables=[sales])
+    data_frame = data_source.tables[Sale].data_frame
+
+    assert data_frame["month"].tolist() == [1, 2]
+    assert data_frame["refund_label"].tolist() == ["False", "True"]
+    assert data_frame["date"].tolist() == [datetime.date(2024, 1, 31), datetime.date(2024, 2, 1)]
+    assert data_frame["is_refund"].dtype == bool
+
+def test_when_aggregated_table_has_no_group_by_sql_aggregates_whole_source():
+    def get_tables():
+        class Sale(cubista.Table):
+            class Fields:
+                id = cubista.IntField(primary_key=True, unique=True)
+                amount = cubista.FloatField()
+
+        class SalesTotal(cubista.AggregatedTable):
+            class Aggregation:
+                source = lambda: Sale
+                sort_by = []
+                group_by = []
+
+            class Fields:
+                id = cubista.AutoIncrementPrimaryKeyField()
+                amount = cubista.AggregatedField(source="amount", aggregate_function="sum")
+                sales = cubista.AggregatedField(source="id", aggregate_function="count")
+
+        return Sale(data_frame=pd.DataFrame({"id": [1, 2, 3], "amount": [1.0, 2.0, 4.0]})), SalesTotal()
+
+    pandas_data_source = cubista.DataSource(tables=get_tables())
+    sql_data_source = cubista.SqlDataSource(tables=get_tables())
+
+    for pandas_table, sql_table in zip(pandas_data_source.tables.values(), sql_data_source.tables.values()):
+        pd.testing.assert_frame_equal(
+            sql_table.data_frame,
+            pandas_table.data_frame[sql_table.data_frame.columns],
+            check_dtype=False
+        )
@@ -1,4 +1,5 @@
 import cubista
+import datetime
 import pandas as pd
 import pytest
 
@@ -76,3 +77,171 @@ def test_when_table_is_created_and_more_than_one_primary_key_specified_raises_ex
 
     with pytest.raises(cubista.MoreThanOnePrimaryKeySpecified):
         _ = TableWithTwoPrimaryKeys(data_frame=data_frame)
+
+def test_when_table_is_created_without_validation_primary_keys_count_is_still_checked():
+    class TableWithoutPrimaryKey(cubista.Table):
+        class Fields:
+            id = cubista.IntField()
+
+    class TableWithTwoPrimaryKeys(cubista.Table):
+        class Fields:
+            pk1 = cubista.IntField(primary_key=True, unique=True)
+            pk2 = cubista.IntField(primary_key=True, unique=True)
+
+    with pytest.raises(cubista.NoPrimaryKeySpecified):
+        _ = TableWithoutPrimaryKey(data_frame=pd.DataFrame({"id": [1, 1]}), validate=False)
+
+    with pytest.raises(cubista.MoreThanOnePrimaryKeySpecified):
+        _ = TableWithTwoPrimaryKeys(data_frame=pd.DataFrame({"pk1": [1, 1], "pk2": ["a", None]}), validate=False)
+
+def test_when_table_is_looked_up_by_primary_key_row_position_is_returned():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+
+    table = Table(data_frame=pd.DataFrame({"id": [30, 10, 20]}))
+
+    assert table.get_row_position_by_primary_key(20) == 2
+    assert table.get_row_position_by_primary_key(40) is None
+    assert table.get_row_positions_by_primary_keys([10, 40, 30]).tolist() == [1, -1, 0]
+
+def test_when_table_is_looked_up_by_foreign_key_all_row_positions_are_returned():
+    class Table1(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+
+    class Table2(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            table1_id = cubista.ForeignKey(lambda: Table1, default=-1)
+
+    table1 = Table1(data_frame=pd.DataFrame({"id": [1, 2]}))
+    table2 = Table2(data_frame=pd.DataFrame({"id": [1, 2, 3, 4], "table1_id": [2, 1, 2, 3]}))
+
+    _ = cubista.DataSource(tables=[table1, table2])
+
+    assert table2.get_row_positions_by_foreign_key("table1_id", 2).tolist() == [0, 2]
+    assert table2.get_row_positions_by_foreign_key("table1_id", -1).tolist() == [3]
+    assert table2.get_row_positions_by_foreign_key("table1_id", 3).tolist() == []
+    assert table2.get_rows(table2.get_row_positions_by_foreign_key("table1_id", 1))["id"].tolist() == [2]
+
+def test_when_table_is_looked_up_by_range_of_sorted_index_row_positions_are_returned():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            date = cubista.DateField(nulls=True, index=True)
+
+    dates = [datetime.date(2021, 1, 3), datetime.date(2021, 1, 1), None, datetime.date(2021, 1, 2)]
+    table = Table(data_frame=pd.DataFrame({"id": [1, 2, 3, 4], "date": dates}))
+
+    positions = table.get_row_positions_in_range("date", low=datetime.date(2021, 1, 2), high=datetime.date(2021, 1, 3))
+    assert positions.tolist() == [3, 0]
+
+    positions = table.get_row_positions_in_range("date", high=datetime.date(2021, 1, 3), include_high=False)
+    assert positions.tolist() == [1, 3]
+
+def test_when_table_is_looked_up_by_not_indexed_field_raises_exception():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            value = cubista.IntField()
+
+    table = Table(data_frame=pd.DataFrame({"id": [1, 2], "value": [1, 2]}))
+
+    with pytest.raises(cubista.FieldIsNotIndexed):
+        _ = table.get_row_positions_in_range("value", low=1)
+
+def test_when_table_data_frame_is_replaced_index_is_rebuilt():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+
+    table = Table(data_frame=pd.DataFrame({"id": [1, 2]}))
+
+    assert table.get_row_position_by_primary_key(2) == 1
+
+    table.data_frame = pd.DataFrame({"id": [2, 1]})
+
+    assert table.get_row_position_by_primary_key(2) == 0
+
+def test_when_table_is_created_without_validation_wrong_data_is_accepted():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+
+    table = Table(data_frame=pd.DataFrame({"id": ["Wrong", "Wrong"]}), validate=False)
+
+    assert table.data_frame["id"].tolist() == ["Wrong", "Wrong"]
+
+def test_when_table_is_created_with_sample_validation_primary_key_uniqueness_is_checked_exactly():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+
+    data_frame = pd.DataFrame({"id": list(range(20000)) + [0]})
+
+    with pytest.raises(cubista.NonUniqueValuesFound):
+        _ = Table(data_frame=data_frame, validate="sample")
+
+def test_when_table_is_created_with_parallel_validation_first_field_error_is_raised():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+            value = cubista.FloatField()
+
+    data_frame = pd.DataFrame({"id": [1, 2], "name": ["one", 2], "value": [1.0, None]})
+
+    with pytest.raises(cubista.FieldTypeMismatch):
+        _ = Table(data_frame=data_frame, validation_workers=3)
+
+def test_when_tables_of_same_type_are_created_validator_is_compiled_once():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+
+    table1 = Table(data_frame=pd.DataFrame({"id": [1]}))
+    table2 = Table(data_frame=pd.DataFrame({"id": [2]}))
+
+    assert cubista.get_table_validator(type(table1)) is cubista.get_table_validator(type(table2))
+
+def test_when_table_is_created_with_unknown_validation_mode_raises_exception():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+
+    with pytest.raises(cubista.UnknownValidationMode):
+        _ = Table(data_frame=pd.DataFrame({"id": [1]}), validate="partial")
+
+def test_when_table_statistics_are_requested_columns_are_described():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField(nulls=True)
+            value = cubista.FloatField()
+
+    table = Table(data_frame=pd.DataFrame({"id": [1, 2, 3, 4], "name": ["a", None, "b", "a"], "value": [3.0, 1.0, 2.0, 2.0]}))
+
+    statistics = table.get_statistics()
+
+    assert statistics["id"] == cubista.ColumnStatistics(
+        rows_count=4, null_count=0, distinct_count=4, min_value=1, max_value=4, is_monotonic_increasing=True
+    )
+    assert statistics["name"].get_null_fraction() == 0.25
+    assert statistics["name"].distinct_count == 2
+    assert not statistics["name"].is_monotonic_increasing
+    assert (statistics["value"].min_value, statistics["value"].max_value) == (1.0, 3.0)
+    assert table.is_sorted_by(["id", "value"])
+    assert not table.is_sorted_by(["value"])
+
+def test_when_table_is_checked_for_single_column_order_statistics_are_not_computed(monkeypatch):
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            value = cubista.FloatField(nulls=True)
+
+    table = Table(data_frame=pd.DataFrame({"id": [1, 2, 3], "value": [1.0, None, 2.0]}))
+    monkeypatch.setattr(cubista, "get_column_statistics", lambda data: pytest.fail("statistics are computed"))
+
+    assert table.is_sorted_by(["id"])
+    assert not table.is_sorted_by(["value"])
@@ -0,0 +1,164 @@
+import pytest
+
+import cubista
+import pandas as pd
+
+def test_when_table_is_validated_report_contains_all_issues_of_table():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+            value = cubista.FloatField()
+
+    data_frame = pd.DataFrame({"id": [1, 1, 2], "name": ["one", 2, 3], "value": [1.0, None, None]})
+    table = Table(data_frame=data_frame, validate=False)
+
+    report = table.validate()
+
+    assert not report.is_valid()
+    assert [(issue.field_name, issue.exception_type, issue.count) for issue in report.issues] == [
+        ("id", cubista.NonUniqueValuesFound, 2),
+        ("name", cubista.FieldTypeMismatch, 2),
+        ("value", cubista.NullsNotAllowed, 2)
+    ]
+    assert report.issues[1].positions.tolist() == [1, 2]
+    assert report.to_data_frame()["error"].tolist() == ["NonUniqueValuesFound", "FieldTypeMismatch", "NullsNotAllowed"]
+
+def test_when_table_is_validated_by_dtype_only_values_of_object_columns_are_not_checked():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+
+    data_frame = pd.DataFrame({"id": [1, 2], "name": ["one", 2]})
+
+    table = Table(data_frame=data_frame, validate="dtype-only")
+
+    assert table.validation_report.is_valid()
+
+def test_when_table_is_validated_by_dtype_only_column_of_wrong_data_type_raises_exception():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            value = cubista.FloatField()
+
+    data_frame = pd.DataFrame({"id": [1, 2], "value": [1, 2]})
+
+    with pytest.raises(cubista.FieldTypeMismatch):
+        _ = Table(data_frame=data_frame, validate=cubista.DtypeOnlyValidation())
+
+def test_when_table_is_validated_by_dtype_only_primary_key_is_checked_exactly():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+
+    with pytest.raises(cubista.NonUniqueValuesFound):
+        _ = Table(data_frame=pd.DataFrame({"id": [1, 2, 1]}), validate="dtype-only")
+
+    with pytest.raises(cubista.NullsNotAllowed):
+        _ = Table(data_frame=pd.DataFrame({"id": [1, 2, None]}), validate="dtype-only")
+
+def test_when_table_is_validated_by_sample_issues_are_found_only_in_sampled_rows():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+
+    names = ["name"] * 1000
+    names[10] = 10
+    data_frame = pd.DataFrame({"id": list(range(1000)), "name": names})
+    table = Table(data_frame=data_frame, validate=False)
+
+    validation_policy = cubista.SampleValidation(fraction=0.1, seed=1)
+    sample_positions = validation_policy.get_sample_positions(rows_count=1000)
+    report = table.validate(validate=validation_policy)
+
+    assert len(sample_positions) == 100
+    assert sample_positions.tolist() == validation_policy.get_sample_positions(rows_count=1000).tolist()
+    assert report.is_valid() == (10 not in sample_positions)
+    assert not table.validate(validate=cubista.SampleValidation(rows=1000)).is_valid()
+
+def test_when_data_source_is_created_with_validation_policy_tables_are_validated():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+
+    table = Table(data_frame=pd.DataFrame({"id": [1, 2], "name": ["one", None]}), validate=False)
+
+    with pytest.raises(cubista.NullsNotAllowed):
+        _ = cubista.DataSource(tables=[table], validation="full")
+
+def test_when_data_source_collects_all_errors_report_contains_issues_of_all_tables():
+    class Customer(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            name = cubista.StringField()
+
+    class Order(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            amount = cubista.FloatField()
+
+    customers = Customer(data_frame=pd.DataFrame({"id": [1, 1], "name": ["one", 2]}), validate=False)
+    orders = Order(data_frame=pd.DataFrame({"id": [1, 2, 3], "amount": [1.0, None, None]}), validate=False)
+
+    with pytest.raises(cubista.ValidationFailed) as exception_info:
+        _ = cubista.DataSource(tables=[customers, orders], validation=True, validation_workers=2, collect_all_errors=True)
+
+    report = exception_info.value.report
+
+    assert [(issue.field_name, issue.exception_type, issue.count) for issue in report.issues] == [
+        ("id", cubista.NonUniqueValuesFound, 2),
+        ("name", cubista.FieldTypeMismatch, 1),
+        ("amount", cubista.NullsNotAllowed, 2)
+    ]
+    assert report.issues[2].sample_rows["id"].tolist() == [2, 3]
+    assert report.to_data_frame()["sample_positions"].tolist() == [[0, 1], [1], [1, 2]]
+    assert "3 validation issue(s) found" in str(exception_info.value)
+
+def test_when_data_source_does_not_collect_all_errors_first_error_is_raised():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            amount = cubista.FloatField()
+
+    table = Table(data_frame=pd.DataFrame({"id": [1, 1], "amount": [1.0, None]}), validate=False)
+
+    with pytest.raises(cubista.NonUniqueValuesFound):
+        _ = cubista.DataSource(tables=[table], validation=True)
+
+def test_when_data_source_is_validated_tables_validated_on_creation_are_skipped():
+    validated_tables = []
+
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+
+        def validate(self, validate=True, workers=1):
+            validated_tables.append((self, validate))
+
+            return super(Table, self).validate(validate=validate, workers=workers)
+
+    validated_table = Table(data_frame=pd.DataFrame({"id": [1, 2]}))
+    not_validated_table = Table(data_frame=pd.DataFrame({"id": [3, 4]}), validate=False)
+    validated_tables.clear()
+
+    _ = cubista.DataSource(tables=[validated_table], validation=True)
+    _ = cubista.DataSource(tables=[not_validated_table], validation=True)
+
+    assert validated_tables == [(not_validated_table, True)]
+    assert not_validated_table.validation_report.is_valid()
+
+def test_when_report_is_converted_to_data_frame_sample_positions_follow_sample_rows_count():
+    class Table(cubista.Table):
+        class Fields:
+            id = cubista.IntField(primary_key=True, unique=True)
+            amount = cubista.FloatField()
+
+    table = Table(data_frame=pd.DataFrame({"id": [1, 2, 3, 4], "amount": [None, None, None, 1.0]}), validate=False)
+
+    report = cubista.get_table_validator(Table).validate(data_frame=table.data_frame, sample_rows_count=2)
+
+    assert report.to_data_frame()["sample_positions"].tolist() == [[0, 1]]
+    assert report.issues[0].sample_rows["id"].tolist() == [1, 2]